@@ -0,0 +1,296 @@
+import argparse
+import datetime
+import json
+import os
+import shutil
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ai_execution_boundary.control.scheduler import nearest_rank
+
+# Columnar receipt analytics.
+#
+# Receipts are flattened into one row each and stored as segments of
+# column files under a store directory:
+#
+#   store/dictionaries.json          string dictionaries (append-only)
+#   store/seg_000000/<column>.npy    one array per column
+#   store/seg_000001/...
+#
+# String dimensions are dictionary-encoded to uint32 codes, metrics are
+# float32 (NaN when missing). Segments are immutable and opened with
+# mmap, so ingesting is incremental (new receipts become a new segment)
+# and a report only pages in the columns it touches.
+
+DIMENSIONS = ("org", "user", "env", "policy", "model", "status", "rule")
+METRICS = ("total_ms", "admission_ms", "ttfat_ms", "output_bytes")
+TIMESTAMP = "timestamp"
+
+def _epoch_seconds(timestamp: str) -> float:
+    # Receipts carry UTC ("...Z"); naive times are read as UTC, not local
+    parsed = datetime.datetime.fromisoformat(timestamp.rstrip("Z"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+def receipt_row(receipt: Dict[str, Any]) -> Dict[str, Any]:
+    """Flattens a receipt (invariant.receipt.v1) into one analytics row."""
+    graph = receipt["graph"]
+    result = receipt.get("result", {})
+    timing = result.get("timing") or {}
+    violation = result.get("violation") or {}
+    model = graph["model"]
+    timestamp = receipt.get("meta", {}).get("timestamp")
+    row = {
+        "org": graph["identity"]["org"],
+        "user": graph["identity"]["user_id"],
+        "env": graph["identity"]["env"],
+        "policy": os.path.splitext(os.path.basename(graph["policy_name"]))[0],
+        "model": f"{model['provider']}/{model['name']}:{model['version']}",
+        "status": result.get("status", "UNKNOWN"),
+        "rule": violation.get("rule_id", ""),
+        "output_bytes": len(result.get("output", "").encode("utf-8")),
+        TIMESTAMP: _epoch_seconds(timestamp) if timestamp else np.nan,
+    }
+    for metric in ("total_ms", "admission_ms", "ttfat_ms"):
+        value = timing.get(metric)
+        row[metric] = np.nan if value is None else value
+    return row
+
+def iter_receipts(path: str) -> Iterable[Dict[str, Any]]:
+    """Receipts from a .json file (one receipt) or .jsonl file (one per line)."""
+    with open(path) as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield json.load(f)
+
+class ReceiptStore:
+    """
+    Append-only columnar store of receipt rows (see module comment).
+    append()/ingest() buffer rows; every segment_rows rows, and on flush(),
+    the buffer is written out as a new segment. Readers see flushed rows.
+    """
+
+    def __init__(self, path: str, segment_rows: int = 1_000_000):
+        self.path = path
+        self.segment_rows = segment_rows
+        os.makedirs(path, exist_ok=True)
+        self._dict_path = os.path.join(path, "dictionaries.json")
+        self._values: Dict[str, List[str]] = {d: [] for d in DIMENSIONS}
+        if os.path.exists(self._dict_path):
+            with open(self._dict_path) as f:
+                self._values.update(json.load(f))
+        self._codes = {d: {v: i for i, v in enumerate(values)} for d, values in self._values.items()}
+        self._pending: List[Dict[str, Any]] = []
+        self._columns: Dict[str, np.ndarray] = {}
+
+    # -- Ingest -------------------------------------------------------------
+
+    def append(self, receipt: Dict[str, Any]):
+        self._pending.append(receipt_row(receipt))
+        if len(self._pending) >= self.segment_rows:
+            self.flush()
+
+    def ingest(self, paths: Iterable[str]) -> int:
+        count = 0
+        for path in paths:
+            for receipt in iter_receipts(path):
+                self.append(receipt)
+                count += 1
+        self.flush()
+        return count
+
+    def encode(self, dimension: str, value: str) -> int:
+        codes = self._codes[dimension]
+        if value not in codes:
+            codes[value] = len(self._values[dimension])
+            self._values[dimension].append(value)
+        return codes[value]
+
+    def write_segment(self, columns: Dict[str, np.ndarray]):
+        """Writes already-encoded columns (codes for dimensions) as a segment."""
+        n = len(next(iter(columns.values())))
+        columns = dict(columns)
+        for d in DIMENSIONS:
+            columns.setdefault(d, np.zeros(n, dtype=np.uint32))
+        for metric in METRICS:
+            columns.setdefault(metric, np.full(n, np.nan, dtype=np.float32))
+        columns.setdefault(TIMESTAMP, np.full(n, np.nan))
+
+        # Dictionaries first: a segment may only reference known codes
+        tmp_dict = self._dict_path + ".tmp"
+        with open(tmp_dict, "w") as f:
+            json.dump(self._values, f)
+        os.replace(tmp_dict, self._dict_path)
+
+        name = f"seg_{len(self.segments()):06d}"
+        tmp_dir = os.path.join(self.path, f".{name}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        for column, values in columns.items():
+            np.save(os.path.join(tmp_dir, f"{column}.npy"), values)
+        os.rename(tmp_dir, os.path.join(self.path, name))
+        self._columns.clear()
+
+    def flush(self):
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        columns = {d: np.fromiter((self.encode(d, r[d]) for r in rows), dtype=np.uint32, count=len(rows))
+                   for d in DIMENSIONS}
+        for metric in METRICS:
+            columns[metric] = np.fromiter((r[metric] for r in rows), dtype=np.float32, count=len(rows))
+        columns[TIMESTAMP] = np.fromiter((r[TIMESTAMP] for r in rows), dtype=np.float64, count=len(rows))
+        self.write_segment(columns)
+
+    # -- Query --------------------------------------------------------------
+
+    def segments(self) -> List[str]:
+        return sorted(os.path.join(self.path, d) for d in os.listdir(self.path) if d.startswith("seg_"))
+
+    def column(self, name: str) -> np.ndarray:
+        """The whole column across segments (memory-mapped when there is one)."""
+        if name not in self._columns:
+            parts = [np.load(os.path.join(seg, f"{name}.npy"), mmap_mode="r") for seg in self.segments()]
+            if not parts:
+                dtype = np.uint32 if name in DIMENSIONS else np.float64 if name == TIMESTAMP else np.float32
+                self._columns[name] = np.empty(0, dtype=dtype)
+            else:
+                self._columns[name] = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return len(self.column("status"))
+
+    def decode(self, dimension: str, code: int) -> str:
+        return self._values[dimension][code]
+
+    def group_by(self, keys: Sequence[str], metric: str = "total_ms",
+                 percentiles: Sequence[float] = (50, 90, 99),
+                 where: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        Vectorized group-by over dimension columns. Returns one row per group
+        (largest first) with the count and the metric's mean and percentiles
+        over the rows where it is present. `where` filters on dimension
+        equality, e.g. {"status": "ABORTED"}.
+        """
+        mask = None
+        for dimension, value in (where or {}).items():
+            code = self._codes[dimension].get(value)
+            selected = self.column(dimension) == code if code is not None else np.zeros(len(self), dtype=bool)
+            mask = selected if mask is None else mask & selected
+
+        # Fold the key columns into one int64 group key
+        key_space = 1
+        group_key = np.zeros(len(self), dtype=np.int64)
+        for dimension in keys:
+            cardinality = max(len(self._values[dimension]), 1)
+            group_key = group_key * cardinality + self.column(dimension)
+            key_space *= cardinality
+        values = self.column(metric)
+        if mask is not None:
+            group_key, values = group_key[mask], values[mask]
+
+        # Dense keys count with bincount (O(n)); only sparse ones need a sort
+        if key_space <= max(4 * len(group_key), 1 << 16):
+            counts = np.bincount(group_key, minlength=key_space)
+            groups = np.flatnonzero(counts)
+            counts = counts[groups]
+            remap = np.zeros(key_space, dtype=np.int64)
+            remap[groups] = np.arange(len(groups))
+            inverse = remap[group_key]
+        else:
+            groups, inverse, counts = np.unique(group_key, return_inverse=True, return_counts=True)
+
+        # Percentiles: bucket the present (non-NaN) values by group with one
+        # stable integer sort, then select order statistics per group with
+        # np.partition (linear) instead of sorting every value. Nearest rank,
+        # like every other latency report (scheduler.percentile).
+        present = ~np.isnan(values)
+        present_groups = inverse[present]
+        present_values = values[present]
+        n_present = np.bincount(present_groups, minlength=len(groups))
+        sums = np.bincount(present_groups, weights=present_values, minlength=len(groups))
+        group_dtype = np.uint16 if len(groups) <= 1 << 16 else np.int64  # radix sort
+        bucketed = present_values[np.argsort(present_groups.astype(group_dtype), kind="stable")]
+        starts = np.concatenate(([0], np.cumsum(n_present)[:-1]))
+
+        stats = {p: np.full(len(groups), np.nan) for p in percentiles}
+        for g in np.flatnonzero(n_present):
+            run = bucketed[starts[g]:starts[g] + n_present[g]]
+            ranks = [nearest_rank(len(run), p) for p in percentiles]
+            run = np.partition(run, sorted(set(ranks)))
+            for p, rank in zip(percentiles, ranks):
+                stats[p][g] = run[rank]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(n_present > 0, sums / np.maximum(n_present, 1), np.nan)
+
+        rows = []
+        for g in np.argsort(-counts, kind="stable"):
+            row, remainder = {}, int(groups[g])
+            for dimension in reversed(keys):
+                cardinality = max(len(self._values[dimension]), 1)
+                row[dimension] = self.decode(dimension, remainder % cardinality)
+                remainder //= cardinality
+            row = {d: row[d] for d in keys}
+            row["count"] = int(counts[g])
+            row[f"{metric}_mean"] = float(means[g])
+            for p in percentiles:
+                row[f"{metric}_p{p:g}"] = float(stats[p][g])
+            rows.append(row)
+        return rows
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    if not rows:
+        return "(no receipts)"
+    headers = list(rows[0])
+    cells = [[f"{v:.2f}" if isinstance(v, float) else str(v) for v in row.values()] for row in rows]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)]
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths))]
+    lines += ["  ".join(c.ljust(w) for c, w in zip(row, widths)) for row in cells]
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Invariant receipt analytics")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="Append receipt files (.json / .jsonl) to a store")
+    ingest.add_argument("store")
+    ingest.add_argument("receipts", nargs="+")
+
+    report = sub.add_parser("report", help="Group-by report over a store")
+    report.add_argument("store")
+    report.add_argument("--by", default="org", help=f"Comma-separated dimensions: {', '.join(DIMENSIONS)}")
+    report.add_argument("--metric", default="total_ms", choices=METRICS)
+    report.add_argument("--where", action="append", default=[], help="dimension=value filter (repeatable)")
+    report.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    store = ReceiptStore(args.store)
+    if args.command == "ingest":
+        count = store.ingest(args.receipts)
+        print(f"[Invariant] Ingested {count} receipts ({len(store)} total, {len(store.segments())} segments)")
+        return
+
+    keys = [k for k in args.by.split(",") if k]
+    for k in keys:
+        if k not in DIMENSIONS:
+            parser.error(f"Unknown dimension: {k}")
+    where = {}
+    for w in args.where:
+        dimension, sep, value = w.partition("=")
+        if not sep:
+            parser.error(f"--where expects dimension=value, got: {w}")
+        if dimension not in DIMENSIONS:
+            parser.error(f"Unknown dimension in --where: {dimension} (known: {', '.join(DIMENSIONS)})")
+        where[dimension] = value
+    rows = store.group_by(keys, metric=args.metric, where=where)
+    print(f"=== {len(store)} receipts by {', '.join(keys)} ({args.metric}) ===")
+    print(format_report(rows[:args.top]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+@dataclass(frozen=True)
+class CachedExecution:
+    graph_id: str
+    output: str
+    proof: str
+    policy_digest: str
+    stored_at: float
+
+class ExecutionCache:
+    """
+    Approved outputs of STRICT executions, keyed by Execution Graph ID.
+
+    The graph ID already covers identity, input, model (incl. seed and
+    decoding), policy name and context digests; the policy file's own digest
+    is stored alongside, so an edited policy never serves an approval it did
+    not give. Entries expire after ttl_seconds and the least recently used
+    ones are evicted beyond max_entries / max_bytes (output bytes).
+
+    Backed by SQLite: pass a file path to persist across restarts, or the
+    default ":memory:" for a process-local cache. Safe to share between
+    threads.
+    """
+
+    def __init__(self, path: str = ":memory:", max_entries: int = 10_000,
+                 max_bytes: int = 256 << 20, ttl_seconds: float = 24 * 3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS executions (
+                graph_id TEXT PRIMARY KEY,
+                output TEXT NOT NULL,
+                proof TEXT NOT NULL,
+                policy_digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS executions_lru ON executions (last_access)")
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, graph_id: str, policy_digest: str) -> Optional[CachedExecution]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT output, proof, policy_digest, stored_at FROM executions WHERE graph_id = ?",
+                (graph_id,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            output, proof, stored_digest, stored_at = row
+            if stored_digest != policy_digest or now - stored_at > self.ttl_seconds:
+                # Stale: the policy changed or the entry expired
+                self._db.execute("DELETE FROM executions WHERE graph_id = ?", (graph_id,))
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE executions SET last_access = ? WHERE graph_id = ?", (now, graph_id))
+            self.hits += 1
+        return CachedExecution(graph_id, output, proof, stored_digest, stored_at)
+
+    def put(self, graph_id: str, output: str, proof: str, policy_digest: str):
+        size = len(output.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO executions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (graph_id, output, proof, policy_digest, size, now, now))
+                self._evict(now)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def invalidate(self, graph_id: str):
+        with self._lock:
+            self._db.execute("DELETE FROM executions WHERE graph_id = ?", (graph_id,))
+
+    def _evict(self, now: float):
+        self._db.execute("DELETE FROM executions WHERE stored_at < ?", (now - self.ttl_seconds,))
+        count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM executions").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Least recently used first, until both bounds hold
+        for graph_id, size in self._db.execute(
+                "SELECT graph_id, size FROM executions ORDER BY last_access").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM executions WHERE graph_id = ?", (graph_id,))
+            count -= 1
+            total -= size
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM executions").fetchone()
+        return {"entries": count, "bytes": total, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,80 @@
+import json
+import os
+import socket
+from typing import Any, Callable, Dict, Optional, Union
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ExecutionGraph
+from ai_execution_boundary.control.errors import ExecutionAborted, ExecutionRejected
+from ai_execution_boundary.control.protocol import SOCKET_ENV, encode, request_to_wire, result_to_wire, result_from_wire
+
+class RemoteInvariant:
+    """
+    Thin client for the kernel service (see service.py).
+    Mirrors Invariant.execute / save_record, so entry points can switch
+    between in-process and service execution without other changes.
+    Importing this module does not load the native extension.
+    """
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+
+    def _request(self, message: Dict[str, Any], on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.socket_path)
+            sock.sendall(encode(message))
+            with sock.makefile("rb") as stream:
+                for line in stream:
+                    event = json.loads(line)
+                    if event["event"] == "token":
+                        if on_token is not None:
+                            on_token(event["data"])
+                        continue
+                    if event["event"] == "error":
+                        if event.get("aborted"):
+                            graph = ExecutionGraph.from_dict(event["graph"]) if event.get("graph") else None
+                            raise ExecutionAborted(event["message"], graph=graph, violation=event.get("violation"),
+                                                   timing=event.get("timing"))
+                        if event.get("rejected"):
+                            raise ExecutionRejected(event["message"], reason=event["rejected"])
+                        raise RuntimeError(event["message"])
+                    return event
+        raise ConnectionError("Kernel service closed the connection without a result")
+
+    def execute(self,
+                input_payload: str,
+                identity: Identity,
+                model_spec: ModelSpec,
+                context_spec: ContextSpec,
+                policy_name: str = "default_policy",
+                on_token: Optional[Callable[[Union[str, bytes]], None]] = None,
+                **options) -> Dict[str, Any]:
+        message = request_to_wire(input_payload, identity, model_spec, context_spec, policy_name, **options)
+        return result_from_wire(self._request(message, on_token))
+
+    def build_receipt(self, result: Dict[str, Any], timestamp: Optional[float] = None) -> Dict[str, Any]:
+        # Signed by the service's node key
+        message = {"op": "receipt", "result": result_to_wire(result)}
+        if timestamp is not None:
+            message["timestamp"] = timestamp
+        return self._request(message)["receipt"]
+
+    def save_record(self, result: Dict[str, Any], filepath: str):
+        receipt = self.build_receipt(result)
+        with open(filepath, "w") as f:
+            json.dump(receipt, f, indent=2)
+        print(f"[Invariant] Execution Receipt V1 Saved: {filepath}")
+
+def connect_or_local(pool_size: Optional[int] = None):
+    """
+    Returns a RemoteInvariant when INVARIANT_SOCKET points at a running
+    service, otherwise the in-process kernel (loading the extension).
+    pool_size asks for a dedicated in-process node with that many kernels
+    instead of the shared one.
+    """
+    socket_path = os.environ.get(SOCKET_ENV)
+    if socket_path:
+        return RemoteInvariant(socket_path)
+    if pool_size is not None:
+        from ai_execution_boundary.control.orchestrator import Invariant
+        return Invariant(pool_size=pool_size)
+    from ai_execution_boundary.control.orchestrator import get_instance
+    return get_instance()
@@ -0,0 +1,47 @@
+import argparse
+import os
+from typing import List, Optional
+
+from .policies import resolve_policy
+
+# Ahead-of-time policy compilation.
+#
+# Turns a policy JSON (and the terms files it references) into a versioned,
+# checksummed .ipol artifact holding the compiled rules, literal tables and
+# deny_terms automata. load_policy() memory-maps an artifact instead of
+# parsing it, so a worker starts in milliseconds whatever the size of its
+# term lists, and workers on one host share the artifact's pages. Proofs
+# sealed under an artifact name the policy by its digest ("sha256:<hex>")
+# rather than by its path.
+#
+#   python -m ai_execution_boundary.control.compile_policy reality_only -o reality_only.ipol
+
+ARTIFACT_EXTENSION = ".ipol"
+
+def compile_policy(policy: str, output: Optional[str] = None) -> str:
+    """
+    Compiles `policy` (name or path) to `output` (default: next to the
+    policy, with the .ipol extension). Returns the artifact digest. The
+    artifact is written aside and renamed into place, so running workers
+    keep the artifact they mapped.
+    """
+    import invariant_enforcement as enforcement
+
+    policy_path = resolve_policy(policy)
+    if output is None:
+        output = os.path.splitext(policy_path)[0] + ARTIFACT_EXTENSION
+    if not output.endswith(ARTIFACT_EXTENSION):
+        raise ValueError(f"Artifact path must end in {ARTIFACT_EXTENSION}: {output}")
+    return enforcement.compile_policy(policy_path, output)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compile an Invariant policy into a memory-mappable artifact")
+    parser.add_argument("policy", help="Policy name (policies/<name>.json) or path")
+    parser.add_argument("-o", "--output", help=f"Artifact path (default: policy path with {ARTIFACT_EXTENSION})")
+    args = parser.parse_args(argv)
+
+    digest = compile_policy(args.policy, args.output)
+    print(f"sha256:{digest}")
+
+if __name__ == "__main__":
+    main()
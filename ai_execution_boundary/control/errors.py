@@ -0,0 +1,33 @@
+from typing import Any, Dict, Optional
+from ai_execution_boundary.control.execution_graph import ExecutionGraph
+
+class ExecutionAborted(RuntimeError):
+    """
+    Raised when the kernel refuses or aborts an execution.
+    Carries the frozen Execution Graph (when one was built), the violated
+    rule as reported by the kernel (rule_id, type, stage, offset) and, if
+    recording was enabled, the per-token timeline up to the abort.
+    """
+    def __init__(self, message: str, graph: Optional[ExecutionGraph] = None, timeline: Optional[bytes] = None,
+                 violation: Optional[Dict[str, Any]] = None, timing: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.graph = graph
+        self.timeline = timeline
+        self.violation = violation
+        self.timing = timing
+
+    def to_result(self) -> Dict[str, Any]:
+        """Result-shaped record of the abort, accepted by build_receipt()."""
+        if self.graph is None:
+            raise ValueError("Abort happened before an Execution Graph was built")
+        return {"output": "", "proof": None, "status": "ABORTED", "graph": self.graph,
+                "violation": self.violation, "timeline": self.timeline, "timing": self.timing}
+
+class ExecutionRejected(RuntimeError):
+    """
+    Raised by the scheduler when an execution is shed before it starts.
+    reason is one of "rate_limited", "queue_full" or "timeout".
+    """
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason
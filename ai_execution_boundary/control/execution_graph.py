@@ -46,6 +46,25 @@ class ModelSpec:
         if self.seed is None:
              raise ValueError("Seed must be explicitly set")
 
+    @property
+    def determinism(self) -> DeterminismLevel:
+        """
+        How reproducible an execution with this spec is.
+        STRICT: greedy decoding on a local, deterministic provider; the same
+        graph always yields the same output. BOUNDED: greedy decoding on a
+        remote provider (seeded, but not guaranteed). BEST_EFFORT: sampling.
+        Operators may declare a level via extra_params["determinism"].
+        """
+        declared = self.extra_params.get("determinism")
+        if declared:
+            return DeterminismLevel(declared)
+        strategy = self.decoding_strategy.replace(" ", "").lower()
+        if strategy not in ("greedy", "temperature=0", "temperature=0.0"):
+            return DeterminismLevel.BEST_EFFORT
+        if self.provider in ("mock", "synthetic"):
+            return DeterminismLevel.STRICT
+        return DeterminismLevel.BOUNDED
+
 @dataclass(frozen=True)
 class ContextSource:
     type: str # e.g., "rag", "memory", "tool", "static"
@@ -53,6 +72,15 @@ class ContextSource:
     identifier: str # URI/Filename
     content_hash: str = "" # SHA256 of the content
 
+@dataclass(frozen=True)
+class ContextViolation:
+    """
+    A deny rule matched inside a context source during the admissibility scan.
+    """
+    identifier: str # The offending ContextSource
+    rule_id: str
+    offset: int # Byte offset of the first match
+
 @dataclass(frozen=True)
 class ContextSpec:
     """
@@ -72,6 +100,7 @@ class ExecutionGraph:
     policy_name: str
     model: ModelSpec
     context: ContextSpec
+    context_violations: List[ContextViolation] = field(default_factory=list)
     
     # Calculated fields
     id: str = field(init=False)
@@ -89,21 +118,47 @@ class ExecutionGraph:
             "model": str(self.model),
             "context": str(self.context)
         }
+        # Only present when a context scan found something, so IDs of
+        # ordinary graphs are unchanged
+        if self.context_violations:
+            data["context_violations"] = str(self.context_violations)
         return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
 
-    def to_json(self) -> str:
-         # Simple serialization for debug/transport
-         # Production needs strictly deterministic serialization (Protobuf/Flatbuffers)
-         return json.dumps({
+    def to_dict(self) -> Dict[str, Any]:
+         """JSON-ready form of the graph (what to_json() serializes)."""
+         data = {
             "id": self.id,
-            "identity": self.identity.__dict__,
+            "identity": dict(self.identity.__dict__),
             "input_payload": self.input_payload,
             "policy_name": self.policy_name,
             "model": {
                 **self.model.__dict__, 
-                "extra_params": self.model.extra_params
+                "extra_params": dict(self.model.extra_params)
             },
             "context": {
-                "sources": [s.__dict__ for s in self.context.sources]
+                "sources": [dict(s.__dict__) for s in self.context.sources]
             }
-         }, indent=2)
+         }
+         if self.context_violations:
+             data["context_violations"] = [dict(v.__dict__) for v in self.context_violations]
+         return data
+
+    def to_json(self) -> str:
+         # Simple serialization for debug/transport
+         # Production needs strictly deterministic serialization (Protobuf/Flatbuffers)
+         return json.dumps(self.to_dict(), indent=2)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExecutionGraph":
+         """
+         Rebuilds a graph from its to_json() form (receipts, service transport).
+         The ID is recomputed, so a tampered record yields a different ID.
+         """
+         return cls(
+            identity=Identity(**data["identity"]),
+            input_payload=data["input_payload"],
+            policy_name=data["policy_name"],
+            model=ModelSpec(**data["model"]),
+            context=ContextSpec([ContextSource(**s) for s in data["context"]["sources"]]),
+            context_violations=[ContextViolation(**v) for v in data.get("context_violations", [])]
+         )
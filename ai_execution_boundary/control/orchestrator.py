@@ -1,60 +1,551 @@
 import os
 import sys
+import time
+import queue
 import hashlib
-from typing import Optional, Dict, Any, Iterator
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterator, Callable, Union, List
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import serialization
 
 # Adjust path to find the control module if needed
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 
-from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ExecutionGraph, ContextSource
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ExecutionGraph, ContextSource, ContextViolation, DeterminismLevel
+from ai_execution_boundary.control.cache import ExecutionCache
+from ai_execution_boundary.control.errors import ExecutionAborted
+from ai_execution_boundary.control.policies import resolve_policy
+from ai_execution_boundary.control.pool import BoundaryPool
+from ai_execution_boundary.control.timeline import timeline_to_receipt
 from ai_execution_boundary.models.adapters.base import ModelAdapter
 # from ai_execution_boundary.models.adapters.openai import OpenAIAdapter # Lazy import
 from ai_execution_boundary.models.adapters.mock import MockAdapter
 
-# Try to import the C++ extension, fallback to mock if not built yet (for dev iteration)
+# Prefer the C++ extension; without it, fall back to the pure-Python engine,
+# which enforces the same policies and seals the same proofs (slower).
 try:
     import invariant_enforcement as enforcement
     print("[Invariant] C++ Enforcement Plane Loaded.")
 except ImportError:
-    print("[Invariant] WARNING: C++ Extension not found. Using Mock Boundary (INSECURE).")
-    class MockBoundary:
-        def load_policy(self, name): pass
-        def load_model(self, spec): pass
-        def load_context(self, ctx): pass
-        def precheck(self, input): return True
-        def run(self, input): return "MOCKED OUTPUT"
-        def seal(self): return "mock_proof"
-    enforcement = type('module', (), {'ExecutionBoundary': MockBoundary})
+    from ai_execution_boundary.enforcement import python_engine as enforcement
+    print("[Invariant] WARNING: C++ Extension not found. Using the Python enforcement engine.")
+
+class _SpeculativeStream:
+    """
+    Runs an adapter's generate() on a background thread so the model request
+    overlaps with local admission work. Tokens are buffered until the
+    orchestrator (after admission) iterates this object; close() cancels
+    the upstream request via the adapter's cancellation contract.
+    """
+
+    _DONE = object()
+
+    def __init__(self, adapter: ModelAdapter, prompt: str, max_buffered: int = 4096):
+        self.adapter = adapter
+        self._tokens = queue.Queue(maxsize=max_buffered)
+        self._cancelled = threading.Event()
+        # Created here, before close() can be called; the pump only iterates
+        stream = adapter.generate(prompt)
+        self._thread = threading.Thread(target=self._pump, args=(stream,), daemon=True)
+        self._thread.start()
+
+    def _pump(self, stream: Iterator[str]):
+        try:
+            for token in stream:
+                if not self._put(token):
+                    return
+            self._put(self._DONE)
+        except Exception as e:
+            self._put(e)
+        finally:
+            stream.close()
+
+    def _put(self, item) -> bool:
+        # Bounded buffer: block while full, but never past a cancellation
+        while not self._cancelled.is_set():
+            try:
+                self._tokens.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        while True:
+            item = self._tokens.get()
+            if item is self._DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def close(self):
+        if not self._cancelled.is_set():
+            self._cancelled.set()
+            self.adapter.close()
+
+class _HedgeLost(Exception):
+    """A hedged candidate stopped because another candidate already won."""
+
+class _HedgeRace:
+    """
+    Shared state of one execute_hedged() call. The first candidate to pass
+    finish() claims the race and is the only one sealed; claiming closes the
+    other candidates' adapters (cancellation contract) and they stop at
+    their next token.
+    """
 
-class Invariant:
     def __init__(self):
-        self.boundary = enforcement.ExecutionBoundary()
-        self.private_key = ed25519.Ed25519PrivateKey.generate()
+        self.cond = threading.Condition()
+        self.winner: Optional[int] = None
+        self.running = 0
+        self.failures = 0
+        self.outcomes: Dict[int, Any] = {}
+        self._adapters: Dict[int, ModelAdapter] = {}
+
+    def attach(self, index: int, adapter: ModelAdapter):
+        with self.cond:
+            self._adapters[index] = adapter
+            lost = self.winner is not None
+        if lost:
+            adapter.close()
+            raise _HedgeLost()
+
+    def check(self):
+        if self.winner is not None:
+            raise _HedgeLost()
+
+    def claim(self, index: int):
+        with self.cond:
+            if self.winner is not None:
+                raise _HedgeLost()
+            self.winner = index
+            losers = [a for i, a in self._adapters.items() if i != index]
+        # Off the winner's path: closing a response can wait for a read that
+        # is blocked on a silent upstream
+        for adapter in losers:
+            threading.Thread(target=adapter.close, daemon=True, name="invariant-hedge-cancel").start()
+
+    def done(self, index: int, outcome: Any):
+        with self.cond:
+            self.outcomes[index] = outcome
+            self.running -= 1
+            if isinstance(outcome, Exception) and not isinstance(outcome, _HedgeLost):
+                self.failures += 1
+            self.cond.notify_all()
+
+class _HedgeCandidate:
+    """One candidate's view of the race, threaded through _execute()."""
+
+    def __init__(self, race: _HedgeRace, index: int):
+        self.race = race
+        self.index = index
+
+    def attach(self, adapter: ModelAdapter):
+        self.race.attach(self.index, adapter)
+
+    def check(self):
+        self.race.check()
+
+    def claim(self):
+        self.race.claim(self.index)
+
+def hedge_digest(hedge_block: Dict[str, Any]) -> str:
+    """sha256 of a receipt's result.hedge block (canonical JSON), as signed."""
+    canonical = json.dumps(hedge_block, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _alloc_total(boundary) -> int:
+    return boundary.alloc_stats().total if hasattr(boundary, "alloc_stats") else 0
+
+def _policy_digest(policy_path: str) -> str:
+    if os.path.isfile(policy_path):
+        with open(policy_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    return "name:" + policy_path
+
+def _replay_cached(output: str) -> Iterator[str]:
+    # The cached output goes through the kernel again as a single token
+    yield output
+
+def _violation(boundary) -> Optional[Dict[str, Any]]:
+    # Which rule refused the execution, as reported by the kernel
+    v = boundary.last_violation() if hasattr(boundary, "last_violation") else None
+    if v is None:
+        return None
+    return {"rule_id": v.rule_id, "type": v.type, "stage": v.stage, "offset": v.offset}
+
+def _rule_type(boundary, rule_id: str) -> str:
+    # Type of a rule of the active policy, looked up the way precheck() does
+    rules = boundary.rule_profile() if hasattr(boundary, "rule_profile") else []
+    return next((r.type for r in rules if r.rule_id == rule_id), "deny_regex")
+
+def _aborted(message: str, violation: Optional[Dict[str, Any]], **kwargs) -> ExecutionAborted:
+    if violation is not None:
+        message += f" (rule '{violation['rule_id']}', {violation['type']})"
+    return ExecutionAborted(message, violation=violation, **kwargs)
+
+def _hash_context_file(path: str) -> str:
+    try:
+        # Use Native C++ Hashing for scalability
+        file_hash = enforcement.crypto_hash_file(path)
+        print(f"[Invariant] Context Hash Computed (Native): {path} -> {file_hash[:12]}...")
+        return file_hash
+    except Exception as e:
+        print(f"[Invariant] Warning: Could not hash context file {path}: {e}")
+        return enforcement.ExecutionBoundary.kErrorHash
+
+class Invariant:
+    def __init__(self, private_key: Optional[ed25519.Ed25519PrivateKey] = None, pool_size: int = 4,
+                 hash_workers: int = 8, cache: Optional[ExecutionCache] = None):
+        # Warm kernels, one per in-flight execution (execute() is thread-safe)
+        self.pool = BoundaryPool(enforcement.ExecutionBoundary, max_size=pool_size)
+        # Context files are hashed concurrently; the native hash releases the GIL
+        self._hash_pool = ThreadPoolExecutor(max_workers=hash_workers, thread_name_prefix="invariant-hash")
+        # Optional response cache for STRICT executions (see cache.py)
+        self.cache = cache
+        # A node may run several kernels (service pool) under one identity key
+        self.private_key = private_key or ed25519.Ed25519PrivateKey.generate()
         self.public_key = self.private_key.public_key()
         print(f"[Invariant] Node Identity Key Generated: {self.public_key.public_bytes(encoding=serialization.Encoding.Raw, format=serialization.PublicFormat.Raw).hex()[:16]}...")
 
+    def warm_policies(self, policy_names):
+        """Pre-compiles policies in every pooled kernel."""
+        self.pool.warm([resolve_policy(name) for name in policy_names])
+
     def execute(self, 
                 input_payload: str,
                 identity: Identity,
                 model_spec: ModelSpec,
                 context_spec: ContextSpec,
-                policy_name: str = "default_policy") -> Dict[str, Any]:
+                policy_name: str = "default_policy",
+                speculative: bool = False,
+                scan_context: bool = False,
+                record_timeline: bool = False,
+                on_token: Optional[Callable[[Union[str, bytes]], None]] = None,
+                trust_context_hashes: bool = False,
+                use_cache: bool = True) -> Dict[str, Any]:
         """
         The MANDATORY execution entry point.
+
+        With speculative=True the model request is opened concurrently with
+        policy loading, context hashing and the pre-check, hiding connection
+        setup and first-token latency. Tokens are buffered and nothing reaches
+        the kernel until admission succeeds; a denied request is cancelled
+        upstream. Note the provider does receive the prompt before admission.
+
+        With scan_context=True the contents of file/static context sources are
+        scanned against the policy's deny rules before admission; matches are
+        recorded in the graph and refuse the execution.
+
+        With record_timeline=True the kernel records each token's byte offset,
+        arrival time and check duration; the encoded timeline is returned
+        under "timeline" and embedded in the receipt by save_record().
+
+        on_token, if given, receives every token right after the kernel
+        approves it. It runs inline, so a slow consumer slows the stream down
+        (backpressure) and an exception from it cancels the execution.
+
+        With trust_context_hashes=True, sources that already carry a
+        content_hash are not re-hashed (used by Session to keep digests warm
+        across turns). Replay leaves it off so context rot is detected.
+
+        With a cache configured, a STRICT execution (ModelSpec.determinism)
+        whose graph was approved before is served without calling the model:
+        the cached output is passed through the kernel again (pre-check,
+        stream rules, seal) and the result is marked as a cache hit, which
+        the receipt attests. use_cache=False bypasses the cache.
+
+        The kernel is borrowed from the pool for the duration of the call and
+        reset on return; "allocations" in the result counts the allocation
+        events the kernel tracks during this execution, i.e. policy compiles
+        and buffer growths (zero once the kernel is warm). Other heap
+        allocations are not counted.
+        """
+        with self.pool.acquire() as boundary:
+            return self._execute(boundary, input_payload, identity, model_spec, context_spec,
+                                 policy_name, speculative, scan_context, record_timeline, on_token,
+                                 trust_context_hashes, use_cache)
+
+    def execute_hedged(self,
+                       input_payload: str,
+                       identity: Identity,
+                       model_specs: List[ModelSpec],
+                       context_spec: ContextSpec,
+                       policy_name: str = "default_policy",
+                       hedge_delay: float = 0.05,
+                       max_concurrent: Optional[int] = None,
+                       scan_context: bool = False,
+                       record_timeline: bool = False) -> Dict[str, Any]:
         """
+        Hedged execution across several models: returns the first candidate
+        whose stream completes without a violation.
+
+        Candidates start in order of model_specs: the first at once, each
+        further one hedge_delay seconds after the previous launch (or as soon
+        as a running candidate is refused), with at most max_concurrent
+        (default: all) in flight. Every candidate runs its own kernel session
+        from the pool, so a pool smaller than max_concurrent delays launches.
+        The winner is the only one sealed; the others are cancelled upstream
+        at once. The response cache is not used.
+
+        The result is the winner's execute() result plus a "hedge" block
+        (winner index, delay, and every launched candidate with its launch
+        offset and outcome) that build_receipt() records. If every candidate
+        is refused, the first candidate's ExecutionAborted is raised.
+        """
+        if not model_specs:
+            raise ValueError("execute_hedged needs at least one ModelSpec")
+        limit = min(max_concurrent or len(model_specs), len(model_specs))
+        if limit < 1:
+            raise ValueError("max_concurrent must be at least 1")
+
+        race = _HedgeRace()
+        t_start = time.perf_counter()
+        launched = []  # (index, launch offset in ms)
+
+        def run(index: int):
+            try:
+                race.check()
+                with self.pool.acquire() as boundary:
+                    outcome = self._execute(boundary, input_payload, identity, model_specs[index], context_spec,
+                                            policy_name, False, scan_context, record_timeline, None,
+                                            False, False, _HedgeCandidate(race, index))
+            except Exception as e:
+                outcome = e
+            race.done(index, outcome)
+
+        with race.cond:
+            due, failures = t_start, 0
+            while race.winner not in race.outcomes:
+                now = time.perf_counter()
+                if race.failures > failures:
+                    # A refused candidate is replaced right away
+                    due, failures = min(due, now), race.failures
+                can_launch = race.winner is None and len(launched) < len(model_specs) and race.running < limit
+                if can_launch and now >= due:
+                    index = len(launched)
+                    launched.append((index, (now - t_start) * 1000))
+                    race.running += 1
+                    threading.Thread(target=run, args=(index,), daemon=True,
+                                     name=f"invariant-hedge-{index}").start()
+                    due = now + hedge_delay
+                    continue
+                if race.winner is None and race.running == 0 and len(launched) == len(model_specs):
+                    break
+                race.cond.wait(due - now if can_launch else None)
+            outcomes = dict(race.outcomes)
+            winner = race.winner
+
+        if winner is None:
+            raise outcomes[0]
+        result = outcomes[winner]
+        if isinstance(result, Exception):
+            raise result
+
+        candidates = []
+        for index, launched_ms in launched:
+            spec, outcome = model_specs[index], outcomes.get(index)
+            entry = {"index": index, "provider": spec.provider, "name": spec.name, "version": spec.version,
+                     "seed": spec.seed, "launched_ms": launched_ms}
+            if index == winner:
+                entry["status"] = "WON"
+            elif isinstance(outcome, ExecutionAborted):
+                entry["status"] = "ABORTED"
+                entry["violation"] = outcome.violation
+            elif outcome is None or isinstance(outcome, _HedgeLost):
+                entry["status"] = "CANCELLED"
+            else:
+                entry["status"] = "FAILED"
+            candidates.append(entry)
+        result["hedge"] = {
+            "winner": winner,
+            "hedge_delay_ms": hedge_delay * 1000,
+            "max_concurrent": limit,
+            "candidates": candidates,
+            "total_ms": (time.perf_counter() - t_start) * 1000,
+        }
+        print(f"[Invariant] Hedged execution won by candidate {winner} ({model_specs[winner].name}), "
+              f"{len(launched)} of {len(model_specs)} launched")
+        return result
+
+    def _execute(self, boundary, input_payload, identity, model_spec, context_spec,
+                 policy_name, speculative, scan_context, record_timeline, on_token,
+                 trust_context_hashes, use_cache, hedge: Optional[_HedgeCandidate] = None) -> Dict[str, Any]:
         print(f"\n--- Starting Invariant Execution ID: [Generated internally] ---")
+        t_start = time.perf_counter()
+        allocs_before = _alloc_total(boundary)
+
+        adapter = self._resolve_adapter(model_spec)
+        if hedge is not None:
+            hedge.attach(adapter)
+        prefetch = _SpeculativeStream(adapter, input_payload) if speculative else None
+
+        try:
+            execution_graph = self._prepare(boundary, input_payload, identity, model_spec, context_spec,
+                                            policy_name, scan_context, trust_context_hashes)
+
+            if execution_graph.context_violations:
+                first = execution_graph.context_violations[0]
+                raise ExecutionAborted(
+                    f"Execution Aborted: Policy Violation in Context "
+                    f"({first.identifier} @ byte {first.offset}, rule '{first.rule_id}')",
+                    graph=execution_graph,
+                    violation={"rule_id": first.rule_id, "type": _rule_type(boundary, first.rule_id),
+                               "stage": "context", "offset": first.offset})
+
+            # 3. Admissibility Pre-Check (Delegated to C++)
+            # start() runs the pre-check; no token is forwarded before it passes.
+            boundary.set_timeline(record_timeline)
+            try:
+                boundary.start(input_payload)
+            except RuntimeError as e:
+                violation = _violation(boundary)
+                if violation is None:
+                    raise
+                raise _aborted(str(e), violation, graph=execution_graph) from e
+        except Exception:
+            if prefetch is not None:
+                print("[Invariant] Admission failed: cancelling speculative model request")
+                prefetch.close()
+            raise
+        t_admitted = time.perf_counter()
+
+        # Deterministic response cache: only for STRICT graphs, and only
+        # while the policy file is the one that approved the cached output
+        cacheable = (use_cache and self.cache is not None
+                     and model_spec.determinism == DeterminismLevel.STRICT)
+        cached = None
+        if cacheable:
+            policy_digest = _policy_digest(execution_graph.policy_name)
+            cached = self.cache.get(execution_graph.id, policy_digest)
+            if cached is not None:
+                print(f"[Invariant] Cache Hit: {execution_graph.id[:12]}... (model call skipped)")
+                if prefetch is not None:
+                    prefetch.close()
+
+        # 4. Execution Loop (Streaming)
+        # Usage of Token-Level Enforcement
+        # Stream tokens from adapter and feed to boundary
+        generated_token_count = 0
+        t_first_token = None
+
+        def timing(t_end: float) -> Dict[str, Any]:
+            return {
+                "speculative": speculative,
+                "admission_ms": (t_admitted - t_start) * 1000,
+                # Time-to-first-approved-token: first token the kernel let through
+                "ttfat_ms": (t_first_token - t_start) * 1000 if t_first_token else None,
+                "total_ms": (t_end - t_start) * 1000
+            }
+        if cached is not None:
+            stream = _replay_cached(cached.output)
+        else:
+            stream = prefetch if prefetch is not None else adapter.generate(input_payload)
+        try:
+             # A hedge candidate that lost during admission never opens its
+             # request: generate() only creates the stream, iterating opens it,
+             # and a claim from here on is seen by the adapter's cancel flag
+             if hedge is not None:
+                 hedge.check()
+             for token in stream:
+                 if hedge is not None:
+                     hedge.check()
+                 if not boundary.step(token):
+                     print(f"[Invariant] Abort Triggered at token {generated_token_count}")
+                     timeline = boundary.timeline_bytes() if record_timeline else None
+                     raise _aborted("Execution Aborted: Policy Violation Mid-Stream", _violation(boundary),
+                                    graph=execution_graph, timeline=timeline,
+                                    timing=timing(time.perf_counter()))
+                 if t_first_token is None:
+                     t_first_token = time.perf_counter()
+                 if on_token is not None:
+                     on_token(token)
+                 generated_token_count += 1
+        except Exception as e:
+             print(f"[Invariant] Stream Interrupted: {e}")
+             # We might still want to seal what we have? 
+             # For now, let it raise, but ideally we'd record the abort.
+             raise e
+        finally:
+             # Cancellation contract: tear down the upstream stream immediately
+             # rather than leaving the connection (and provider billing) open until GC.
+             adapter.close()
+             stream.close()
+
+        # A cancelled hedge candidate's stream ends early; never finish it
+        if hedge is not None:
+            hedge.check()
+
+        # End-of-stream rules (e.g. allow-lists need the complete output)
+        if not boundary.finish():
+            timeline = boundary.timeline_bytes() if record_timeline else None
+            raise _aborted("Execution Aborted: Policy Violation at End of Stream", _violation(boundary),
+                           graph=execution_graph, timeline=timeline, timing=timing(time.perf_counter()))
+
+        # Only the first admissible hedge candidate is sealed
+        if hedge is not None:
+            hedge.claim()
+
+        # Get the canonical output from the boundary.
+        # Decode straight out of the kernel-owned buffer (read-only memoryview),
+        # so the only copy is the one that builds the Python str.
+        output = str(boundary.output_view(), "utf-8")
+        bytes_copied = boundary.copy_stats().total
+        allocations = _alloc_total(boundary) - allocs_before
+        print(f"[Invariant] Kernel copied {bytes_copied} bytes, {allocations} allocations for this execution")
+        timeline = boundary.timeline_bytes() if record_timeline else None
+
+        # 5. Seal
+        proof = boundary.seal()
+        t_sealed = time.perf_counter()
         
-        # 1. Load Policy (Compile & Load)
-        # Resolve policy path if simple name
-        if "/" not in policy_name and not policy_name.endswith(".json"):
-             base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-             policy_path = os.path.join(base_dir, "policies", f"{policy_name}.json")
-             if os.path.exists(policy_path):
-                 policy_name = policy_path
+        print(f"--- Execution Sealed. Proof: {proof} ---")
 
-        self.boundary.load_policy(policy_name)
+        cache_info = None
+        if cacheable:
+            if cached is not None and cached.proof != proof:
+                # The kernel disagrees with the stored proof; never serve it again
+                print("[Invariant] Warning: cached proof mismatch, entry invalidated")
+                self.cache.invalidate(execution_graph.id)
+                cached = None
+            if cached is None:
+                self.cache.put(execution_graph.id, output, proof, policy_digest)
+                cache_info = {"hit": False}
+            else:
+                cache_info = {"hit": True, "stored_at": cached.stored_at}
+        
+        return {
+            "output": output,
+            "proof": proof,
+            "status": "COMPLETED",
+            "graph": execution_graph,
+            "bytes_copied": bytes_copied,
+            "allocations": allocations,
+            "timeline": timeline,
+            "cache": cache_info,
+            "timing": timing(t_sealed)
+        }
+
+    def _prepare(self,
+                 boundary,
+                 input_payload: str,
+                 identity: Identity,
+                 model_spec: ModelSpec,
+                 context_spec: ContextSpec,
+                 policy_name: str,
+                 scan_context: bool = False,
+                 trust_context_hashes: bool = False) -> ExecutionGraph:
+        """
+        Loads policy, model and context into the boundary and freezes the
+        Execution Graph. Purely local work (no model I/O).
+        """
+        # 1. Load Policy (Compile & Load)
+        # Served from the kernel's compiled-policy cache when warm
+        policy_name = resolve_policy(policy_name)
+        boundary.load_policy(policy_name)
 
         # 2. Freeze Configuration
         # Map Python ModelSpec to C++ ModelSpec
@@ -65,7 +556,20 @@ class Invariant:
         cpp_model.seed = model_spec.seed
         cpp_model.decoding_strategy = model_spec.decoding_strategy
         
-        self.boundary.load_model(cpp_model)
+        boundary.load_model(cpp_model)
+
+        # Hash each distinct context file once, all of them in parallel
+        # (identifiers naming the same file share one hash).
+        pending, file_hashes = {}, {}
+        for s in context_spec.sources:
+            if trust_context_hashes and s.content_hash:
+                continue
+            if s.type in ("static", "file") and s.identifier not in file_hashes and os.path.exists(s.identifier):
+                real = os.path.realpath(s.identifier)
+                if real not in pending:
+                    pending[real] = self._hash_pool.submit(_hash_context_file, s.identifier)
+                file_hashes[s.identifier] = pending[real]
+        file_hashes = {identifier: future.result() for identifier, future in file_hashes.items()}
 
         # Map Python ContextSpec to C++ ContextSpec AND Update Python Objects with Hashes
         cpp_context = enforcement.ContextSpec()
@@ -80,17 +584,11 @@ class Invariant:
             
             computed_hash = ""
             # Compute Hash if logical
-            if s.type == "static" or s.type == "file":
-                 path = s.identifier
-                 if os.path.exists(path):
-                     try:
-                         # Use Native C++ Hashing for scalability
-                         file_hash = enforcement.crypto_hash_file(path)
-                         computed_hash = file_hash
-                         print(f"[Invariant] Context Hash Computed (Native): {path} -> {file_hash[:12]}...")
-                     except Exception as e:
-                         print(f"[Invariant] Warning: Could not hash context file {path}: {e}")
-                         computed_hash = "ERROR_HASH"
+            if trust_context_hashes and s.content_hash:
+                 computed_hash = s.content_hash
+            elif s.type == "static" or s.type == "file":
+                 if s.identifier in file_hashes:
+                     computed_hash = file_hashes[s.identifier]
                  else:
                      # Fallback for "static" / memory mock sources
                      computed_hash = hashlib.sha256(s.identifier.encode()).hexdigest()
@@ -107,7 +605,18 @@ class Invariant:
             ))
 
         cpp_context.sources = cpp_sources
-        self.boundary.load_context(cpp_context)
+        boundary.load_context(cpp_context)
+
+        # Optional context admissibility pass (native: mmap + parallel chunks,
+        # cached against the content digest). Violations also make the
+        # kernel's pre-check fail, independently of what we do with them here.
+        context_violations = []
+        if scan_context:
+            for cpp_s in cpp_sources:
+                if cpp_s.type in ("static", "file") and os.path.exists(cpp_s.identifier):
+                    for v in boundary.scan_context(cpp_s):
+                        print(f"[Invariant] Context Violation: {v.identifier} @ byte {v.offset} (rule '{v.rule_id}')")
+                        context_violations.append(ContextViolation(v.identifier, v.rule_id, v.offset))
         
         # Create the definitive Execution Graph (Immutable Record)
         # We use the updated_py_sources so the record includes the actual hashes used
@@ -117,69 +626,81 @@ class Invariant:
             input_payload=input_payload,
             policy_name=policy_name,
             model=model_spec,
-            context=final_context_spec
+            context=final_context_spec,
+            context_violations=context_violations
         )
 
-        # 3. Admissibility Pre-Check (Delegated to C++)
-
-        # 4. Resolve Model Adapter
-        adapter = self._resolve_adapter(model_spec)
-        
-        # 5. Execution Loop (Streaming)
-        # Usage of Token-Level Enforcement
-        self.boundary.start(input_payload)
-        
-        # Stream tokens from adapter and feed to boundary
-        generated_token_count = 0
-        try:
-             for token in adapter.generate(input_payload):
-                 if not self.boundary.step(token):
-                     print(f"[Invariant] Abort Triggered at token {generated_token_count}")
-                     raise RuntimeError("Execution Aborted: Policy Violation Mid-Stream")
-                 generated_token_count += 1
-        except Exception as e:
-             print(f"[Invariant] Stream Interrupted: {e}")
-             # We might still want to seal what we have? 
-             # For now, let it raise, but ideally we'd record the abort.
-             raise e
+        return execution_graph
 
-        # Get the canonical output from the boundary
-        output = self.boundary.get_output()
+    def save_record(self, result: Dict[str, Any], filepath: str):
+        """
+        Persist the full execution record (Graph + Proof + Output) to disk.
+        Schema: invariant.receipt.v1
+        """
 
-        # 6. Seal
-        proof = self.boundary.seal()
-        
-        print(f"--- Execution Sealed. Proof: {proof} ---")
+        receipt = self.build_receipt(result)
         
-        return {
-            "output": output,
-            "proof": proof,
-            "status": "COMPLETED",
-            "graph": execution_graph
-        }
+        with open(filepath, "w") as f:
+            json.dump(receipt, f, indent=2)
+        print(f"[Invariant] Execution Receipt V1 Saved: {filepath}")
 
-    def save_record(self, result: Dict[str, Any], filepath: str):
+    def build_receipt(self, result: Dict[str, Any], timestamp: Optional[float] = None) -> Dict[str, Any]:
         """
-        Persist the full execution record (Graph + Proof + Output) to disk.
+        Builds and signs the receipt for an execution result, or for an
+        abort via ExecutionAborted.to_result() (status "ABORTED", no proof;
+        the signature then binds the refusal to the graph id).
+        Timing and the violated rule are recorded for analytics.
+        timestamp (epoch seconds) defaults to now; the ReceiptWriter passes
+        the time the receipt was submitted.
         Schema: invariant.receipt.v1
         """
-        import json
         import datetime
         
         if "graph" not in result:
              raise ValueError("Result dictionary missing 'graph' object.")
         
         graph = result["graph"]
+
+        # The proof ID must stay replayable, while timeline timings never are.
+        # The timeline is therefore bound through the signature: we sign
+        # "proof_id|timeline_digest" instead of folding it into the proof hash.
+        if result["status"] == "ABORTED":
+            signed_message = f"ABORTED|{graph.id}"
+            signed_field = "result.status|graph.id"
+        else:
+            signed_message = result["proof"]
+            signed_field = "meta.proof_id"
+        timeline_block = None
+        if result.get("timeline") is not None:
+            timeline_block = timeline_to_receipt(result["timeline"])
+            signed_message += "|" + timeline_block["digest"]
+            signed_field += "|timeline.digest"
+        # Cache hits are attested: the signature covers the hit marker
+        cache_block = result.get("cache")
+        if cache_block is not None and cache_block.get("hit"):
+            signed_message += "|CACHE_HIT"
+            signed_field += "|result.cache.hit"
+        # Session turns additionally sign their chain link (see session.py)
+        session_block = result.get("session")
+        if session_block is not None:
+            signed_message += "|" + session_block["link"]
+            signed_field += "|session.link"
+        # Hedged executions sign which candidates were launched and how they ended
+        hedge_block = result.get("hedge")
+        if hedge_block is not None:
+            signed_message += "|" + hedge_digest(hedge_block)
+            signed_field += "|sha256(result.hedge)"
         
         # Schema V1.0 Definition
         receipt = {
             "schema": "invariant.receipt.v1",
             "meta": {
                 "engine_version": "0.1.0",
-                "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+                "timestamp": (datetime.datetime.utcnow() if timestamp is None
+                              else datetime.datetime.utcfromtimestamp(timestamp)).isoformat() + "Z",
                 "proof_id": result["proof"]
             },
-            "graph": json.loads(graph.to_json()),
+            "graph": graph.to_dict(),
             "result": {
                 "status": result["status"],
                 "output": result["output"]
@@ -188,15 +709,24 @@ class Invariant:
                 "signatures": [{
                     "algo": "ed25519",
                     "pub_key": self.public_key.public_bytes(encoding=serialization.Encoding.Raw, format=serialization.PublicFormat.Raw).hex(),
-                    "signature": self.private_key.sign(result["proof"].encode("utf-8")).hex(),
-                    "signed_field": "meta.proof_id"
+                    "signature": self.private_key.sign(signed_message.encode("utf-8")).hex(),
+                    "signed_field": signed_field
                 }] 
             }
         }
-        
-        with open(filepath, "w") as f:
-            json.dump(receipt, f, indent=2)
-        print(f"[Invariant] Execution Receipt V1 Saved: {filepath}")
+        if result.get("timing") is not None:
+            receipt["result"]["timing"] = result["timing"]
+        if result.get("violation") is not None:
+            receipt["result"]["violation"] = result["violation"]
+        if hedge_block is not None:
+            receipt["result"]["hedge"] = hedge_block
+        if cache_block is not None:
+            receipt["result"]["cache"] = cache_block
+        if timeline_block is not None:
+            receipt["timeline"] = timeline_block
+        if session_block is not None:
+            receipt["session"] = dict(session_block)
+        return receipt
 
     def _resolve_adapter(self, spec: ModelSpec) -> ModelAdapter:
         if spec.provider == "openai":
@@ -205,6 +735,9 @@ class Invariant:
             return SimpleOpenAIAdapter(spec)
         elif spec.provider == "mock":
             return MockAdapter(spec)
+        elif spec.provider == "synthetic":
+            from ai_execution_boundary.models.adapters.synthetic import SyntheticAdapter
+            return SyntheticAdapter(spec)
         else:
             raise ValueError(f"Unsupported provider: {spec.provider}")
 
@@ -212,3 +745,6 @@ class Invariant:
 _instance = Invariant()
 def execute(*args, **kwargs):
     return _instance.execute(*args, **kwargs)
+
+def get_instance() -> Invariant:
+    return _instance
@@ -0,0 +1,17 @@
+import os
+
+# Where policies named on the command line or in requests are looked up.
+
+POLICY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "policies")
+
+def resolve_policy(policy_name: str) -> str:
+    """
+    Path of a policy given by name or path. A bare name (no "/", no
+    ".json") is looked up as policies/<name>.json; anything else, or a
+    name with no such file, is returned unchanged.
+    """
+    if "/" not in policy_name and not policy_name.endswith(".json"):
+        policy_path = os.path.join(POLICY_DIR, f"{policy_name}.json")
+        if os.path.exists(policy_path):
+            return policy_path
+    return policy_name
@@ -0,0 +1,104 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+class BoundaryPool:
+    """
+    Bounded pool of warm ExecutionBoundary kernels.
+
+    Kernels are created lazily up to max_size (prewarm of them up front) and
+    handed out one request at a time. On release the kernel is reset(), which
+    drops the session state but keeps compiled policies, cached context scans
+    and buffer capacity, so a returning request pays no parse or allocation
+    cost. acquire() blocks while every kernel is busy.
+    """
+
+    def __init__(self, factory: Callable[[], Any], max_size: int = 4, prewarm: int = 1):
+        if max_size < 1:
+            raise ValueError("BoundaryPool max_size must be at least 1")
+        self._factory = factory
+        self.max_size = max_size
+        # LIFO: the most recently used kernel has the warmest caches
+        self._idle: List[Any] = []
+        # Guards _idle and _created; notified whenever a kernel is returned
+        # or a slot frees up
+        self._cond = threading.Condition()
+        self._created = 0
+        self._warm_policies: List[str] = []
+        for _ in range(min(prewarm, max_size)):
+            with self._cond:
+                self._created += 1
+            self._idle.append(self._create())
+
+    def _create(self):
+        # The caller has reserved the slot (_created already counts it)
+        try:
+            boundary = self._factory()
+            for policy in self._warm_policies:
+                boundary.load_policy(policy)
+            boundary.reset()
+        except Exception:
+            self._release_slot()
+            raise
+        return boundary
+
+    def _release_slot(self):
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def _checkout(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._idle:
+                if self._created < self.max_size:
+                    # Reserve the slot under the same lock as the check
+                    self._created += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No kernel available within {timeout}s (pool size {self.max_size})")
+                self._cond.wait(remaining)
+            else:
+                return self._idle.pop()
+        return self._create()
+
+    @contextmanager
+    def acquire(self, timeout: float = None) -> Iterator[Any]:
+        boundary = self._checkout(timeout)
+        try:
+            yield boundary
+        finally:
+            try:
+                boundary.reset()
+            except Exception:
+                # Never hand out a kernel in an unknown state; the freed slot
+                # lets a waiting (or later) request create a fresh one.
+                self._release_slot()
+            else:
+                with self._cond:
+                    self._idle.append(boundary)
+                    self._cond.notify()
+
+    def warm(self, policies: List[str]):
+        """
+        Compiles the given policy files into every idle kernel and into any
+        kernel created later.
+        """
+        with self._cond:
+            self._warm_policies.extend(policies)
+            idle, self._idle = self._idle, []
+        try:
+            for boundary in idle:
+                for policy in policies:
+                    boundary.load_policy(policy)
+                boundary.reset()
+        finally:
+            with self._cond:
+                self._idle.extend(idle)
+                self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"size": self._created, "idle": len(self._idle), "max_size": self.max_size}
@@ -0,0 +1,216 @@
+import argparse
+import contextlib
+import json
+import math
+import os
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ai_execution_boundary.control.policies import resolve_policy
+
+# Per-rule cost profile of a policy.
+#
+# Replays a corpus of recorded outputs through an ExecutionBoundary with
+# rule profiling on, streaming each output in token-sized steps exactly as
+# the orchestrator does, and ranks the rules by the time they cost. Each
+# deny_regex rule is then probed on its own with corpus text of growing
+# length; rules whose evaluation time grows faster than the input
+# (exponent above `superlinear_threshold`) are flagged as backtracking
+# risks.
+#
+#   python -m ai_execution_boundary.control.profile_policy reality_only receipts.jsonl
+
+DEFAULT_PROBE_SIZES = (1024, 4096, 16384)
+
+def iter_corpus(paths: Iterable[str]) -> Iterable[Tuple[str, str]]:
+    """
+    (input, output) pairs from receipts (.json / .jsonl) or, for any other
+    file, the whole file as one output with an empty input.
+    """
+    for path in paths:
+        if path.endswith((".json", ".jsonl")):
+            with open(path) as f:
+                receipts = [json.loads(line) for line in f if line.strip()] if path.endswith(".jsonl") else [json.load(f)]
+            for receipt in receipts:
+                yield receipt["graph"]["input_payload"], receipt["result"]["output"]
+        else:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                yield "", f.read()
+
+@contextlib.contextmanager
+def _quiet_fd1():
+    # The kernel logs every step to stdout; keep the report readable
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(devnull)
+        os.close(saved)
+
+def _new_boundary(enforcement, policy_path: str):
+    boundary = enforcement.ExecutionBoundary()
+    boundary.load_policy(policy_path)
+    model = enforcement.ModelSpec()
+    model.provider, model.name, model.version, model.seed, model.decoding_strategy = (
+        "profile", "profile", "v1", 0, "greedy")
+    boundary.load_model(model)
+    return boundary
+
+def _growth_exponent(points: Sequence[Tuple[int, int]]) -> Optional[float]:
+    # Least-squares slope of log(time) over log(bytes)
+    points = [(math.log(b), math.log(max(ns, 1))) for b, ns in points]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if var == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+def _probe(enforcement, rule: Dict[str, Any], text: str, sizes: Sequence[int],
+           repeats: int) -> Optional[float]:
+    """
+    Growth exponent of one deny_regex rule evaluated alone on text[:size].
+    precheck() stops at the first match, so each probe resumes after every
+    match until the rest is clean: the time is that of a full scan however
+    many matches the corpus holds.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump([rule], f)
+        path = f.name
+    try:
+        boundary = _new_boundary(enforcement, path)
+        points = []
+        for size in sizes:
+            payload = text[:size].encode("utf-8")
+            best = None
+            for _ in range(repeats):
+                boundary.set_profiling(True)  # counters accumulate until the next enable
+                rest = payload
+                while not boundary.precheck(rest):
+                    violation = boundary.last_violation()
+                    if violation is None:
+                        return None  # the legacy input check refused before any rule ran
+                    rest = rest[violation.offset + 1:]
+                total_ns = boundary.rule_profile()[0].total_ns
+                best = total_ns if best is None else min(best, total_ns)
+            points.append((len(payload), best))
+        return _growth_exponent(points)
+    finally:
+        os.unlink(path)
+
+def profile_policy(policy: str, corpus: Iterable[Tuple[str, str]], token_bytes: int = 4,
+                   probe_sizes: Sequence[int] = DEFAULT_PROBE_SIZES, probe_repeats: int = 3,
+                   superlinear_threshold: float = 1.5) -> Dict[str, Any]:
+    """
+    Replays `corpus` ((input, output) pairs) through `policy`. Returns the
+    number of executions and refusals and one row per rule under "rules",
+    most expensive first. Executions stop at the first
+    refusal, like a real stream. Note that deny_regex rules re-scan the
+    whole output on every step, so their bytes_scanned grows with the
+    square of the output length whatever the pattern; the probe isolates
+    the pattern's own growth.
+    """
+    import invariant_enforcement as enforcement
+
+    policy_path = resolve_policy(policy)
+    samples = list(corpus)
+    with _quiet_fd1():
+        boundary = _new_boundary(enforcement, policy_path)
+        boundary.set_profiling(True)
+        refused = 0
+        for input_payload, output in samples:
+            try:
+                boundary.start(input_payload)
+            except RuntimeError:
+                refused += 1
+                continue
+            data = output.encode("utf-8")
+            for i in range(0, len(data), token_bytes):
+                if not boundary.step(data[i:i + token_bytes]):
+                    refused += 1
+                    break
+            else:
+                if not boundary.finish():
+                    refused += 1
+        profile = boundary.rule_profile()
+
+        rules = []
+        if not policy_path.endswith(".ipol"):  # artifacts keep no rule JSON to probe
+            with open(policy_path) as f:
+                document = json.load(f)
+            rules = document["rules"] if isinstance(document, dict) else document
+        probe_text = "\n".join(output for _, output in samples)
+        if probe_text:
+            probe_text = probe_text * (max(probe_sizes) // len(probe_text) + 1)
+        growth = {}
+        for stats, rule in zip(profile, rules):
+            if stats.type == "deny_regex" and probe_text:
+                growth[stats.rule_id] = _probe(enforcement, rule, probe_text, probe_sizes, probe_repeats)
+
+    total_ns = sum(s.total_ns for s in profile) or 1
+    rows = []
+    for stats in profile:
+        exponent = growth.get(stats.rule_id)
+        rows.append({
+            "rule": stats.rule_id,
+            "type": stats.type,
+            "evals": stats.evaluations,
+            "matches": stats.matches,
+            "total_ms": stats.total_ns / 1e6,
+            "share_pct": 100.0 * stats.total_ns / total_ns,
+            "mean_us": stats.total_ns / stats.evaluations / 1e3 if stats.evaluations else 0.0,
+            "max_us": stats.max_ns / 1e3,
+            "mb_scanned": stats.bytes_scanned / 1e6,
+            "ns_per_byte": stats.total_ns / stats.bytes_scanned if stats.bytes_scanned else 0.0,
+            "growth": exponent,
+            "superlinear": exponent is not None and exponent > superlinear_threshold,
+        })
+    rows.sort(key=lambda r: -r["total_ms"])
+    return {"executions": len(samples), "refused": refused, "rules": rows}
+
+def format_profile(rows: List[Dict[str, Any]]) -> str:
+    if not rows:
+        return "(policy has no rules)"
+    headers = ["rule", "type", "evals", "matches", "total_ms", "share_pct", "mean_us", "max_us",
+               "mb_scanned", "ns_per_byte", "growth", "flag"]
+    cells = []
+    for row in rows:
+        values = dict(row, flag="SUPERLINEAR" if row["superlinear"] else "",
+                      growth="-" if row["growth"] is None else row["growth"])
+        cells.append([f"{values[h]:.2f}" if isinstance(values[h], float) else str(values[h]) for h in headers])
+    widths = [max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)]
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths))]
+    lines += ["  ".join(c.ljust(w) for c, w in zip(row, widths)) for row in cells]
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Per-rule cost profile of an Invariant policy")
+    parser.add_argument("policy", help="Policy name (policies/<name>.json) or path")
+    parser.add_argument("corpus", nargs="+", help="Receipts (.json / .jsonl) or plain-text output files")
+    parser.add_argument("--token-bytes", type=int, default=4, help="Replay step size")
+    parser.add_argument("--probe-sizes", default=",".join(map(str, DEFAULT_PROBE_SIZES)),
+                        help="Comma-separated input lengths for the growth probe")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="Growth exponent above which a rule is flagged")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.probe_sizes.split(",") if s]
+    report = profile_policy(args.policy, iter_corpus(args.corpus), token_bytes=args.token_bytes,
+                            probe_sizes=sizes, superlinear_threshold=args.threshold)
+    print(f"=== Policy profile: {args.policy} ({report['executions']} outputs replayed, "
+          f"{report['refused']} refused) ===")
+    print(format_profile(report["rules"]))
+    flagged = [r["rule"] for r in report["rules"] if r["superlinear"]]
+    if flagged:
+        print(f"[Invariant] Superlinear rules (exponent > {args.threshold:g}): {', '.join(flagged)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import base64
+import json
+import os
+from typing import Any, Dict
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ContextSource, ExecutionGraph
+
+# Wire format shared by the kernel service and its thin clients.
+# One JSON object per line over a local stream socket:
+#   client -> service   {"op": "execute", ...request}
+#                       {"op": "receipt", "result": {...}, "timestamp": <epoch s, optional>}
+#                       (result must be one this service issued; see InvariantService)
+#   service -> client   {"event": "token", "data": "..."}   (zero or more)
+#                       {"event": "result", ...result}
+#                       {"event": "receipt", "receipt": {...}}
+#                       {"event": "error", "message": "...", "aborted": bool, "graph": {...}|null,
+#                        "violation": {"rule_id", "type", "stage", "offset"}|null, "timing": {...}|null}
+
+SOCKET_ENV = "INVARIANT_SOCKET"
+# Invariant.execute options a client may set. trust_context_hashes is not
+# one of them: the service always hashes context itself, so a client cannot
+# have digests it made up attested.
+WIRE_OPTIONS = ("speculative", "scan_context", "record_timeline", "use_cache")
+DEFAULT_SOCKET = os.path.join(os.environ.get("TMPDIR", "/tmp"), "invariant.sock")
+
+def encode(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+def request_to_wire(input_payload: str, identity: Identity, model_spec: ModelSpec,
+                    context_spec: ContextSpec, policy_name: str, **options) -> Dict[str, Any]:
+    # Sessions pass their local digest hint; the service re-hashes instead
+    options.pop("trust_context_hashes", None)
+    return {
+        "op": "execute",
+        "input_payload": input_payload,
+        "identity": identity.__dict__,
+        "model": model_spec.__dict__,
+        "context": {"sources": [s.__dict__ for s in context_spec.sources]},
+        "policy_name": policy_name,
+        "options": options,
+    }
+
+def request_from_wire(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns keyword arguments for Invariant.execute."""
+    options = message.get("options", {})
+    unknown = sorted(set(options) - set(WIRE_OPTIONS))
+    if unknown:
+        raise ValueError(f"Options not allowed over the wire: {', '.join(unknown)}")
+    return {
+        "input_payload": message["input_payload"],
+        "identity": Identity(**message["identity"]),
+        "model_spec": ModelSpec(**message["model"]),
+        "context_spec": ContextSpec([ContextSource(**s) for s in message["context"]["sources"]]),
+        "policy_name": message["policy_name"],
+        **options,
+    }
+
+def result_to_wire(result: Dict[str, Any]) -> Dict[str, Any]:
+    wire = dict(result)
+    wire["graph"] = result["graph"].to_dict()
+    if result.get("timeline") is not None:
+        wire["timeline"] = base64.b64encode(result["timeline"]).decode("ascii")
+    return wire
+
+def result_from_wire(wire: Dict[str, Any]) -> Dict[str, Any]:
+    result = {k: v for k, v in wire.items() if k != "event"}
+    result["graph"] = ExecutionGraph.from_dict(wire["graph"])
+    if result["graph"].id != wire["graph"]["id"]:
+        raise ValueError("Execution Graph ID mismatch in service response")
+    if wire.get("timeline") is not None:
+        result["timeline"] = base64.b64decode(wire["timeline"])
+    return result
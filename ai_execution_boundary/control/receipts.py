@@ -0,0 +1,237 @@
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+class ReceiptWriter:
+    """
+    Background group-commit writer for execution receipts.
+
+    submit() only timestamps the result and puts it on a bounded queue; a
+    writer thread builds and signs the receipts (invariant.build_receipt,
+    local or remote) and appends them to a JSONL file, one receipt per
+    line. Whatever is queued when the thread wakes up, up to max_batch, is
+    written with a single write() and, depending on the fsync policy, a
+    single fsync() - one disk round trip for the whole group.
+
+    Backpressure: when the disk lags and max_queue receipts are pending,
+    submit() blocks (up to `timeout`, then TimeoutError) instead of
+    buffering without bound.
+
+    Durability. submit() returns a Future that resolves to the receipt once
+    it is committed according to `fsync`:
+      - "always":   the batch is fsynced before its futures resolve. A
+                    resolved receipt survives a process crash and a power
+                    loss.
+      - "interval": the batch is written to the OS before its futures
+                    resolve, and fsynced at most every fsync_interval_s.
+                    A resolved receipt survives a process crash; a power
+                    loss can lose the last interval.
+      - "never":    as "interval", but only close() fsyncs.
+    Receipts whose futures have not resolved may be lost by a crash. A crash
+    in the middle of a write can leave a torn last line; it is truncated
+    when the file is next opened by a ReceiptWriter, so the file always
+    holds whole receipts. close() (or leaving the `with` block) drains the
+    queue, fsyncs and closes the file.
+
+    A write or fsync error stops the writer for good: the failed batch and
+    everything still queued resolve with the error, and submit() and
+    flush() raise from then on.
+    """
+
+    _STOP = object()
+
+    def __init__(self, invariant, path: str, fsync: str = "always", fsync_interval_s: float = 0.05,
+                 max_queue: int = 1024, max_batch: int = 256):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.invariant = invariant
+        self.path = path
+        self.fsync = fsync
+        self.fsync_interval_s = fsync_interval_s
+        self.max_batch = max_batch
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._last_fsync = time.monotonic()
+        self._dirty = False  # written but not yet fsynced
+        self._stats = {"written": 0, "failed": 0, "batches": 0, "fsyncs": 0, "largest_batch": 0}
+
+        self._file = open(path, "ab+")
+        self._recover()
+        self._thread = threading.Thread(target=self._run, name="receipt-writer", daemon=True)
+        self._thread.start()
+
+    def _recover(self):
+        # Drop a torn last line left by a crash mid-write
+        size = self._file.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        self._file.seek(size - 1)
+        if self._file.read(1) == b"\n":
+            return
+        end, chunk = size, 1 << 16
+        while end > 0:
+            start = max(0, end - chunk)
+            self._file.seek(start)
+            cut = self._file.read(end - start).rfind(b"\n")
+            if cut >= 0:
+                end = start + cut + 1
+                break
+            end = start
+        self._file.truncate(end)
+        os.fsync(self._file.fileno())
+        print(f"[Invariant] Receipt log {self.path}: discarded {size - end} bytes of a torn write")
+
+    def submit(self, result: Dict[str, Any], timeout: Optional[float] = None) -> Future:
+        """Queues a result for its receipt. Blocks while the queue is full."""
+        if self._closed:
+            raise RuntimeError("ReceiptWriter is closed")
+        self._raise_if_failed()
+        future: Future = Future()
+        try:
+            self._queue.put((result, time.time(), future), timeout=timeout)
+        except queue.Full:
+            raise TimeoutError(f"Receipt queue full for {timeout}s (disk is lagging)") from None
+        if self._error is not None:
+            self._fail_pending()  # the writer stopped while we were queueing
+        return future
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise RuntimeError(f"ReceiptWriter failed: {self._error}") from self._error
+
+    def _fail_pending(self):
+        # Once the writer has stopped, nothing queued will be written: fail
+        # the receipts and release flush() callers. Safe from any thread.
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not self._STOP and item[2].set_running_or_notify_cancel():
+                self._stats["failed"] += 1
+                item[2].set_exception(self._error)
+
+    def _run(self):
+        # Any error stops the writer for good: appending after a partial
+        # batch would leave a torn line mid-file, which _recover() (last line
+        # only) cannot repair.
+        try:
+            self._write_batches()
+            self._sync()
+        except Exception as e:  # e.g. fsync failing on the idle path
+            if self._error is None:
+                self._error = e
+        finally:
+            if self._error is not None:
+                self._fail_pending()
+            self._file.close()
+
+    def _write_batches(self):
+        stopping = False
+        while not stopping:
+            try:
+                # In "interval" mode an idle writer still syncs its last batch
+                item = self._queue.get(timeout=self.fsync_interval_s if self._dirty else None)
+            except queue.Empty:
+                self._sync()
+                continue
+            batch: List[Tuple[Dict[str, Any], float, Future]] = []
+            barriers: List[threading.Event] = []
+            while True:
+                if item is self._STOP:
+                    stopping = True
+                    break
+                if isinstance(item, threading.Event):
+                    barriers.append(item)  # flush(): commit what precedes it now
+                    break
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._commit(batch)
+            for barrier in barriers:
+                barrier.set()
+            if self._error is not None:
+                return
+
+    def _commit(self, batch: List[Tuple[Dict[str, Any], float, Future]]):
+        lines, committed = [], []
+        for result, submitted_at, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                receipt = self.invariant.build_receipt(result, timestamp=submitted_at)
+                lines.append(json.dumps(receipt, separators=(",", ":")).encode("utf-8") + b"\n")
+                committed.append((future, receipt))
+            except Exception as e:
+                self._stats["failed"] += 1
+                future.set_exception(e)
+        if not lines:
+            return
+        try:
+            self._file.write(b"".join(lines))
+            self._file.flush()
+            self._dirty = self.fsync == "interval"
+            if self.fsync == "always" or (self.fsync == "interval"
+                                          and time.monotonic() - self._last_fsync >= self.fsync_interval_s):
+                self._sync()
+        except OSError as e:
+            # The file may now end in a partial batch; stop accepting work
+            self._error = e
+            self._stats["failed"] += len(committed)
+            for future, _ in committed:
+                future.set_exception(e)
+            return
+        self._stats["written"] += len(committed)
+        self._stats["batches"] += 1
+        self._stats["largest_batch"] = max(self._stats["largest_batch"], len(committed))
+        for future, receipt in committed:
+            future.set_result(receipt)
+
+    def _sync(self):
+        if self._error is None:
+            os.fsync(self._file.fileno())
+            self._stats["fsyncs"] += 1
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+
+    def flush(self):
+        """Blocks until every receipt submitted before the call is committed."""
+        if self._closed:
+            return
+        self._raise_if_failed()
+        barrier = threading.Event()
+        self._queue.put(barrier)
+        if self._error is not None:
+            self._fail_pending()
+        barrier.wait()
+        self._raise_if_failed()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, queued=self._queue.qsize())
+
+    def __enter__(self) -> "ReceiptWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
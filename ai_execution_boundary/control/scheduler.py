@@ -0,0 +1,275 @@
+import collections
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ai_execution_boundary.control.errors import ExecutionRejected
+from ai_execution_boundary.control.execution_graph import Identity
+
+def nearest_rank(n: int, p: float) -> int:
+    """Index of the p-th percentile among n sorted values (nearest rank)."""
+    # ceil(p/100 * n) computed as p*n/100, which is exact for integer p
+    return max(0, min(n - 1, math.ceil(p * n / 100) - 1))
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list (nan when empty)."""
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[nearest_rank(len(sorted_values), p)]
+
+@dataclass
+class _Bucket:
+    """Token bucket: `rate` units per second, up to `burst` at once."""
+    rate: float
+    burst: float
+    tokens: float
+    refilled: float
+
+    def available(self, now: float) -> bool:
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+        return self.tokens >= 1
+
+    def take(self, n: float = 1):
+        # May go negative: a budget overdrawn by a stream is repaid before
+        # the next admission
+        self.tokens -= n
+
+    def refund(self, n: float = 1):
+        self.tokens = min(self.burst, self.tokens + n)
+
+@dataclass
+class _Waiter:
+    identity_key: Tuple[str, str]
+    start: float  # virtual start time
+    tag: float  # virtual finish time (weighted fair queueing)
+    seq: int
+    enqueued: float
+    admitted: threading.Event = field(default_factory=threading.Event)
+
+@dataclass
+class _Tenant:
+    weight: float
+    queue: Deque[_Waiter] = field(default_factory=collections.deque)
+    in_flight: int = 0
+    last_tag: float = 0.0
+    admitted: int = 0
+    rejected: int = 0
+    bucket: Optional[_Bucket] = None
+    token_bucket: Optional[_Bucket] = None
+
+class Scheduler:
+    """
+    Admission control in front of Invariant.execute (or a RemoteInvariant).
+
+    - Concurrency limits: max_concurrency overall, per_org_concurrency per
+      org, per_identity_concurrency per (org, user).
+    - Rate budgets, each an optional token bucket per org: rate_limits maps
+      an org to (executions per second, burst) and token_rate_limits to
+      (streamed model tokens per second, burst); default_rate_limit and
+      default_token_rate_limit apply to the others. Every token forwarded
+      to on_token is charged as it streams, so a long stream can overdraw
+      the budget. An exhausted budget rejects immediately.
+    - Weighted fair queueing: requests that cannot start yet wait in a
+      per-org FIFO. Each gets a virtual finish tag (start + 1/weight, start
+      being the later of the current virtual time and the org's previous
+      tag) and free slots go to the eligible request with the smallest tag,
+      so a busy org cannot push a quiet one to the back of a long queue.
+      A request that times out in the queue gives its share back.
+    - Load shedding: a full queue (max_queue overall, max_queue_per_org per
+      org) or a wait longer than max_wait_s raises ExecutionRejected.
+
+    metrics() reports queue depth, in-flight work, admissions/rejections and
+    queue wait percentiles.
+    """
+
+    def __init__(self, invariant, max_concurrency: int = 8, per_org_concurrency: int = 4,
+                 per_identity_concurrency: int = 2, org_weights: Optional[Dict[str, float]] = None,
+                 rate_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default_rate_limit: Optional[Tuple[float, float]] = None,
+                 token_rate_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default_token_rate_limit: Optional[Tuple[float, float]] = None,
+                 max_queue: int = 256, max_queue_per_org: int = 64, max_wait_s: Optional[float] = 30.0):
+        self.invariant = invariant
+        self.max_concurrency = max_concurrency
+        self.per_org_concurrency = per_org_concurrency
+        self.per_identity_concurrency = per_identity_concurrency
+        self.org_weights = org_weights or {}
+        self.rate_limits = rate_limits or {}
+        self.default_rate_limit = default_rate_limit
+        self.token_rate_limits = token_rate_limits or {}
+        self.default_token_rate_limit = default_token_rate_limit
+        self.max_queue = max_queue
+        self.max_queue_per_org = max_queue_per_org
+        self.max_wait_s = max_wait_s
+
+        self._lock = threading.Lock()
+        self._tenants: Dict[str, _Tenant] = {}
+        self._identity_in_flight: Dict[Tuple[str, str], int] = collections.Counter()
+        self._in_flight = 0
+        self._queued = 0
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        self._rejections: Dict[str, int] = collections.Counter()
+        self._waits_ms: Deque[float] = collections.deque(maxlen=4096)
+
+    def _tenant(self, org: str, now: float) -> _Tenant:
+        tenant = self._tenants.get(org)
+        if tenant is None:
+            tenant = _Tenant(weight=float(self.org_weights.get(org, 1.0)))
+            limit = self.rate_limits.get(org, self.default_rate_limit)
+            if limit is not None:
+                rate, burst = limit
+                tenant.bucket = _Bucket(rate, burst, burst, now)
+            limit = self.token_rate_limits.get(org, self.default_token_rate_limit)
+            if limit is not None:
+                rate, burst = limit
+                tenant.token_bucket = _Bucket(rate, burst, burst, now)
+            self._tenants[org] = tenant
+        return tenant
+
+    def _reject(self, tenant: _Tenant, reason: str, message: str) -> ExecutionRejected:
+        tenant.rejected += 1
+        self._rejections[reason] += 1
+        return ExecutionRejected(message, reason=reason)
+
+    def _charge(self, tenant: _Tenant, waiter: _Waiter):
+        # Only requests that start or queue use up the org's tag and budget;
+        # a rejected one leaves both as they were
+        tenant.last_tag = waiter.tag
+        if tenant.bucket is not None:
+            tenant.bucket.take()
+
+    def _refund(self, tenant: _Tenant, waiter: _Waiter):
+        # A request that never ran gives back its budget and its share of
+        # the org's virtual time: the requests chained behind it start where
+        # it started (but not before the current virtual time)
+        if tenant.bucket is not None:
+            tenant.bucket.refund()
+        old, new = waiter.tag, waiter.start
+        for later in tenant.queue:
+            if later.seq < waiter.seq:
+                continue
+            start = max(new, self._virtual_time)
+            if later.start != old or start >= later.start:
+                return  # not chained to the removed tag, or nothing to give back
+            old = later.tag
+            later.start, later.tag = start, start + 1.0 / tenant.weight
+            new = later.tag
+        if tenant.last_tag == old:
+            tenant.last_tag = new
+
+    def _eligible(self, org: str, tenant: _Tenant, waiter: _Waiter) -> bool:
+        return (tenant.in_flight < self.per_org_concurrency
+                and self._identity_in_flight[waiter.identity_key] < self.per_identity_concurrency)
+
+    def _start(self, org: str, tenant: _Tenant, waiter: _Waiter, now: float):
+        tenant.in_flight += 1
+        tenant.admitted += 1
+        self._identity_in_flight[waiter.identity_key] += 1
+        self._in_flight += 1
+        self._waits_ms.append((now - waiter.enqueued) * 1000)
+
+    def _dispatch(self, now: float):
+        # Called with the lock held: hand free slots to the smallest tags
+        while self._in_flight < self.max_concurrency and self._queued:
+            best = None
+            for org, tenant in self._tenants.items():
+                for waiter in tenant.queue:
+                    if self._eligible(org, tenant, waiter):
+                        if best is None or (waiter.tag, waiter.seq) < (best[2].tag, best[2].seq):
+                            best = (org, tenant, waiter)
+                        break  # FIFO within an org: first eligible request only
+            if best is None:
+                return
+            org, tenant, waiter = best
+            tenant.queue.remove(waiter)
+            self._queued -= 1
+            self._virtual_time = max(self._virtual_time, waiter.start)
+            self._start(org, tenant, waiter, now)
+            waiter.admitted.set()
+
+    def _acquire(self, identity: Identity):
+        now = time.monotonic()
+        org = identity.org
+        with self._lock:
+            tenant = self._tenant(org, now)
+            if tenant.bucket is not None and not tenant.bucket.available(now):
+                raise self._reject(tenant, "rate_limited", f"Execution Rejected: rate budget exhausted for org '{org}'")
+            if tenant.token_bucket is not None and not tenant.token_bucket.available(now):
+                raise self._reject(tenant, "rate_limited", f"Execution Rejected: token budget exhausted for org '{org}'")
+
+            start_tag = max(self._virtual_time, tenant.last_tag)
+            waiter = _Waiter((org, identity.user_id), start_tag, start_tag + 1.0 / tenant.weight,
+                             next(self._seq), now)
+
+            # Fast path: nothing queued ahead and a slot is free
+            if (self._in_flight < self.max_concurrency and not tenant.queue
+                    and self._eligible(org, tenant, waiter)):
+                self._charge(tenant, waiter)
+                self._virtual_time = max(self._virtual_time, start_tag)
+                self._start(org, tenant, waiter, now)
+                return
+
+            if self._queued >= self.max_queue:
+                raise self._reject(tenant, "queue_full", "Execution Rejected: scheduler queue is full")
+            if len(tenant.queue) >= self.max_queue_per_org:
+                raise self._reject(tenant, "queue_full", f"Execution Rejected: queue for org '{org}' is full")
+            self._charge(tenant, waiter)
+            tenant.queue.append(waiter)
+            self._queued += 1
+
+        if waiter.admitted.wait(self.max_wait_s):
+            return
+        with self._lock:
+            if waiter.admitted.is_set():
+                return  # Admitted just as the wait timed out
+            tenant.queue.remove(waiter)
+            self._queued -= 1
+            self._refund(tenant, waiter)
+            raise self._reject(tenant, "timeout",
+                               f"Execution Rejected: no capacity within {self.max_wait_s}s for org '{org}'")
+
+    def _release(self, identity: Identity):
+        with self._lock:
+            tenant = self._tenants[identity.org]
+            tenant.in_flight -= 1
+            self._identity_in_flight[(identity.org, identity.user_id)] -= 1
+            self._in_flight -= 1
+            self._dispatch(time.monotonic())
+
+    def execute(self, input_payload: str, identity: Identity, model_spec, context_spec, **kwargs) -> Dict[str, Any]:
+        """Same signature as Invariant.execute; blocks until admitted or raises ExecutionRejected."""
+        self._acquire(identity)
+        tenant = self._tenants[identity.org]
+        if tenant.token_bucket is not None:
+            on_token = kwargs.get("on_token")
+
+            def metered(token):
+                with self._lock:
+                    tenant.token_bucket.take()
+                if on_token is not None:
+                    on_token(token)
+            kwargs["on_token"] = metered
+        try:
+            return self.invariant.execute(input_payload, identity, model_spec, context_spec, **kwargs)
+        finally:
+            self._release(identity)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits_ms)
+            return {
+                "queue_depth": self._queued,
+                "in_flight": self._in_flight,
+                "rejected": dict(self._rejections),
+                "wait_ms": {"p50": percentile(waits, 50) if waits else None,
+                            "p99": percentile(waits, 99) if waits else None,
+                            "max": waits[-1] if waits else None},
+                "orgs": {org: {"queued": len(t.queue), "in_flight": t.in_flight,
+                               "admitted": t.admitted, "rejected": t.rejected}
+                         for org, t in self._tenants.items()},
+            }
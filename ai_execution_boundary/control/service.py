@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from ai_execution_boundary.control.orchestrator import Invariant
+from ai_execution_boundary.control.cache import ExecutionCache
+from ai_execution_boundary.control.errors import ExecutionAborted, ExecutionRejected
+from ai_execution_boundary.control.protocol import (
+    DEFAULT_SOCKET, SOCKET_ENV, encode, request_from_wire, result_to_wire
+)
+from ai_execution_boundary.control.scheduler import Scheduler
+from ai_execution_boundary.control.session import chain_link
+
+class InvariantService:
+    """
+    Long-running kernel service on a local Unix socket.
+    Keeps the extension loaded, a pool of warm kernels (see pool.py) and a
+    single node key, so clients pay neither startup cost nor a throwaway identity per process.
+    Approved tokens are streamed back as they pass the kernel; socket writes
+    block when the client reads slowly, which throttles the model stream.
+
+    Executions are admitted through a Scheduler (see scheduler.py). By
+    default every concurrency limit is the pool size, so orgs share the
+    kernels by weighted fair queueing alone; `admission` overrides any
+    Scheduler argument. A shed request reaches the client as an
+    ExecutionRejected with its reason.
+
+    The node key only signs what this service produced: every result (and
+    abort) it returns is remembered by (graph id, proof), up to max_issued,
+    and a receipt request is served from that record. The client's copy
+    only selects the record; of its fields, just a session block whose link
+    commits to the recorded proof and graph is taken over.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, pool_size: int = 4, warm_policies: List[str] = (),
+                 cache_path: Optional[str] = None, max_issued: int = 4096,
+                 admission: Optional[Dict[str, Any]] = None):
+        self.socket_path = socket_path
+        self.private_key = ed25519.Ed25519PrivateKey.generate()
+        cache = ExecutionCache(cache_path) if cache_path else None
+        self.invariant = Invariant(private_key=self.private_key, pool_size=pool_size, cache=cache)
+        self.invariant.warm_policies(warm_policies)
+        limits = dict.fromkeys(("max_concurrency", "per_org_concurrency", "per_identity_concurrency"), pool_size)
+        self.scheduler = Scheduler(self.invariant, **{**limits, **(admission or {})})
+        self.max_issued = max_issued
+        self._issued: "OrderedDict[Tuple[str, Optional[str]], Dict[str, Any]]" = OrderedDict()
+        self._issued_lock = threading.Lock()
+        self._server = None
+
+    def _issue(self, result: Dict[str, Any]):
+        key = (result["graph"].id, result["proof"])
+        with self._issued_lock:
+            self._issued[key] = result
+            self._issued.move_to_end(key)
+            while len(self._issued) > self.max_issued:
+                self._issued.popitem(last=False)
+
+    def _receipt(self, message) -> Dict[str, Any]:
+        wire = message["result"]
+        with self._issued_lock:
+            result = self._issued.get((wire["graph"]["id"], wire.get("proof")))
+        if result is None:
+            raise ValueError("Refusing to sign a result this service did not issue (unknown or expired)")
+        session = wire.get("session")
+        if session is not None:
+            if session["link"] != chain_link(session["prev_link"], result["proof"], result["graph"].id):
+                raise ValueError("Session link does not commit to the issued proof and graph")
+            result = dict(result, session={k: session[k] for k in ("id", "turn", "prev_link", "link")})
+        return self.invariant.build_receipt(result, timestamp=message.get("timestamp"))
+
+    def handle(self, rfile, wfile):
+        for line in rfile:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            op = message.get("op")
+            if op == "execute":
+                self._execute(message, wfile)
+            elif op == "receipt":
+                try:
+                    wfile.write(encode({"event": "receipt", "receipt": self._receipt(message)}))
+                except (KeyError, ValueError) as e:
+                    wfile.write(encode({"event": "error", "message": str(e), "aborted": False}))
+            else:
+                wfile.write(encode({"event": "error", "message": f"Unknown op: {op}", "aborted": False}))
+            wfile.flush()
+
+    def _execute(self, message, wfile):
+        def on_token(token):
+            if isinstance(token, bytes):
+                token = token.decode("utf-8")
+            wfile.write(encode({"event": "token", "data": token}))
+            wfile.flush()
+
+        try:
+            result = self.scheduler.execute(**request_from_wire(message), on_token=on_token)
+            self._issue(result)
+            wfile.write(encode({"event": "result", **result_to_wire(result)}))
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away; execute() already cancelled the model stream
+            raise
+        except ExecutionAborted as e:
+            graph = e.graph.to_dict() if e.graph is not None else None
+            if e.graph is not None:
+                self._issue(e.to_result())
+            wfile.write(encode({"event": "error", "message": str(e), "aborted": True, "graph": graph,
+                                "violation": e.violation, "timing": e.timing}))
+        except ExecutionRejected as e:
+            wfile.write(encode({"event": "error", "message": str(e), "aborted": False, "rejected": e.reason}))
+        except Exception as e:
+            wfile.write(encode({"event": "error", "message": str(e), "aborted": False}))
+
+    def serve_forever(self):
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    service.handle(self.rfile, self.wfile)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self._server.daemon_threads = True
+        print(f"[Invariant] Kernel Service listening on {self.socket_path} "
+              f"(pool: {self.invariant.pool.max_size} kernels)", flush=True)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def start_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        while self._server is None or not os.path.exists(self.socket_path):
+            threading.Event().wait(0.01)
+        return thread
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="Invariant kernel service (Unix socket)")
+    parser.add_argument("--socket", default=os.environ.get(SOCKET_ENV, DEFAULT_SOCKET))
+    parser.add_argument("--pool", type=int, default=4, help="Number of warm kernels")
+    parser.add_argument("--warm-policy", action="append", default=[], help="Policy to pre-load (repeatable)")
+    parser.add_argument("--cache", default=None, help="SQLite file for the deterministic response cache")
+    parser.add_argument("--per-org-concurrency", type=int, default=None,
+                        help="Executions one org may run at once (default: the pool size)")
+    parser.add_argument("--max-wait", type=float, default=30.0, help="Seconds a request may queue before it is shed")
+    args = parser.parse_args()
+
+    admission = {"max_wait_s": args.max_wait}
+    if args.per_org_concurrency is not None:
+        admission["per_org_concurrency"] = args.per_org_concurrency
+    service = InvariantService(args.socket, args.pool, args.warm_policy, args.cache, admission=admission)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import hashlib
+import threading
+import uuid
+from typing import Any, Dict, Optional
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ContextSource
+
+SESSION_SCHEMA = "invariant.session.v1"
+
+def genesis_link(session_id: str) -> str:
+    return hashlib.sha256(f"{SESSION_SCHEMA}|{session_id}".encode("utf-8")).hexdigest()
+
+def chain_link(prev_link: str, proof: str, graph_id: str) -> str:
+    """link_n = sha256(link_{n-1} | proof_n | graph_id_n)"""
+    return hashlib.sha256(f"{prev_link}|{proof}|{graph_id}".encode("utf-8")).hexdigest()
+
+def verify_link(session_block: Dict[str, Any], proof: str, graph_id: str,
+                prev_link: Optional[str] = None) -> bool:
+    """
+    Checks one turn of a session chain in O(1): the turn's link must commit
+    to its own proof and graph and to the previous link. Pass prev_link
+    (the link of turn N-1, or None for the first turn) to also check the
+    turn's position in the chain; earlier turns are never reprocessed.
+    """
+    if prev_link is None and session_block["turn"] == 0:
+        prev_link = genesis_link(session_block["id"])
+    if prev_link is not None and session_block["prev_link"] != prev_link:
+        return False
+    return session_block["link"] == chain_link(session_block["prev_link"], proof, graph_id)
+
+class Session:
+    """
+    A multi-turn conversation sealed as a hash chain.
+
+    Identity, policy and context are fixed for the session. Context digests
+    are computed on the first turn and reused afterwards (call
+    refresh_context() if the files may have changed), and the compiled
+    policy stays warm in the kernel pool. Each completed turn is chained to
+    the previous one; only the last link is kept, so the cost of a turn does
+    not depend on the length of the conversation.
+
+    Works with an in-process Invariant or a RemoteInvariant.
+    """
+
+    def __init__(self, invariant, identity: Identity, policy_name: str,
+                 context_spec: ContextSpec, session_id: Optional[str] = None):
+        self.invariant = invariant
+        self.identity = identity
+        self.policy_name = policy_name
+        self.context_spec = context_spec
+        self.id = session_id or uuid.uuid4().hex
+        self.turn = 0
+        self.link = genesis_link(self.id)
+        self._warm = False
+        self._lock = threading.Lock()
+
+    def refresh_context(self):
+        """Re-hash the context sources on the next turn."""
+        self.context_spec = ContextSpec([ContextSource(s.type, s.sensitivity, s.identifier)
+                                         for s in self.context_spec.sources])
+        self._warm = False
+
+    def execute(self, input_payload: str, model_spec: ModelSpec, **options) -> Dict[str, Any]:
+        """
+        Runs one turn. The result carries a "session" block (id, turn,
+        prev_link, link) that build_receipt() signs into the receipt.
+        Aborted turns raise and leave the chain unchanged.
+        """
+        with self._lock:
+            result = self.invariant.execute(input_payload, self.identity, model_spec, self.context_spec,
+                                            policy_name=self.policy_name,
+                                            trust_context_hashes=self._warm, **options)
+            if not self._warm:
+                # Keep the digests computed by this turn for the following ones
+                self.context_spec = result["graph"].context
+                self._warm = True
+
+            link = chain_link(self.link, result["proof"], result["graph"].id)
+            result["session"] = {"id": self.id, "turn": self.turn, "prev_link": self.link, "link": link}
+            self.link = link
+            self.turn += 1
+            print(f"[Invariant] Session {self.id[:8]} turn {result['session']['turn']} chained: {link[:12]}...")
+            return result
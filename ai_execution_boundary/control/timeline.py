@@ -0,0 +1,60 @@
+import base64
+import hashlib
+from typing import Dict, List, Tuple
+
+# Decoder for the kernel's per-token timeline (format "ITL1", see timeline.hpp).
+
+TIMELINE_ENCODING = "invariant.timeline.v1"
+
+def _varint(blob: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = blob[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def decode_timeline(blob: bytes) -> Dict[str, object]:
+    """
+    Decodes a binary timeline into columns:
+    offsets (bytes), arrival_ns (since start), check_ns, abort_index (or None).
+    """
+    if blob[:4] != b"ITL1":
+        raise ValueError("Not an Invariant timeline (bad magic)")
+    count, pos = _varint(blob, 4)
+    abort_plus_one, pos = _varint(blob, pos)
+
+    columns: List[List[int]] = []
+    for delta_encoded in (True, True, False):
+        values, acc = [], 0
+        for _ in range(count):
+            v, pos = _varint(blob, pos)
+            acc = acc + v if delta_encoded else v
+            values.append(acc)
+        columns.append(values)
+
+    return {
+        "offsets": columns[0],
+        "arrival_ns": columns[1],
+        "check_ns": columns[2],
+        "abort_index": abort_plus_one - 1 if abort_plus_one else None,
+    }
+
+def timeline_digest(blob: bytes) -> str:
+    return hashlib.sha256(blob).hexdigest()
+
+def timeline_to_receipt(blob: bytes) -> Dict[str, str]:
+    """Receipt block embedding the timeline (base64) and its digest."""
+    return {
+        "encoding": TIMELINE_ENCODING,
+        "data": base64.b64encode(blob).decode("ascii"),
+        "digest": timeline_digest(blob),
+    }
+
+def timeline_from_receipt(block: Dict[str, str]) -> bytes:
+    blob = base64.b64decode(block["data"])
+    if timeline_digest(blob) != block["digest"]:
+        raise ValueError("Timeline digest mismatch")
+    return blob
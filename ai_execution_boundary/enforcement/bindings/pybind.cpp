@@ -7,6 +7,25 @@
 namespace py = pybind11;
 using namespace invariant;
 
+// Read-only handle on kernel-owned output bytes.
+// Holding the shared_ptr keeps the bytes alive for as long as any Python
+// memoryview exported from this object exists.
+struct OutputBuffer {
+  std::shared_ptr<const std::string> data;
+};
+
+// View a contiguous 1-D byte buffer (bytes, bytearray, memoryview) without
+// copying it. The view is only valid for the duration of the call.
+static std::string_view as_bytes_view(const py::buffer &buf,
+                                      py::buffer_info &info) {
+  info = buf.request();
+  if (info.ndim != 1 || info.itemsize != 1 || info.strides[0] != 1) {
+    throw py::value_error("Expected a contiguous 1-D byte buffer");
+  }
+  return std::string_view(static_cast<const char *>(info.ptr),
+                          static_cast<size_t>(info.size));
+}
+
 PYBIND11_MODULE(invariant_enforcement, m) {
   m.doc() = "Invariant C++ Enforcement Plane Bindings";
 
@@ -37,25 +56,134 @@ PYBIND11_MODULE(invariant_enforcement, m) {
       .def(py::init<>())
       .def_readwrite("sources", &ContextSpec::sources);
 
+  py::class_<ContextViolation>(m, "ContextViolation")
+      .def_readonly("identifier", &ContextViolation::identifier)
+      .def_readonly("rule_id", &ContextViolation::rule_id)
+      .def_readonly("pattern", &ContextViolation::pattern)
+      .def_readonly("offset", &ContextViolation::offset);
+
+  py::class_<CopyStats>(m, "CopyStats")
+      .def_readonly("ingress_bytes", &CopyStats::ingress_bytes)
+      .def_readonly("egress_bytes", &CopyStats::egress_bytes)
+      .def_readonly("detach_bytes", &CopyStats::detach_bytes)
+      .def_property_readonly("total", &CopyStats::total);
+
+  py::class_<RuleViolation>(m, "RuleViolation")
+      .def_readonly("rule_id", &RuleViolation::rule_id)
+      .def_readonly("type", &RuleViolation::type)
+      .def_readonly("stage", &RuleViolation::stage)
+      .def_readonly("offset", &RuleViolation::offset);
+
+  py::class_<AllocStats>(m, "AllocStats")
+      .def_readonly("boundaries_constructed", &AllocStats::boundaries_constructed)
+      .def_readonly("policy_compiles", &AllocStats::policy_compiles)
+      .def_readonly("policy_cache_hits", &AllocStats::policy_cache_hits)
+      .def_readonly("buffer_growths", &AllocStats::buffer_growths)
+      .def_property_readonly("total", &AllocStats::total);
+
+  py::class_<RuleProfile>(m, "RuleProfile")
+      .def_readonly("rule_id", &RuleProfile::rule_id)
+      .def_readonly("type", &RuleProfile::type)
+      .def_readonly("evaluations", &RuleProfile::evaluations)
+      .def_readonly("total_ns", &RuleProfile::total_ns)
+      .def_readonly("max_ns", &RuleProfile::max_ns)
+      .def_readonly("matches", &RuleProfile::matches)
+      .def_readonly("bytes_scanned", &RuleProfile::bytes_scanned);
+
+  py::class_<OutputBuffer>(m, "OutputBuffer", py::buffer_protocol())
+      .def_buffer([](OutputBuffer &b) {
+        return py::buffer_info(const_cast<char *>(b.data->data()), 1, "B", 1,
+                               {static_cast<py::ssize_t>(b.data->size())},
+                               {1}, /*readonly=*/true);
+      })
+      .def("__len__", [](const OutputBuffer &b) { return b.data->size(); });
+
   // Bind ExecutionBoundary
   py::class_<ExecutionBoundary>(m, "ExecutionBoundary")
       .def(py::init<>())
+      .def_readonly_static("kScanCacheEntries",
+                           &ExecutionBoundary::kScanCacheEntries)
+      .def_readonly_static("kErrorHash", &ExecutionBoundary::kErrorHash)
       .def("load_policy", &ExecutionBoundary::load_policy,
            "Load a compiled policy by name")
       .def("load_model", &ExecutionBoundary::load_model,
            "Freeze model configuration")
       .def("load_context", &ExecutionBoundary::load_context,
            "Load context sources")
+      .def("scan_context", &ExecutionBoundary::scan_context, py::arg("source"),
+           py::arg("chunk_bytes") = ExecutionBoundary::kScanChunkBytes,
+           py::arg("overlap_bytes") = ExecutionBoundary::kScanOverlapBytes,
+           py::call_guard<py::gil_scoped_release>(),
+           "Scan a context source (mmap, parallel) against the deny rules")
+      // str and bytes bind to std::string_view without copying; the
+      // py::buffer overloads cover memoryview/bytearray.
       .def("precheck", &ExecutionBoundary::precheck,
            "Run admissibility pre-check")
+      .def(
+          "precheck",
+          [](ExecutionBoundary &b, const py::buffer &input) {
+            py::buffer_info info;
+            return b.precheck(as_bytes_view(input, info));
+          },
+          "Run admissibility pre-check on a byte buffer")
       .def("run", &ExecutionBoundary::run, "Execute the model proxy")
       .def("start", &ExecutionBoundary::start, "Start streaming execution")
+      .def(
+          "start",
+          [](ExecutionBoundary &b, const py::buffer &input) {
+            py::buffer_info info;
+            b.start(as_bytes_view(input, info));
+          },
+          "Start streaming execution from a byte buffer")
       .def("step", &ExecutionBoundary::step, "Process one token")
+      .def(
+          "step",
+          [](ExecutionBoundary &b, const py::buffer &token) {
+            py::buffer_info info;
+            return b.step(as_bytes_view(token, info));
+          },
+          "Process one token given as a byte buffer")
+      .def("finish", &ExecutionBoundary::finish,
+           "End-of-stream policy check (allow-lists)")
+      .def("last_violation", &ExecutionBoundary::last_violation,
+           "Rule that refused the execution, or None")
       .def("get_output", &ExecutionBoundary::get_output,
-           "Get accumulated output")
+           "Get accumulated output (copies)")
+      .def(
+          "output_view",
+          [](const ExecutionBoundary &b) {
+            return py::memoryview(py::cast(OutputBuffer{b.output_buffer()}));
+          },
+          "Read-only memoryview over the kernel-owned output. The view "
+          "stays valid across later start/step calls (the kernel detaches "
+          "instead of mutating viewed bytes).")
+      .def("copy_stats", &ExecutionBoundary::copy_stats,
+           "Bytes copied in/out of the kernel for the current execution")
+      .def("reset", &ExecutionBoundary::reset,
+           "Clear session state for reuse, keeping compiled policies warm")
+      .def("alloc_stats", &ExecutionBoundary::alloc_stats,
+           "Cumulative allocation counters for this boundary")
+      .def("set_timeline", &ExecutionBoundary::set_timeline,
+           "Enable/disable per-token timeline recording")
+      .def("timeline_size", &ExecutionBoundary::timeline_size,
+           "Number of tokens recorded in the timeline")
+      .def(
+          "timeline_bytes",
+          [](const ExecutionBoundary &b) { return py::bytes(b.timeline_bytes()); },
+          "Delta-encoded binary timeline of the current execution")
+      .def("set_profiling", &ExecutionBoundary::set_profiling,
+           "Enable/disable (and clear) per-rule cost counters")
+      .def("rule_profile", &ExecutionBoundary::rule_profile,
+           "Per-rule cost counters of the active policy")
       .def("seal", &ExecutionBoundary::seal, "Seal and produce proof");
 
   // Expose Crypto Utils
   m.def("crypto_hash_file", &invariant::crypto::SHA256::hash_file,
-        "Compute hash of a file efficiently");
+        py::call_guard<py::gil_scoped_release>(),
+        "Compute hash of a file efficiently (releases the GIL)");
+
+  m.def("compile_policy", &invariant::compile_policy, py::arg("policy_path"),
+        py::arg("artifact_path"), py::call_guard<py::gil_scoped_release>(),
+        "Compile a policy file into a memory-mappable artifact (.ipol); "
+        "returns its SHA-256 digest");
 }
@@ -0,0 +1,1355 @@
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Pure-Python enforcement engine.
+#
+# Drop-in replacement for the invariant_enforcement extension (same classes,
+# methods and module functions) for deployments that cannot build it. It
+# makes the same admit/deny decisions, reports the same violations and
+# seals the same proofs as the native kernel:
+#
+#   - deny_regex patterns are translated from the kernel's dialect
+#     (ECMAScript std::regex, case-insensitive, byte-oriented) into Python
+#     `re`, including its quirks; a pattern the kernel would reject falls
+#     back to a literal find exactly as the kernel does. The patterns of a
+#     policy are also combined into one alternation, so a clean stream costs
+#     one search per token instead of one per rule.
+#   - Streams are checked incrementally. A deny_regex rule whose matches
+#     have a bounded width (no unbounded repeats, lookaheads or
+#     backreferences) only searches the last `width` bytes before the new
+#     token; the kernel rescans the whole output every step.
+#   - deny_terms uses a set of folded terms probed per candidate end
+#     position, which reports the same (earliest-ending, longest) match as
+#     the kernel's automaton.
+#   - Proofs use the kernel's V0 hash over the same canonical string.
+
+@dataclass
+class Identity:
+    user_id: str = ""
+    role: str = ""
+    org: str = ""
+    env: str = ""
+
+@dataclass
+class ModelSpec:
+    provider: str = ""
+    name: str = ""
+    version: str = ""
+    seed: int = 0
+    decoding_strategy: str = ""
+
+@dataclass
+class ContextSource:
+    type: str = ""
+    sensitivity: str = ""
+    identifier: str = ""
+    content_hash: str = ""
+
+@dataclass
+class ContextSpec:
+    sources: List[ContextSource] = field(default_factory=list)
+
+@dataclass
+class ContextViolation:
+    identifier: str
+    rule_id: str
+    pattern: str
+    offset: int
+
+@dataclass
+class RuleViolation:
+    rule_id: str
+    type: str
+    stage: str
+    offset: int
+
+@dataclass
+class CopyStats:
+    ingress_bytes: int = 0
+    egress_bytes: int = 0
+    detach_bytes: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.ingress_bytes + self.egress_bytes + self.detach_bytes
+
+@dataclass
+class AllocStats:
+    boundaries_constructed: int = 0
+    policy_compiles: int = 0
+    policy_cache_hits: int = 0
+    buffer_growths: int = 0  # here: copy-on-write detaches of a viewed output
+
+    @property
+    def total(self) -> int:
+        return self.policy_compiles + self.buffer_growths
+
+@dataclass
+class RuleProfile:
+    rule_id: str
+    type: str
+    evaluations: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+    matches: int = 0
+    bytes_scanned: int = 0
+
+# ---------------------------------------------------------------------------
+# V0 proof hash (crypto_utils.hpp): DJB2 over the bytes, read as signed
+# chars, modulo 2^64, printed as "inv_v0_<hex><length>" (the length in hex
+# too: std::hex is sticky).
+
+_MASK64 = (1 << 64) - 1
+_HASH_CHUNK = 1 << 16
+
+try:
+    import numpy as _np
+except ImportError:  # the slow path below gives the same digests
+    _np = None
+
+if _np is not None:
+    # 33^k mod 2^64 for k = CHUNK-1 .. 0, so a chunk folds in with one dot
+    _POW33 = _np.ones(_HASH_CHUNK, dtype=_np.uint64)
+    _POW33[1:] = 33
+    _POW33 = _np.cumprod(_POW33, dtype=_np.uint64)[::-1].copy()
+    _POW33_CHUNK = pow(33, _HASH_CHUNK, 1 << 64)
+
+def _djb2(data, h: int = 5381) -> int:
+    n = len(data)
+    pos = 0
+    if _np is not None and n >= 256:
+        signed = _np.frombuffer(data, dtype=_np.int8)
+        with _np.errstate(over="ignore"):
+            while n - pos >= 256:
+                k = min(_HASH_CHUNK, n - pos)
+                chunk = signed[pos:pos + k].astype(_np.int64).astype(_np.uint64)
+                step = _POW33_CHUNK if k == _HASH_CHUNK else pow(33, k, 1 << 64)
+                h = (h * step + int(_np.dot(chunk, _POW33[_HASH_CHUNK - k:]))) & _MASK64
+                pos += k
+    for c in memoryview(data)[pos:].tobytes():
+        h = (h * 33 + (c - 256 if c >= 128 else c)) & _MASK64
+    return h
+
+def crypto_hash(data: bytes) -> str:
+    return f"inv_v0_{_djb2(data):x}{len(data):x}"
+
+def crypto_hash_file(path: str) -> str:
+    """Same digest as the kernel's crypto_hash_file."""
+    try:
+        f = open(path, "rb")
+    except OSError:
+        raise RuntimeError(f"Cannot open file for hashing: {path}") from None
+    h = 5381
+    with f:
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+            h = _djb2(chunk, h)
+    return f"inv_v0_{h:x}FILE"
+
+# ---------------------------------------------------------------------------
+# Kernel regex dialect -> Python re
+
+class _Invalid(Exception):
+    """The kernel rejects the pattern (and falls back to a literal find)."""
+
+_INF = float("inf")
+_POSIX_CLASSES = {
+    b"alnum": rb"0-9A-Za-z", b"alpha": rb"A-Za-z", b"blank": rb" \t",
+    b"cntrl": rb"\x00-\x1f\x7f", b"digit": rb"0-9", b"d": rb"0-9",
+    b"graph": rb"\x21-\x7e", b"lower": rb"a-z", b"print": rb"\x20-\x7e",
+    b"punct": rb"!-/:-@\[-`{-~", b"space": rb" \t\n\r\f\v", b"s": rb" \t\n\r\f\v",
+    b"upper": rb"A-Z", b"xdigit": rb"0-9A-Fa-f", b"w": rb"0-9A-Za-z_",
+}
+# [.name.] and [=name=]: the POSIX names libstdc++ knows, by character code
+_COLLATING_NAMES = {name.encode(): code for code, name in enumerate((
+    "NUL SOH STX ETX EOT ENQ ACK alert backspace tab newline vertical-tab form-feed "
+    "carriage-return SO SI DLE DC1 DC2 DC3 DC4 NAK SYN ETB CAN EM SUB ESC IS4 IS3 IS2 IS1 "
+    "space exclamation-mark quotation-mark number-sign dollar-sign percent-sign ampersand "
+    "apostrophe left-parenthesis right-parenthesis asterisk plus-sign comma hyphen period "
+    "slash zero one two three four five six seven eight nine colon semicolon less-than-sign "
+    "equals-sign greater-than-sign question-mark commercial-at A B C D E F G H I J K L M N O "
+    "P Q R S T U V W X Y Z left-square-bracket backslash right-square-bracket circumflex "
+    "underscore grave-accent a b c d e f g h i j k l m n o p q r s t u v w x y z "
+    "left-curly-bracket vertical-line right-curly-bracket tilde DEL").split())}
+_CONTROL_ESCAPES = {ord("f"): 0x0C, ord("n"): 0x0A, ord("r"): 0x0D, ord("t"): 0x09, ord("v"): 0x0B}
+_HEX = b"0123456789abcdefABCDEF"
+
+def _lit(byte: int) -> bytes:
+    return b"\\x%02x" % byte
+
+def _signed(byte: int) -> int:
+    return byte - 256 if byte >= 0x80 else byte
+
+class _RegexTranslator:
+    """
+    Recursive-descent reading of a pattern the way libstdc++'s ECMAScript
+    std::regex reads it, emitting an equivalent Python pattern. Also
+    reports the longest possible match (infinite when unbounded) and
+    whether it saw lookaheads or backreferences. With open_end the text is
+    a window that continues past its end (the kernel's match_not_eol and
+    match_not_eow): $ and \\b never match there.
+    """
+
+    def __init__(self, pattern: bytes, open_end: bool = False):
+        self.p = pattern
+        self.open_end = open_end
+        self.i = 0
+        self.groups = 0
+        self.lookahead = False
+        self.backrefs = False
+
+    def translate(self) -> Tuple[bytes, float]:
+        source, width = self.disjunction()
+        if self.i != len(self.p):
+            raise _Invalid("unbalanced ')'")
+        return source, width
+
+    def peek(self) -> Optional[int]:
+        return self.p[self.i] if self.i < len(self.p) else None
+
+    def disjunction(self) -> Tuple[bytes, float]:
+        sources, widths = [], []
+        while True:
+            source, width = self.alternative()
+            sources.append(source)
+            widths.append(width)
+            if self.peek() != ord("|"):
+                return b"|".join(sources), max(widths)
+            self.i += 1
+
+    def alternative(self) -> Tuple[bytes, float]:
+        out, total = [], 0
+        while self.peek() is not None and self.peek() not in b"|)":
+            source, width, quantifiable = self.atom()
+            quantified = False
+            while self.peek() is not None and self.peek() in b"*+?{":
+                if not quantifiable:
+                    raise _Invalid("nothing to repeat")
+                quantifier, low, high = self.quantifier()
+                if quantified:  # a** and a{2}{3} stack in the kernel
+                    source = b"(?:" + source + b")"
+                source += quantifier
+                width = 0 if high == 0 or width == 0 else width * high
+                quantified = True
+            out.append(source)
+            total += width
+        return b"".join(out), total
+
+    def quantifier(self) -> Tuple[bytes, int, float]:
+        c = self.p[self.i]
+        if c == ord("{"):
+            m = re.match(rb"\{(\d+)(,(\d*))?\}", self.p[self.i:])
+            if not m:
+                raise _Invalid("bad brace quantifier")
+            low = int(m.group(1))
+            high = low if m.group(2) is None else (int(m.group(3)) if m.group(3) else _INF)
+            if high < low:
+                raise _Invalid("bad brace range")
+            self.i += m.end()
+            text = m.group(0)
+        else:
+            self.i += 1
+            text = bytes([c])
+            low, high = {ord("*"): (0, _INF), ord("+"): (1, _INF), ord("?"): (0, 1)}[c]
+        if self.peek() == ord("?"):
+            self.i += 1
+            text += b"?"
+        return text, low, high
+
+    def atom(self) -> Tuple[bytes, float, bool]:
+        c = self.p[self.i]
+        self.i += 1
+        if c == ord("^"):
+            return b"^", 0, False
+        if c == ord("$"):
+            if self.open_end:
+                return rb"(?!)", 0, False
+            return rb"\Z", 0, False  # no trailing-newline match, as in ECMAScript
+        if c == ord("."):
+            return rb"[^\n\r]", 1, True
+        if c == ord("["):
+            return self.char_class(), 1, True
+        if c == ord("("):
+            return self.group()
+        if c == ord("\\"):
+            return self.escape()
+        if c in b"*+?{":
+            raise _Invalid("nothing to repeat")
+        return _lit(c), 1, True
+
+    def group(self) -> Tuple[bytes, float, bool]:
+        if self.p.startswith(b"?", self.i):
+            kind = self.p[self.i:self.i + 2]
+            if kind not in (b"?:", b"?=", b"?!"):
+                raise _Invalid("unknown group")
+            self.i += 2
+            if kind != b"?:":
+                self.lookahead = True
+            prefix, capture = b"(" + kind, False
+        else:
+            self.groups += 1
+            prefix, capture = b"(", True
+        source, width = self.disjunction()
+        if self.peek() != ord(")"):
+            raise _Invalid("missing ')'")
+        self.i += 1
+        if prefix in (b"(?=", b"(?!"):
+            return prefix + source + b")", 0, False
+        return prefix + source + b")", width, True
+
+    def escape(self) -> Tuple[bytes, float, bool]:
+        if self.i >= len(self.p):
+            raise _Invalid("trailing backslash")
+        c = self.p[self.i]
+        self.i += 1
+        if c == ord("b"):
+            return (rb"(?:\b(?=[\x00-\xff]))" if self.open_end else rb"\b"), 0, False
+        if c == ord("B"):
+            if self.open_end:
+                return rb"(?:\B|(?![\x00-\xff]))", 0, False
+            return rb"(?:\B|\A\Z)", 0, False  # Python's \B never matches empty text
+        if c in b"dDsSwW":
+            return b"\\" + bytes([c]), 1, True
+        if c in b"123456789":
+            m = re.match(rb"\d*", self.p[self.i:])
+            n = int(bytes([c]) + m.group(0))
+            self.i += m.end()
+            if n > self.groups:
+                raise _Invalid("backreference to an unknown group")
+            self.backrefs = True
+            return b"(?:\\%d)" % n, _INF, True
+        return _lit(self.char_escape(c)), 1, True
+
+    def char_escape(self, c: int) -> int:
+        """Byte denoted by a single-character escape (after the backslash)."""
+        if c in _CONTROL_ESCAPES:
+            return _CONTROL_ESCAPES[c]
+        if c == ord("0"):
+            return 0  # \00 is NUL then '0'
+        if c in b"xu":
+            digits = 2 if c == ord("x") else 4
+            hex_digits = self.p[self.i:self.i + digits]
+            if len(hex_digits) != digits or any(d not in _HEX for d in hex_digits):
+                raise _Invalid("bad hex escape")
+            self.i += digits
+            return int(hex_digits, 16) & 0xFF  # \u truncates to a char, as in the kernel
+        if c == ord("c"):
+            # libstdc++ reads \cX as the letter X itself
+            if self.i >= len(self.p):
+                raise _Invalid("bad control escape")
+            self.i += 1
+            return self.p[self.i - 1]
+        return c  # identity escape
+
+    def class_atom(self) -> Tuple[Optional[int], bytes, bytes]:
+        """
+        One class member: (byte, b"", kind) for a single byte, (None, items,
+        b":") for a set. kind is b"." or b"=" for [.name.] and [=name=].
+        """
+        c = self.p[self.i]
+        if c == ord("[") and self.p[self.i + 1:self.i + 2] in (b":", b".", b"="):
+            kind = self.p[self.i + 1:self.i + 2]
+            end = self.p.find(kind + b"]", self.i + 2)
+            if end < 0:
+                raise _Invalid("unterminated class name")
+            name = self.p[self.i + 2:end]
+            self.i = end + 2
+            if kind == b":":
+                if name.lower() not in _POSIX_CLASSES:
+                    raise _Invalid("unknown character class")
+                return None, _POSIX_CLASSES[name.lower()], kind
+            if name not in _COLLATING_NAMES:
+                raise _Invalid("unknown collating element")
+            return _COLLATING_NAMES[name], b"", kind
+        self.i += 1
+        if c != ord("\\"):
+            return c, b"", b""
+        if self.i >= len(self.p):
+            raise _Invalid("trailing backslash")
+        e = self.p[self.i]
+        self.i += 1
+        if e in b"dDsSwW":
+            return None, b"\\" + bytes([e]), b":"
+        if e == ord("b"):
+            return 0x08, b"", b""
+        if e in b"B123456789":
+            raise _Invalid("assertion or backreference in a class")
+        return self.char_escape(e), b"", b""
+
+    def char_class(self) -> bytes:
+        negate = self.peek() == ord("^")
+        if negate:
+            self.i += 1
+        if self.peek() == ord("]"):  # [] matches nothing, [^] anything
+            self.i += 1
+            return rb"[\x00-\xff]" if negate else rb"(?!)"
+        items = []
+        while True:
+            if self.i >= len(self.p):
+                raise _Invalid("unterminated class")
+            if self.p[self.i] == ord("]"):
+                self.i += 1
+                break
+            low, members, kind = self.class_atom()
+            if (self.p[self.i:self.i + 1] == b"-" and self.i + 1 < len(self.p)
+                    and self.p[self.i + 1] != ord("]")):
+                self.i += 1
+                high, _, high_kind = self.class_atom()
+                # A range may start at [.x.] but not end at one. Ends
+                # compare as (signed) chars, so [\xe9-a] is valid and
+                # wraps around through \xff and \x00.
+                if kind not in (b"", b".") or high_kind != b"" or _signed(high) < _signed(low):
+                    raise _Invalid("bad class range")
+                if low >= 0x80 > high:
+                    items.append(_lit(low) + rb"-\xff\x00-" + _lit(high))
+                else:
+                    items.append(_lit(low) + b"-" + _lit(high))
+            else:
+                items.append(members if low is None else _lit(low))
+        return b"[" + (b"^" if negate else b"") + b"".join(items) + b"]"
+
+def _translate(pattern: bytes, open_end: bool = False):
+    """
+    (compiled, window, combinable, source), or None when the kernel would
+    reject the pattern. window is the longest match, None when unbounded.
+    """
+    translator = _RegexTranslator(pattern, open_end)
+    try:
+        source, width = translator.translate()
+    except _Invalid:
+        return None
+    try:
+        compiled = re.compile(source, re.IGNORECASE)
+    except re.error:
+        return None
+    bounded = not (translator.lookahead or translator.backrefs) and width != _INF
+    return compiled, (int(width) if bounded else None), not translator.backrefs, source
+
+# ---------------------------------------------------------------------------
+# Policies
+
+_WORD_BYTES = frozenset(b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_"
+                        + bytes(range(0x80, 0x100)))
+_NON_WORD = re.compile(rb"[^0-9A-Za-z_\x80-\xff]")
+_MAX_TERM_BYTES = 0x3FFF
+_RULE_TYPES = ("deny_regex", "max_output_bytes", "max_tokens", "max_token_rate",
+               "allow_literals", "deny_terms")
+
+class _Rule:
+    def __init__(self, rule_id: str, rule_type: str):
+        self.id = rule_id
+        self.type = rule_type
+        self.pattern = ""
+        self.limit = 0
+        self.burst = 0.0
+        self.literals: List[bytes] = []
+        self.terms_file = ""
+        self.whole_words = True
+        # deny_regex: translated pattern or, when the kernel would reject
+        # it, None (literal find of `needle`)
+        self.regex = None
+        self.window: Optional[int] = None  # bytes a new match can reach back
+        self.combinable = False
+        self.source = b""
+        self.needle = b""
+        self._open_regex = None  # for context windows, built on first use
+        # deny_terms: folded terms, their distinct lengths (longest first)
+        # and, by their last tail_bytes, the lengths of the terms ending so
+        self.terms: Optional[frozenset] = None
+        self.term_lengths: List[int] = []
+        self.tail_bytes = 0
+        self.tails: Dict[bytes, Tuple[int, ...]] = {}
+
+    def compile_regex(self):
+        self.needle = self.pattern.encode("utf-8")
+        translated = _translate(self.needle)
+        if translated is None:
+            self.window = len(self.needle)
+            return
+        self.regex, self.window, self.combinable, self.source = translated
+
+    def open_regex(self):
+        if self._open_regex is None:
+            self._open_regex = _translate(self.needle, open_end=True)[0]
+        return self._open_regex
+
+    def set_terms(self, terms: Sequence[bytes]):
+        for term in terms:
+            if len(term) > _MAX_TERM_BYTES:
+                raise RuntimeError(f"deny_terms term longer than {_MAX_TERM_BYTES} bytes")
+        self.terms = frozenset(t.lower() for t in terms if t)
+        self.term_lengths = sorted({len(t) for t in self.terms}, reverse=True)
+        self.tail_bytes = min(3, self.term_lengths[-1]) if self.terms else 0
+        tails: Dict[bytes, set] = {}
+        for t in self.terms:
+            tails.setdefault(t[-self.tail_bytes:], set()).add(len(t))
+        self.tails = {tail: tuple(sorted(lengths, reverse=True)) for tail, lengths in tails.items()}
+
+def _rule_limit(item: Dict[str, Any], rule_id: str, name: str) -> int:
+    v = item.get(name)
+    if isinstance(v, bool) or not isinstance(v, (int, float)) or v < 0 or v != int(v):
+        raise RuntimeError(f"Policy rule '{rule_id}' needs a non-negative integer \"{name}\"")
+    return int(v)
+
+def _read_terms_file(path: str, rule_id: str) -> List[bytes]:
+    try:
+        with open(path, "rb") as f:
+            lines = f.read().split(b"\n")
+    except OSError:
+        raise RuntimeError(f"Policy rule '{rule_id}' cannot open terms_file: {path}") from None
+    terms = []
+    for line in lines:
+        line = line.strip(b" \t\r")
+        if line and not line.startswith(b"#"):
+            terms.append(line)
+    return terms
+
+def _parse_policy_rules(content: bytes, base_dir: str = "") -> List[_Rule]:
+    """Same format, defaults and errors as parse_policy_rules() in the kernel."""
+    try:
+        doc = json.loads(content)
+    except ValueError as e:
+        # Same prefix as the kernel's parser; the detail text differs
+        raise RuntimeError(f"Invalid JSON at byte {getattr(e, 'pos', 0)}: {getattr(e, 'msg', e)}") from None
+    if isinstance(doc, dict) and "rules" in doc:
+        doc = doc["rules"]
+    if not isinstance(doc, list):
+        raise RuntimeError("Policy must be a JSON array of rules")
+
+    rules = []
+    for i, item in enumerate(doc):
+        if not isinstance(item, dict):
+            raise RuntimeError(f"Policy rule #{i} is not an object")
+        rule_id = item["id"] if isinstance(item.get("id"), str) else f"rule_{i}"
+        rule = _Rule(rule_id, item["type"] if isinstance(item.get("type"), str) else "deny_regex")
+        if rule.type == "deny_regex":
+            if not isinstance(item.get("pattern"), str):
+                raise RuntimeError(f"Policy rule '{rule_id}' needs a string \"pattern\"")
+            rule.pattern = item["pattern"]
+            rule.compile_regex()
+        elif rule.type in ("max_output_bytes", "max_tokens"):
+            rule.limit = _rule_limit(item, rule_id, "limit")
+        elif rule.type == "max_token_rate":
+            rule.limit = _rule_limit(item, rule_id, "limit")
+            rule.burst = float(_rule_limit(item, rule_id, "burst") if "burst" in item else rule.limit)
+            if rule.limit == 0 or rule.burst < 1:
+                raise RuntimeError(f"Policy rule '{rule_id}' needs a positive limit and burst")
+        elif rule.type == "allow_literals":
+            values = item.get("values")
+            if not isinstance(values, list) or not values:
+                raise RuntimeError(f"Policy rule '{rule_id}' needs a non-empty \"values\" array")
+            if not all(isinstance(v, str) for v in values):
+                raise RuntimeError(f"Policy rule '{rule_id}' values must be strings")
+            rule.literals = sorted(v.encode("utf-8") for v in values)
+        elif rule.type == "deny_terms":
+            terms: List[bytes] = []
+            if "terms_file" not in item and "terms" not in item:
+                raise RuntimeError(f"Policy rule '{rule_id}' needs \"terms_file\" or \"terms\"")
+            if "terms_file" in item:
+                path = item["terms_file"]
+                if not isinstance(path, str) or not path:
+                    raise RuntimeError(f"Policy rule '{rule_id}' terms_file must be a path")
+                if not os.path.isabs(path) and base_dir:
+                    path = os.path.join(base_dir, path)
+                rule.terms_file = path
+                terms += _read_terms_file(path, rule_id)
+            if "terms" in item:
+                if not isinstance(item["terms"], list):
+                    raise RuntimeError(f"Policy rule '{rule_id}' terms must be an array")
+                if not all(isinstance(v, str) for v in item["terms"]):
+                    raise RuntimeError(f"Policy rule '{rule_id}' terms must be strings")
+                terms += [v.encode("utf-8") for v in item["terms"]]
+            if "whole_words" in item:
+                if not isinstance(item["whole_words"], bool):
+                    raise RuntimeError(f"Policy rule '{rule_id}' whole_words must be true or false")
+                rule.whole_words = item["whole_words"]
+            rule.set_terms(terms)
+            if not rule.terms:
+                raise RuntimeError(f"Policy rule '{rule_id}' has no terms")
+            rule.pattern = rule.terms_file or f"<{len(rule.terms)} terms>"
+            print(f"[Invariant] deny_terms '{rule_id}': {len(rule.terms)} terms")
+        else:
+            raise RuntimeError(f"Policy rule '{rule_id}' has unknown type '{rule.type}'")
+        rules.append(rule)
+    return rules
+
+# Policy artifacts (.ipol, see compile_policy in boundary.cpp): verified
+# with hashlib and read back into the structures above. The term automaton
+# is walked once to recover the folded term list.
+
+_ARTIFACT_HEADER = struct.Struct("=8sIIQ64sQ")
+_ARTIFACT_MAGIC = b"INVPOL\0\0"
+_ARTIFACT_VERSION = 1
+_BYTE_ORDER_MARK = 0x01020304
+_TERMINAL = 0x8000
+_DEPTH_MASK = 0x3FFF
+
+class _ArtifactReader:
+    def __init__(self, data: memoryview):
+        self.data = data
+        self.pos = 0
+
+    def take(self, n: int) -> memoryview:
+        if n > len(self.data) - self.pos:
+            raise RuntimeError("Policy artifact is truncated")
+        self.pos += n
+        return self.data[self.pos - n:self.pos]
+
+    def get(self, fmt: str):
+        return struct.unpack("=" + fmt, self.take(struct.calcsize("=" + fmt)))[0]
+
+    def get_str(self) -> str:
+        return bytes(self.take(self.get("I"))).decode("utf-8")
+
+    def get_array(self, code: str, n: int) -> memoryview:
+        size = struct.calcsize(code)
+        if n > (len(self.data) - self.pos) // size:
+            raise RuntimeError("Policy artifact is truncated")
+        return self.take(n * size).cast(code)
+
+    def align(self):
+        self.take(-self.pos % 8)
+
+def _automaton_terms(states: int, root_next, first_child, fail, depth, label) -> List[bytes]:
+    # Same structural checks as the kernel's borrowing TermAutomaton, so both
+    # engines refuse the same artifacts
+    corrupt = RuntimeError("deny_terms automaton is corrupt")
+    if (states == 0 or states >= 0xFFFFFFFF or first_child[0] != 1 or first_child[states] != states
+            or fail[0] != 0 or depth[0] & _DEPTH_MASK or not first_child[0] <= first_child[1] <= states):
+        raise corrupt
+    for c, t in enumerate(root_next):
+        if t and not (first_child[0] <= t < first_child[1] and label[t] == c):
+            raise corrupt
+    for s in range(states):
+        lo, hi = first_child[s], first_child[s + 1]
+        d = depth[s] & _DEPTH_MASK
+        if s and (lo < first_child[s - 1] or lo <= s or fail[s] >= s or depth[fail[s]] & _DEPTH_MASK >= d):
+            raise corrupt
+        if hi > states:
+            raise corrupt
+        for t in range(lo, hi):
+            if depth[t] & _DEPTH_MASK != d + 1 or (t > lo and label[t] <= label[t - 1]):
+                raise corrupt
+    terms, stack = [], [(0, b"")]
+    while stack:
+        s, prefix = stack.pop()
+        lo, hi = first_child[s], first_child[s + 1]
+        if lo <= s or hi < lo or hi > states:
+            raise RuntimeError("deny_terms automaton is corrupt")
+        for t in range(lo, hi):
+            word = prefix + bytes((label[t],))
+            if depth[t] & _TERMINAL:
+                terms.append(word)
+            stack.append((t, word))
+    return terms
+
+def _load_artifact(path: str) -> Tuple[List[_Rule], str]:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        raise RuntimeError(f"Cannot open policy artifact: {path}") from None
+    if len(data) < _ARTIFACT_HEADER.size:
+        raise RuntimeError(f"Not a policy artifact: {path}")
+    magic, version, byte_order, payload_bytes, digest, _ = _ARTIFACT_HEADER.unpack_from(data)
+    if magic != _ARTIFACT_MAGIC:
+        raise RuntimeError(f"Not a policy artifact: {path}")
+    if version != _ARTIFACT_VERSION:
+        raise RuntimeError(f"Unsupported policy artifact version {version} "
+                           f"(expected {_ARTIFACT_VERSION}): {path}")
+    if byte_order != _BYTE_ORDER_MARK:
+        raise RuntimeError(f"Policy artifact was compiled for another byte order: {path}")
+    if payload_bytes != len(data) - _ARTIFACT_HEADER.size:
+        raise RuntimeError(f"Policy artifact is truncated: {path}")
+    payload = memoryview(data)[_ARTIFACT_HEADER.size:]
+    actual = hashlib.sha256(payload).hexdigest()
+    if actual.encode() != digest:
+        raise RuntimeError(f"Policy artifact checksum mismatch: {path}")
+
+    r = _ArtifactReader(payload)
+    r.get_str()  # source
+    rules = []
+    for _ in range(r.get("I")):
+        rule = _Rule(r.get_str(), r.get_str())
+        rule.pattern = r.get_str()
+        rule.terms_file = r.get_str()
+        rule.limit = r.get("Q")
+        rule.burst = r.get("d")
+        rule.whole_words = r.get("I") != 0
+        rule.literals = [bytes(r.take(r.get("I"))) for _ in range(r.get("I"))]
+        has_terms = r.get("I")
+        if has_terms:
+            r.align()
+            states, _terms = r.get("Q"), r.get("Q")
+            root_next = r.get_array("I", 256)
+            first_child = r.get_array("I", states + 1)
+            fail = r.get_array("I", states)
+            depth = r.get_array("H", states)
+            label = r.get_array("B", states)
+            rule.set_terms(_automaton_terms(states, root_next, first_child, fail, depth, label))
+        if (rule.type not in _RULE_TYPES or (rule.type == "deny_terms") != bool(has_terms)
+                or (rule.type == "allow_literals"
+                    and (not rule.literals or rule.literals != sorted(rule.literals)))):
+            raise RuntimeError(f"Policy artifact rule '{rule.id}' is malformed: {path}")
+        if rule.type == "deny_regex":
+            rule.compile_regex()
+        rules.append(rule)
+    if r.pos != len(payload):
+        raise RuntimeError(f"Policy artifact has trailing bytes: {path}")
+    return rules, actual
+
+class _CompiledPolicy:
+    def __init__(self, rules: List[_Rule], sources: List[Tuple[str, int, int]] = (), identity: str = ""):
+        self.rules = rules
+        self.sources = sources  # (path, mtime_ns, size); the policy file first
+        self.identity = identity
+        # One alternation over the combinable deny_regex rules: a miss
+        # clears all of them with a single search
+        self.combined_rules = [i for i, r in enumerate(rules) if r.combinable]
+        self.other_deny = [i for i, r in enumerate(rules)
+                           if r.type in ("deny_regex", "deny_terms") and not r.combinable]
+        self.combined = None
+        if len(self.combined_rules) > 1:
+            self.combined = re.compile(b"|".join(b"(?:" + rules[i].source + b")"
+                                                 for i in self.combined_rules), re.IGNORECASE)
+
+    def unchanged(self) -> bool:
+        return all(_stamp(path) == (path, mtime, size) for path, mtime, size in self.sources)
+
+def _stamp(path: str) -> Optional[Tuple[str, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return path, st.st_mtime_ns, st.st_size
+
+_NO_RULES = _CompiledPolicy([])
+
+# ---------------------------------------------------------------------------
+# Matching
+
+def _term_ending_at(rule: _Rule, text, e: int, min_start: int = 0) -> Optional[int]:
+    """Start of the longest term ending at e whose left boundary holds."""
+    if e < rule.tail_bytes:
+        return None
+    lengths = rule.tails.get(text[e - rule.tail_bytes:e])
+    if lengths is None:
+        return None
+    for length in lengths:
+        s = e - length
+        if s < min_start:
+            continue
+        if rule.whole_words and s > 0 and text[s - 1] in _WORD_BYTES:
+            continue
+        if text[s:e] in rule.terms:
+            return s
+    return None
+
+def _term_matches(rule: _Rule, text, min_end: int, min_start: int = 0,
+                  open_end: bool = False) -> Iterator[Tuple[int, int]]:
+    """
+    deny_terms matches in `text` (already folded) ending after min_end, in
+    the kernel's order: by end, and at one end the longest term whose word
+    boundaries hold. The end of `text` counts as a boundary unless open_end
+    (a stream still arriving; see the kernel's held matches).
+    """
+    n = len(text)
+    first = max(min_end + 1, rule.tail_bytes)
+    if rule.whole_words:
+        ends = [m.start() for m in _NON_WORD.finditer(text, first)]
+        if not open_end:
+            ends.append(n)
+    else:
+        ends = range(first, n + 1)
+    for e in ends:
+        s = _term_ending_at(rule, text, e, min_start)
+        if s is not None:
+            yield s, e
+
+def _first_term(rule: _Rule, text, min_end: int = 0, min_start: int = 0,
+                open_end: bool = False) -> Optional[int]:
+    for start, _ in _term_matches(rule, text, min_end, min_start, open_end):
+        return start
+    return None
+
+def _as_bytes(data: Union[str, bytes, bytearray, memoryview]) -> bytes:
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    if isinstance(data, memoryview):
+        if data.ndim != 1 or data.itemsize != 1 or not data.c_contiguous:
+            raise ValueError("Expected a contiguous 1-D byte buffer")
+        return data.tobytes()
+    return bytes(data)
+
+class _RuleState:
+    __slots__ = ("tokens", "refilled", "checked", "clean", "held")
+
+    def __init__(self, rule: _Rule, now: float):
+        self.tokens = rule.burst  # max_token_rate
+        self.refilled = now
+        self.checked = 0   # deny rules: output bytes already searched
+        self.clean = True  # deny_regex: no match at the last search
+        self.held = None   # deny_terms: whole-word match ending the output
+
+_boundaries_constructed = 0
+
+class ExecutionBoundary:
+    """Pure-Python ExecutionBoundary; see the kernel's boundary.hpp."""
+
+    kScanChunkBytes = 4 << 20
+    kScanOverlapBytes = 64 << 10
+    kScanCacheEntries = 1024
+    kErrorHash = "ERROR_HASH"
+
+    def __init__(self):
+        global _boundaries_constructed
+        _boundaries_constructed += 1
+        self._policy = _NO_RULES
+        self._policy_cache: Dict[str, _CompiledPolicy] = {}
+        # What seal() and the scan cache name the policy by (see the kernel)
+        self._identity = ""
+        self._policy_loaded = False
+        self._model = ModelSpec()
+        self._model_loaded = False
+        self._context: List[ContextSource] = []
+        self._context_violations: List[ContextViolation] = []
+        # Least recently used first, at most kScanCacheEntries (see the kernel)
+        self._scan_cache: "OrderedDict[str, List[ContextViolation]]" = OrderedDict()
+        self._input = b""
+        self._out = bytearray()
+        self._copies = CopyStats()
+        self._allocs = AllocStats()
+        self._state: List[_RuleState] = []
+        self._token_count = 0
+        self._violation: Optional[RuleViolation] = None
+        self._profiling = False
+        self._profiled: Optional[_CompiledPolicy] = None
+        self._profile: List[RuleProfile] = []
+        self._timeline_enabled = False
+        self._timeline_origin = 0
+        self._timeline: List[Tuple[int, int, int]] = []
+        self._abort_index = -1
+        print("[Invariant] Enforcement Boundary Initialized (Python engine)")
+
+    # -- configuration ------------------------------------------------------
+
+    def load_policy(self, policy_name: str):
+        self._identity = policy_name
+        self._policy = _NO_RULES
+        self._policy_loaded = False
+        path = policy_name
+        artifact = path.endswith(".ipol") and len(path) > len(".ipol")
+        if "/" in policy_name or ".json" in policy_name or artifact:
+            cached = self._policy_cache.get(path)
+            if cached is not None and cached.unchanged():
+                self._policy = cached
+                self._identity = cached.identity
+                self._allocs.policy_cache_hits += 1
+            elif artifact:
+                stamp = _stamp(path)
+                rules, digest = _load_artifact(path)
+                self._identity = "sha256:" + digest
+                self._policy = _CompiledPolicy(rules, [stamp], self._identity)
+                self._allocs.policy_compiles += 1
+                self._scan_cache.clear()
+                if stamp is not None:
+                    self._policy_cache[path] = self._policy
+                print(f"[Invariant] Mapped {len(rules)} rules from {path} (sha256:{digest})")
+            else:
+                stamp = _stamp(path)
+                try:
+                    with open(path, "rb") as f:
+                        content = f.read()
+                except OSError:
+                    print(f"[Invariant] Warning: Could not open policy file: {path}")
+                else:
+                    rules = _parse_policy_rules(content, os.path.dirname(path))
+                    stamps = [stamp] + [_stamp(r.terms_file) for r in rules if r.terms_file]
+                    self._policy = _CompiledPolicy(rules, stamps, policy_name)
+                    self._allocs.policy_compiles += 1
+                    # Compiling invalidates cached scans (see the kernel)
+                    self._scan_cache.clear()
+                    if None not in stamps:
+                        self._policy_cache[path] = self._policy
+                    print(f"[Invariant] Loaded {len(rules)} rules from {path}")
+        self._policy_loaded = True
+        print(f"[Invariant] Policy Loaded: {policy_name}")
+
+    def load_model(self, spec: ModelSpec):
+        self._model = ModelSpec(spec.provider, spec.name, spec.version, spec.seed, spec.decoding_strategy)
+        self._model_loaded = True
+        print(f"[Invariant] Model Configuration Frozen: {spec.name} (Seed: {spec.seed})")
+
+    def load_context(self, context: ContextSpec):
+        self._context = [ContextSource(s.type, s.sensitivity, s.identifier, s.content_hash)
+                         for s in context.sources]
+        self._context_violations = []
+        print(f"[Invariant] Context Loaded: {len(self._context)} sources")
+
+    # -- profiling ----------------------------------------------------------
+
+    def _evaluate(self, i: int, nbytes: int, fired: bool, started: int) -> bool:
+        # Charges one evaluation of rule i that began at `started`
+        if self._profiled is not self._policy:
+            self._profiled = self._policy
+            self._profile = [RuleProfile(r.id, r.type) for r in self._policy.rules]
+        ns = time.perf_counter_ns() - started
+        p = self._profile[i]
+        p.evaluations += 1
+        p.total_ns += ns
+        p.max_ns = max(p.max_ns, ns)
+        p.bytes_scanned += nbytes
+        if fired:
+            p.matches += 1
+        return fired
+
+    def set_profiling(self, enabled: bool):
+        self._profiling = enabled
+        self._profiled = None
+        self._profile = []
+
+    def rule_profile(self) -> List[RuleProfile]:
+        if not self._profiling or self._profiled is not self._policy:
+            return [RuleProfile(r.id, r.type) for r in self._policy.rules]
+        return [RuleProfile(**vars(p)) for p in self._profile]
+
+    # -- deny rules ---------------------------------------------------------
+
+    def _deny_match(self, rule: _Rule, state: Optional[_RuleState], text, token_start: int) -> Optional[int]:
+        """
+        Start of the match of one deny rule in `text`. With a stream state,
+        only what the new bytes can have changed is searched.
+        """
+        if rule.type == "deny_terms":
+            if state is None:
+                return _first_term(rule, text.lower())
+            # A term that ended the previous token is decided by the first
+            # new byte; then terms ending in the new bytes, plus the byte
+            # before the longest of them for the word boundary
+            found = None
+            if state.held is not None and token_start < len(text):
+                if text[token_start] not in _WORD_BYTES:
+                    found = state.held
+                state.held = None
+            if found is None and token_start < len(text):
+                base = max(0, token_start - rule.term_lengths[0] - 1)
+                lead = 1 if base > 0 else 0
+                folded = bytes(text[base:]).lower()
+                found = _first_term(rule, folded, token_start - base, lead, open_end=rule.whole_words)
+                if found is not None:
+                    found += base
+                elif rule.whole_words:
+                    held = _term_ending_at(rule, folded, len(folded), lead)
+                    state.held = None if held is None else base + held
+            state.checked = len(text)
+            return found
+        start = 0
+        if state is not None and state.clean and rule.window is not None:
+            start = max(0, state.checked - rule.window)
+        if rule.regex is not None:
+            m = rule.regex.search(text, start)
+            found = m.start() if m else None
+        else:
+            found = text.find(rule.needle, start)
+            found = None if found < 0 else found
+        if state is not None:
+            state.checked = len(text)
+            state.clean = found is None
+        return found
+
+    def _first_deny(self, text, stage: str, token_start: int = 0,
+                    indices: Optional[List[int]] = None) -> bool:
+        """True (and the violation recorded) when a deny rule matches `text`."""
+        rules = self._policy.rules
+        streaming = stage == "stream"
+        if indices is None:
+            indices = [i for i, r in enumerate(rules) if r.type in ("deny_regex", "deny_terms")]
+        for i in indices:
+            rule = rules[i]
+            state = self._state[i] if streaming else None
+            if self._profiling:
+                started = time.perf_counter_ns()
+                nbytes = len(text) - token_start if streaming and rule.type == "deny_terms" else len(text)
+                found = self._deny_match(rule, state, text, token_start)
+                self._evaluate(i, nbytes, found is not None, started)
+            else:
+                found = self._deny_match(rule, state, text, token_start)
+            if found is not None:
+                self._record(rule, stage, found)
+                return True
+        return False
+
+    def _deny(self, text, stage: str, token_start: int = 0) -> bool:
+        policy = self._policy
+        if policy.combined is None or self._profiling:
+            return self._first_deny(text, stage, token_start)
+        streaming = stage == "stream"
+        start = 0
+        if streaming:
+            states = [self._state[i] for i in policy.combined_rules]
+            windows = [policy.rules[i].window for i in policy.combined_rules]
+            if all(s.clean for s in states) and None not in windows:
+                start = max(0, min(s.checked - w for s, w in zip(states, windows)))
+        if policy.combined.search(text, start) is None:
+            if streaming:
+                for s in states:
+                    s.checked = len(text)
+            return self._first_deny(text, stage, token_start, policy.other_deny)
+        # Some rule matches: find which one the kernel reports (rule order)
+        if streaming:
+            for s in states:
+                s.clean = False
+        return self._first_deny(text, stage, token_start)
+
+    def _record(self, rule: _Rule, stage: str, offset: int):
+        self._violation = RuleViolation(rule.id, rule.type, stage, offset)
+
+    # -- execution ----------------------------------------------------------
+
+    def precheck(self, input_payload) -> bool:
+        print("[Invariant] Running Admissibility Pre-Check...")
+        if not self._policy_loaded:
+            raise RuntimeError("No policy loaded")
+        if not self._model_loaded:
+            raise RuntimeError("No model specification loaded")
+        self._violation = None
+        data = _as_bytes(input_payload)
+        if b"ILLEGAL" in data:
+            print("[Invariant] Pre-Check FAILED: Legacy ILLEGAL check.")
+            return False
+        if self._context_violations:
+            v = self._context_violations[0]
+            print(f"[Invariant] Pre-Check FAILED: Context {v.identifier} matched rule "
+                  f"'{v.rule_id}' at byte {v.offset}")
+            rule_type = "deny_regex"
+            for rule in self._policy.rules:
+                if rule.id == v.rule_id:
+                    rule_type = rule.type
+            self._violation = RuleViolation(v.rule_id, rule_type, "context", v.offset)
+            return False
+        if self._deny(data, "precheck"):
+            rule = next(r for r in self._policy.rules if r.id == self._violation.rule_id)
+            print(f"[Invariant] Pre-Check FAILED: Input matched rule '{rule.id}' "
+                  f"({rule.type} '{rule.pattern}')")
+            return False
+        print("[Invariant] Pre-Check PASSED.")
+        return True
+
+    def run(self, input_payload: str) -> str:
+        if not self.precheck(input_payload):
+            raise RuntimeError("Execution Aborted: Policy Violation in Pre-Check")
+        self._input = _as_bytes(input_payload)
+        print("[Invariant] Execution Started (Proxied)...")
+        self._writable()[:] = b"Simulated Output: Execution Allowed"
+        return self._out.decode("utf-8")
+
+    def start(self, input_payload):
+        if not self.precheck(input_payload):
+            raise RuntimeError("Execution Aborted: Policy Violation in Pre-Check")
+        self._copies = CopyStats()
+        self._input = _as_bytes(input_payload)
+        self._copies.ingress_bytes += len(self._input)
+        self._clear_output()
+        if self._timeline_enabled:
+            self._reset_timeline()
+        now = time.monotonic()
+        self._state = [_RuleState(rule, now) for rule in self._policy.rules]
+        self._token_count = 0
+        print("[Invariant] Execution Started (Streaming Mode)...")
+
+    def _detach(self):
+        # A view from output_view() is alive: copy instead of mutating it
+        self._copies.detach_bytes += len(self._out)
+        self._allocs.buffer_growths += 1
+        self._out = bytearray(self._out)
+
+    def _writable(self) -> bytearray:
+        try:
+            self._out.append(0)  # fails while a view holds the buffer
+        except BufferError:
+            self._detach()
+        else:
+            del self._out[-1]
+        return self._out
+
+    def _append(self, token: bytes):
+        try:
+            self._out += token
+        except BufferError:
+            self._detach()
+            self._out += token
+
+    def _clear_output(self):
+        try:
+            del self._out[:]
+        except BufferError:
+            self._out = bytearray()
+            self._allocs.buffer_growths += 1
+
+    def _structural(self, offset: int) -> bool:
+        out = self._out
+        profiling = self._profiling
+        for i, rule in enumerate(self._policy.rules):
+            kind = rule.type
+            if kind not in ("max_output_bytes", "max_tokens", "max_token_rate", "allow_literals"):
+                continue
+            started = time.perf_counter_ns() if profiling else 0
+            nbytes = 0
+            if kind == "max_output_bytes":
+                fired, where = len(out) > rule.limit, rule.limit
+            elif kind == "max_tokens":
+                fired, where = self._token_count > rule.limit, offset
+            elif kind == "max_token_rate":
+                state = self._state[i]
+                now = time.monotonic()
+                state.tokens = min(rule.burst, state.tokens + (now - state.refilled) * rule.limit)
+                state.refilled = now
+                fired = state.tokens < 1
+                if not fired:
+                    state.tokens -= 1
+                where = offset
+            else:
+                nbytes = len(out) - offset
+                # Literals with the output as a prefix are contiguous in sorted order
+                literals = rule.literals
+                k = bisect.bisect_left(literals, out)
+                fired = k == len(literals) or not literals[k].startswith(out)
+                where = offset
+            if profiling:
+                self._evaluate(i, nbytes, fired, started)
+            if fired:
+                self._record(rule, "stream", where)
+                return False
+        return True
+
+    def step(self, token) -> bool:
+        if len(self._state) != len(self._policy.rules):
+            raise RuntimeError("Execution not started")
+        if self._timeline_enabled:
+            arrived = time.perf_counter_ns()
+        token = _as_bytes(token)
+        offset = len(self._out)
+        self._append(token)
+        self._copies.ingress_bytes += len(token)
+        self._token_count += 1
+
+        admitted = self._structural(offset)
+        if not admitted:
+            print(f"[Invariant] \033[1;31mKERNEL INTERVENTION\033[0m: Stream violated rule "
+                  f"'{self._violation.rule_id}' ({self._violation.type})")
+        elif self._deny(self._out, "stream", offset):
+            admitted = False
+            rule = next(r for r in self._policy.rules if r.id == self._violation.rule_id)
+            detail = "deny_terms" if rule.terms is not None else f"deny_regex '{rule.pattern}'"
+            print(f"[Invariant] \033[1;31mKERNEL INTERVENTION\033[0m: Stream matched rule "
+                  f"'{rule.id}' ({detail})")
+
+        if self._timeline_enabled:
+            checked = time.perf_counter_ns()
+            self._timeline.append((offset, arrived - self._timeline_origin, checked - arrived))
+            if not admitted:
+                self._abort_index = len(self._timeline) - 1
+        return admitted
+
+    def finish(self) -> bool:
+        if len(self._state) != len(self._policy.rules):
+            raise RuntimeError("Execution not started")
+        out = self._out
+        for i, rule in enumerate(self._policy.rules):
+            if rule.type == "deny_terms":
+                # A whole-word term at the very end of the output: the end is a boundary
+                started = time.perf_counter_ns() if self._profiling else 0
+                held = self._state[i].held
+                if self._profiling:
+                    self._evaluate(i, 0, held is not None, started)
+                if held is not None:
+                    print(f"[Invariant] \033[1;31mKERNEL INTERVENTION\033[0m: "
+                          f"Output ends with a term of rule '{rule.id}'")
+                    self._record(rule, "finish", held)
+                    return False
+            if rule.type != "allow_literals":
+                continue
+            started = time.perf_counter_ns() if self._profiling else 0
+            k = bisect.bisect_left(rule.literals, out)
+            fired = k == len(rule.literals) or rule.literals[k] != out
+            if self._profiling:
+                self._evaluate(i, 0, fired, started)
+            if fired:
+                print(f"[Invariant] \033[1;31mKERNEL INTERVENTION\033[0m: "
+                      f"Output is not an allowed literal of rule '{rule.id}'")
+                self._record(rule, "finish", len(out))
+                return False
+        return True
+
+    def last_violation(self) -> Optional[RuleViolation]:
+        v = self._violation
+        return None if v is None else RuleViolation(v.rule_id, v.type, v.stage, v.offset)
+
+    def get_output(self) -> str:
+        self._copies.egress_bytes += len(self._out)
+        return self._out.decode("utf-8")
+
+    def output_view(self) -> memoryview:
+        """Read-only view of the output; later steps detach rather than mutate it."""
+        return memoryview(self._out).toreadonly()
+
+    def copy_stats(self) -> CopyStats:
+        return CopyStats(**vars(self._copies))
+
+    def reset(self):
+        self._policy = _NO_RULES
+        self._identity = ""
+        self._policy_loaded = False
+        self._model = ModelSpec()
+        self._model_loaded = False
+        self._context = []
+        self._context_violations = []
+        self._input = b""
+        self._clear_output()
+        self._copies = CopyStats()
+        self._state = []
+        self._token_count = 0
+        self._violation = None
+        self._timeline_enabled = False
+        self._reset_timeline()
+        self.set_profiling(False)
+
+    def alloc_stats(self) -> AllocStats:
+        stats = AllocStats(**vars(self._allocs))
+        stats.boundaries_constructed = _boundaries_constructed
+        return stats
+
+    # -- timeline (same "ITL1" encoding as timeline.hpp) ---------------------
+
+    def _reset_timeline(self):
+        self._timeline = []
+        self._abort_index = -1
+        self._timeline_origin = time.perf_counter_ns()
+
+    def set_timeline(self, enabled: bool):
+        self._timeline_enabled = enabled
+        if enabled:
+            self._reset_timeline()
+
+    def timeline_size(self) -> int:
+        return len(self._timeline)
+
+    def timeline_bytes(self) -> bytes:
+        out = bytearray(b"ITL1")
+
+        def varint(v: int):
+            while v >= 0x80:
+                out.append((v & 0x7F) | 0x80)
+                v >>= 7
+            out.append(v)
+
+        varint(len(self._timeline))
+        varint(self._abort_index + 1)
+        for column, delta in ((0, True), (1, True), (2, False)):
+            prev = 0
+            for entry in self._timeline:
+                v = entry[column] & 0xFFFFFFFF if column == 2 else entry[column]
+                varint((v - prev) & _MASK64 if delta else v)
+                prev = v
+        return bytes(out)
+
+    # -- context ------------------------------------------------------------
+
+    def scan_context(self, source: ContextSource, chunk_bytes: int = kScanChunkBytes,
+                     overlap_bytes: int = kScanOverlapBytes) -> List[ContextViolation]:
+        """
+        Same chunking and window rules as the kernel (first match per rule,
+        matches must start inside their chunk), scanned sequentially.
+        """
+        if not self._policy_loaded:
+            raise RuntimeError("No policy loaded")
+        if chunk_bytes <= 0:
+            raise ValueError("chunk_bytes must be positive")
+        # A failed hash reports the same sentinel for every file it could not read
+        cacheable = bool(source.content_hash) and source.content_hash != self.kErrorHash
+        cache_key = f"{self._identity}|{source.content_hash}"
+        if cacheable and cache_key in self._scan_cache:
+            self._scan_cache.move_to_end(cache_key)
+            found = [ContextViolation(**vars(v)) for v in self._scan_cache[cache_key]]
+            print(f"[Invariant] Context Scan (cached): {source.identifier}")
+        else:
+            rules = [r for r in self._policy.rules if r.type in ("deny_regex", "deny_terms")]
+            try:
+                f = open(source.identifier, "rb")
+            except OSError:
+                raise RuntimeError(f"Cannot open context file for scanning: {source.identifier}") from None
+            with f:
+                size = os.fstat(f.fileno()).st_size
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+                try:
+                    n_chunks = (size + chunk_bytes - 1) // chunk_bytes
+                    first: Dict[int, int] = {}
+                    for c in range(n_chunks):
+                        begin = c * chunk_bytes
+                        end = min(size, begin + chunk_bytes)
+                        window_end = min(size, end + overlap_bytes)
+                        for r, rule in enumerate(rules):
+                            if r in first:
+                                continue
+                            pos = self._chunk_match(rule, data, begin, end, window_end)
+                            if pos is not None:
+                                first[r] = pos
+                finally:
+                    if size:
+                        data.close()
+            found = [ContextViolation(source.identifier, rules[r].id, rules[r].pattern, first[r])
+                     for r in range(len(rules)) if r in first]
+            if cacheable:
+                self._scan_cache[cache_key] = [ContextViolation(**vars(v)) for v in found]
+                self._scan_cache.move_to_end(cache_key)
+                if len(self._scan_cache) > self.kScanCacheEntries:
+                    self._scan_cache.popitem(last=False)
+            print(f"[Invariant] Context Scanned: {source.identifier} ({size} bytes, "
+                  f"{n_chunks} chunks, {len(found)} violations)")
+        for v in found:
+            v.identifier = source.identifier
+            self._context_violations.append(ContextViolation(**vars(v)))
+        return found
+
+    @staticmethod
+    def _chunk_match(rule: _Rule, data, begin: int, end: int, window_end: int) -> Optional[int]:
+        if rule.terms is not None:
+            lead = 1 if begin > 0 else 0
+            text = data[begin - lead:window_end].lower()
+            for start, _ in _term_matches(rule, text, lead, lead):
+                if begin + start - lead < end:
+                    return begin + start - lead
+            return None
+        if rule.regex is not None:
+            regex = rule.regex if window_end == len(data) else rule.open_regex()
+            m = regex.search(data, begin, window_end)
+            pos = m.start() if m else None
+        else:
+            pos = data.find(rule.needle, begin, window_end)
+            pos = None if pos < 0 else pos
+        return pos if pos is not None and pos < end else None
+
+    # -- proof --------------------------------------------------------------
+
+    def seal(self) -> str:
+        print("[Invariant] Sealing Execution Proof...")
+        parts = [b"POLICY:", self._identity.encode("utf-8"), b"|",
+                 b"MODEL:", self._model.name.encode("utf-8"), b":", str(self._model.seed).encode(), b"|"]
+        if self._context:
+            parts.append(b"CONTEXT:")
+            for src in sorted(self._context, key=lambda s: s.identifier.encode("utf-8")):
+                parts += [src.identifier.encode("utf-8"), b":", src.content_hash.encode("utf-8"), b";"]
+            parts.append(b"|")
+        parts += [b"INPUT:", self._input, b"|", b"OUTPUT:", bytes(self._out), b"|"]
+        return crypto_hash(b"".join(parts))
@@ -1,78 +1,769 @@
 #include "boundary.hpp"
 #include "crypto_utils.hpp"
+#include "json.hpp"
+#include "terms.hpp"
+#include "timeline.hpp"
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <cmath>
+#include <cstring>
+#include <fcntl.h>
+#ifdef __GLIBC__
+#include <malloc.h>
+#endif
+#include <filesystem>
 #include <fstream>
 #include <iostream>
+#include <list>
 #include <regex>
 #include <sstream>
 #include <stdexcept>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <thread>
+#include <unistd.h>
+#include <unordered_map>
 
 namespace invariant {
 
+// Rule types understood by the kernel. Anything else fails the policy load.
+//   deny_regex        {"pattern": "..."}        input and output must not match
+//   max_output_bytes  {"limit": N}              output length cap
+//   max_tokens        {"limit": N}              streamed token budget
+//   max_token_rate    {"limit": N, "burst": B}  tokens/s (token bucket)
+//   allow_literals    {"values": [...]}         output must equal one value
+//   deny_terms        {"terms_file": "...", "terms": [...], "whole_words": true}
+//                     input and output must not contain a term (literal,
+//                     ASCII case-insensitive); terms_file has one term per
+//                     line ('#' comments) and is relative to the policy
+// All but deny_regex are checked in O(1) per token (allow_literals and
+// deny_terms: per byte of the token), independent of the output length.
 struct PolicyRule {
   std::string id;
   std::string type;
   std::string pattern;
+  uint64_t limit = 0;
+  double burst = 0;
+  std::vector<std::string> literals; // sorted bytewise
+  // Compiled once in load_policy; null when the pattern is not a valid
+  // regex, in which case matching falls back to a literal find.
+  std::shared_ptr<const std::regex> compiled;
+  // deny_terms
+  std::shared_ptr<const TermAutomaton> terms;
+  std::string terms_file; // resolved path, empty for inline terms only
+  bool whole_words = true;
 };
 
-std::string unescape_json(const std::string &input) {
-  std::string res;
-  for (size_t i = 0; i < input.length(); ++i) {
-    if (input[i] == '\\' && i + 1 < input.length()) {
-      char next = input[i + 1];
-      if (next == '\\')
-        res += '\\';
-      else if (next == 'n')
-        res += '\n';
-      else if (next == 't')
-        res += '\t';
-      else if (next == '"')
-        res += '"';
-      else
-        res += next;
-      i++;
-    } else {
-      res += input[i];
+// Per-execution state of a structural rule (indexed like the rule set)
+struct RuleState {
+  // max_token_rate
+  double tokens = 0;
+  std::chrono::steady_clock::time_point refilled;
+  // allow_literals: literals[lo, hi) still have the output as a prefix
+  size_t lo = 0;
+  size_t hi = 0;
+  // deny_terms: automaton state after the bytes seen so far, and the start
+  // of a whole-word match that ends at the last byte, pending the next one
+  uint32_t term_state = 0;
+  size_t held_term = TermAutomaton::npos;
+};
+
+void compile_rules(std::vector<PolicyRule> &rules) {
+  for (auto &rule : rules) {
+    if (rule.type != "deny_regex")
+      continue;
+    try {
+      rule.compiled = std::make_shared<const std::regex>(
+          rule.pattern, std::regex_constants::icase);
+    } catch (...) {
+      rule.compiled = nullptr;
     }
   }
-  return res;
 }
 
-std::vector<PolicyRule> parse_simple_rules(const std::string &content) {
+// Search `text` for `rule` (deny_regex or deny_terms). `flags` lets callers
+// scanning a window of a larger buffer tell the engine about the surrounding
+// bytes.
+bool rule_matches(const PolicyRule &rule, std::string_view text,
+                  std::regex_constants::match_flag_type flags =
+                      std::regex_constants::match_default,
+                  size_t *position = nullptr) {
+  if (rule.terms) {
+    uint32_t state = 0;
+    size_t found = rule.terms->scan(text, 0, state, rule.whole_words);
+    if (found == TermAutomaton::npos)
+      return false;
+    if (position)
+      *position = found;
+    return true;
+  }
+  if (rule.compiled) {
+    std::match_results<std::string_view::const_iterator> m;
+    if (!std::regex_search(text.begin(), text.end(), m, *rule.compiled,
+                           flags))
+      return false;
+    if (position)
+      *position = static_cast<size_t>(m.position(0));
+    return true;
+  }
+  size_t found = text.find(rule.pattern);
+  if (found == std::string_view::npos)
+    return false;
+  if (position)
+    *position = found;
+  return true;
+}
+
+namespace {
+
+uint64_t rule_limit(const json::Value &rule, const std::string &id,
+                    const char *field) {
+  const json::Value *v = rule.find(field);
+  if (!v || !v->is_number() || v->number < 0 ||
+      v->number != std::floor(v->number))
+    throw std::runtime_error("Policy rule '" + id + "' needs a non-negative "
+                             "integer \"" + field + "\"");
+  return static_cast<uint64_t>(v->number);
+}
+
+// One term per line; blank lines and '#' comments are skipped and
+// surrounding whitespace is trimmed.
+void read_terms_file(const std::string &path, const std::string &id,
+                     std::vector<std::string> &terms) {
+  std::ifstream f(path, std::ios::binary);
+  if (!f.good())
+    throw std::runtime_error("Policy rule '" + id +
+                             "' cannot open terms_file: " + path);
+  std::string line;
+  while (std::getline(f, line)) {
+    const size_t first = line.find_first_not_of(" \t\r");
+    if (first == std::string::npos || line[first] == '#')
+      continue;
+    const size_t last = line.find_last_not_of(" \t\r");
+    terms.push_back(line.substr(first, last - first + 1));
+  }
+}
+
+} // namespace
+
+// Policy files are a JSON array of rule objects (or {"rules": [...]}).
+// A rule without "type" is a deny_regex, as in the original format; a rule
+// without "id" is named after its position. Unknown types and malformed
+// rules throw, so a policy is never silently weakened. Relative terms files
+// are resolved against base_dir (the policy's directory).
+std::vector<PolicyRule> parse_policy_rules(const std::string &content,
+                                           const std::string &base_dir = "") {
+  json::Value doc = json::parse(content);
+  if (doc.is_object() && doc.find("rules"))
+    doc = *doc.find("rules");
+  if (!doc.is_array())
+    throw std::runtime_error("Policy must be a JSON array of rules");
+
   std::vector<PolicyRule> rules;
-  // VERY Basic manual parser for V0
-  // searches for "pattern": "VALUE"
-  std::size_t pos = 0;
-  while ((pos = content.find("\"pattern\":", pos)) != std::string::npos) {
-    std::size_t start_quote = content.find("\"", pos + 10);
-    if (start_quote == std::string::npos)
-      break;
-    std::size_t end_quote = content.find("\"", start_quote + 1);
-    if (end_quote == std::string::npos)
-      break;
-
-    std::string raw_pat =
-        content.substr(start_quote + 1, end_quote - start_quote - 1);
-    std::string pat = unescape_json(raw_pat);
-
-    // Simple unescape for spaces if needed, but for now take raw
-    rules.push_back({"auto_id", "deny_regex", pat});
-    pos = end_quote;
+  for (size_t i = 0; i < doc.items.size(); ++i) {
+    const json::Value &item = doc.items[i];
+    if (!item.is_object())
+      throw std::runtime_error("Policy rule #" + std::to_string(i) +
+                               " is not an object");
+    PolicyRule rule;
+    const json::Value *id = item.find("id");
+    rule.id = id && id->is_string() ? id->string : "rule_" + std::to_string(i);
+    const json::Value *type = item.find("type");
+    rule.type = type && type->is_string() ? type->string : "deny_regex";
+
+    if (rule.type == "deny_regex") {
+      const json::Value *pattern = item.find("pattern");
+      if (!pattern || !pattern->is_string())
+        throw std::runtime_error("Policy rule '" + rule.id +
+                                 "' needs a string \"pattern\"");
+      rule.pattern = pattern->string;
+    } else if (rule.type == "max_output_bytes" || rule.type == "max_tokens") {
+      rule.limit = rule_limit(item, rule.id, "limit");
+    } else if (rule.type == "max_token_rate") {
+      rule.limit = rule_limit(item, rule.id, "limit");
+      rule.burst = item.find("burst") ? rule_limit(item, rule.id, "burst")
+                                      : rule.limit;
+      if (rule.limit == 0 || rule.burst < 1)
+        throw std::runtime_error("Policy rule '" + rule.id +
+                                 "' needs a positive limit and burst");
+    } else if (rule.type == "allow_literals") {
+      const json::Value *values = item.find("values");
+      if (!values || !values->is_array() || values->items.empty())
+        throw std::runtime_error("Policy rule '" + rule.id +
+                                 "' needs a non-empty \"values\" array");
+      for (const auto &v : values->items) {
+        if (!v.is_string())
+          throw std::runtime_error("Policy rule '" + rule.id +
+                                   "' values must be strings");
+        rule.literals.push_back(v.string);
+      }
+      std::sort(rule.literals.begin(), rule.literals.end());
+    } else if (rule.type == "deny_terms") {
+      std::vector<std::string> terms;
+      const json::Value *file = item.find("terms_file");
+      const json::Value *inline_terms = item.find("terms");
+      if (!file && !inline_terms)
+        throw std::runtime_error("Policy rule '" + rule.id +
+                                 "' needs \"terms_file\" or \"terms\"");
+      if (file) {
+        if (!file->is_string() || file->string.empty())
+          throw std::runtime_error("Policy rule '" + rule.id +
+                                   "' terms_file must be a path");
+        std::filesystem::path path(file->string);
+        if (path.is_relative() && !base_dir.empty())
+          path = std::filesystem::path(base_dir) / path;
+        rule.terms_file = path.string();
+        read_terms_file(rule.terms_file, rule.id, terms);
+      }
+      if (inline_terms) {
+        if (!inline_terms->is_array())
+          throw std::runtime_error("Policy rule '" + rule.id +
+                                   "' terms must be an array");
+        for (const auto &v : inline_terms->items) {
+          if (!v.is_string())
+            throw std::runtime_error("Policy rule '" + rule.id +
+                                     "' terms must be strings");
+          terms.push_back(v.string);
+        }
+      }
+      if (const json::Value *whole = item.find("whole_words")) {
+        if (!whole->is_bool())
+          throw std::runtime_error("Policy rule '" + rule.id +
+                                   "' whole_words must be true or false");
+        rule.whole_words = whole->boolean;
+      }
+      rule.terms = std::make_shared<const TermAutomaton>(std::move(terms));
+#ifdef __GLIBC__
+      // Hand the build's scratch memory (term strings, BFS ranges) back to
+      // the OS instead of leaving it in the heap of a long-lived process
+      malloc_trim(0);
+#endif
+      if (rule.terms->term_count() == 0)
+        throw std::runtime_error("Policy rule '" + rule.id +
+                                 "' has no terms");
+      rule.pattern = rule.terms_file.empty()
+                         ? "<" + std::to_string(rule.terms->term_count()) +
+                               " terms>"
+                         : rule.terms_file;
+      std::cout << "[Invariant] deny_terms '" << rule.id << "': "
+                << rule.terms->term_count() << " terms, "
+                << rule.terms->state_count() << " states, "
+                << rule.terms->memory_bytes() / 1024 << " KiB" << std::endl;
+    } else {
+      throw std::runtime_error("Policy rule '" + rule.id +
+                               "' has unknown type '" + rule.type + "'");
+    }
+    rules.push_back(std::move(rule));
   }
   return rules;
 }
 
+using RuleSet = std::vector<PolicyRule>;
+
+// mtime and size of a file a compiled policy was built from
+struct FileStamp {
+  std::string path;
+  std::filesystem::file_time_type mtime;
+  uintmax_t size = 0;
+
+  static FileStamp of(const std::string &path, std::error_code &ec) {
+    FileStamp stamp{path, std::filesystem::last_write_time(path, ec), 0};
+    if (!ec)
+      stamp.size = std::filesystem::file_size(path, ec);
+    return stamp;
+  }
+  bool unchanged() const {
+    std::error_code ec;
+    FileStamp now = of(path, ec);
+    return !ec && now.mtime == mtime && now.size == size;
+  }
+};
+
+// A parsed and compiled policy file. Kept per boundary and reused by
+// load_policy() while the policy file and any terms files it references
+// are unchanged on disk (mtime and size).
+struct CompiledPolicy {
+  std::shared_ptr<const RuleSet> rules;
+  std::vector<FileStamp> sources; // the policy file first
+  std::string identity;           // see Impl::policy_identity
+};
+
+namespace {
+
+// Read-only memory mapping of a whole file (POSIX). `what` names the file
+// in errors. Clean pages of the mapping stay in the page cache, shared with
+// every other process mapping the same file.
+struct MappedFile {
+  const char *data = nullptr;
+  size_t size = 0;
+
+  explicit MappedFile(const std::string &path,
+                      const std::string &what = "context file",
+                      int advice = MADV_SEQUENTIAL) {
+    int fd = ::open(path.c_str(), O_RDONLY);
+    if (fd < 0)
+      throw std::runtime_error("Cannot open " + what + ": " + path);
+    struct stat st;
+    if (::fstat(fd, &st) != 0) {
+      ::close(fd);
+      throw std::runtime_error("Cannot stat " + what + ": " + path);
+    }
+    size = static_cast<size_t>(st.st_size);
+    if (size > 0) {
+      void *p = ::mmap(nullptr, size, PROT_READ, MAP_PRIVATE, fd, 0);
+      if (p == MAP_FAILED) {
+        ::close(fd);
+        throw std::runtime_error("Cannot mmap " + what + ": " + path);
+      }
+      ::madvise(p, size, advice);
+      data = static_cast<const char *>(p);
+    }
+    ::close(fd);
+  }
+  ~MappedFile() {
+    if (data)
+      ::munmap(const_cast<char *>(data), size);
+  }
+  MappedFile(const MappedFile &) = delete;
+  MappedFile &operator=(const MappedFile &) = delete;
+};
+
+} // namespace
+
+// Policy artifacts (compile_policy). The parsed rules, literal tables and
+// deny_terms automata in one file that load_policy() maps read-only instead
+// of parsing: automata are used in place, so loading does not grow with the
+// term list and worker processes share the pages. Native byte order (the
+// header records it); every section is 8-byte aligned in the file.
+//
+//   header (96 bytes, ArtifactHeader)
+//     magic "INVPOL\0\0", u32 version, u32 byte-order mark,
+//     u64 payload bytes, char[64] hex SHA-256 of the payload, u64 reserved
+//   payload
+//     str source (policy path, informational), u32 rule count, then per rule
+//       str id, str type, str pattern, str terms_file, u64 limit, f64 burst,
+//       u32 whole_words, u32 literal count, str literals...,
+//       u32 has_terms; if set, aligned: u64 states, u64 terms,
+//       u32 root_next[256], u32 first_child[states + 1], u32 fail[states],
+//       u16 depth[states], u8 label[states]
+//   (str = u32 length + bytes). deny_regex patterns are recompiled at load.
+// The digest identifies the policy in proofs, independent of its path.
+namespace {
+
+struct ArtifactHeader {
+  char magic[8];
+  uint32_t version;
+  uint32_t byte_order;
+  uint64_t payload_bytes;
+  char digest[64];
+  uint64_t reserved;
+};
+static_assert(sizeof(ArtifactHeader) == 96, "artifact header layout");
+
+constexpr char kArtifactMagic[8] = {'I', 'N', 'V', 'P', 'O', 'L', 0, 0};
+constexpr uint32_t kArtifactVersion = 1;
+constexpr uint32_t kByteOrderMark = 0x01020304;
+constexpr const char *kArtifactExtension = ".ipol";
+
+bool is_artifact_path(const std::string &path) {
+  const size_t n = std::strlen(kArtifactExtension);
+  return path.size() > n &&
+         path.compare(path.size() - n, n, kArtifactExtension) == 0;
+}
+
+struct ArtifactWriter {
+  std::string out;
+
+  template <typename T> void put(T v) {
+    out.append(reinterpret_cast<const char *>(&v), sizeof(T));
+  }
+  template <typename T> void put_array(const T *p, size_t n) {
+    out.append(reinterpret_cast<const char *>(p), n * sizeof(T));
+  }
+  void put_str(const std::string &s) {
+    put(static_cast<uint32_t>(s.size()));
+    out += s;
+  }
+  void align() { out.resize((out.size() + 7) / 8 * 8, '\0'); }
+};
+
+// Bounds-checked cursor over a mapped payload; arrays are returned in place
+struct ArtifactReader {
+  const char *data;
+  size_t size;
+  size_t pos = 0;
+
+  const char *take(size_t n) {
+    if (n > size - pos)
+      throw std::runtime_error("Policy artifact is truncated");
+    const char *p = data + pos;
+    pos += n;
+    return p;
+  }
+  template <typename T> T get() {
+    T v;
+    std::memcpy(&v, take(sizeof(T)), sizeof(T));
+    return v;
+  }
+  template <typename T> const T *get_array(size_t n) {
+    if (n > (size - pos) / sizeof(T))
+      throw std::runtime_error("Policy artifact is truncated");
+    return reinterpret_cast<const T *>(take(n * sizeof(T)));
+  }
+  std::string get_str() {
+    const uint32_t n = get<uint32_t>();
+    return std::string(take(n), n);
+  }
+  void align() { take((8 - pos % 8) % 8); }
+};
+
+std::string serialize_rules(const RuleSet &rules, const std::string &source) {
+  ArtifactWriter w;
+  w.put_str(source);
+  w.put(static_cast<uint32_t>(rules.size()));
+  for (const auto &rule : rules) {
+    w.put_str(rule.id);
+    w.put_str(rule.type);
+    w.put_str(rule.pattern);
+    w.put_str(rule.terms_file);
+    w.put(rule.limit);
+    w.put(rule.burst);
+    w.put(static_cast<uint32_t>(rule.whole_words));
+    w.put(static_cast<uint32_t>(rule.literals.size()));
+    for (const auto &literal : rule.literals)
+      w.put_str(literal);
+    w.put(static_cast<uint32_t>(rule.terms != nullptr));
+    if (rule.terms) {
+      const TermAutomaton::Arrays a = rule.terms->arrays();
+      w.align();
+      w.put(static_cast<uint64_t>(a.states));
+      w.put(static_cast<uint64_t>(a.terms));
+      w.put_array(a.root_next, 256);
+      w.put_array(a.first_child, a.states + 1);
+      w.put_array(a.fail, a.states);
+      w.put_array(a.depth, a.states);
+      w.put_array(a.label, a.states);
+    }
+  }
+  return std::move(w.out);
+}
+
+// Verifies and parses a mapped artifact. Rules borrow their automata from
+// the mapping, which they keep alive.
+std::shared_ptr<RuleSet> load_artifact(const std::string &path,
+                                       std::string &digest) {
+  auto file = std::make_shared<MappedFile>(path, "policy artifact",
+                                           MADV_WILLNEED);
+  ArtifactHeader header;
+  if (file->size < sizeof(header))
+    throw std::runtime_error("Not a policy artifact: " + path);
+  std::memcpy(&header, file->data, sizeof(header));
+  if (std::memcmp(header.magic, kArtifactMagic, sizeof(kArtifactMagic)) != 0)
+    throw std::runtime_error("Not a policy artifact: " + path);
+  if (header.version != kArtifactVersion)
+    throw std::runtime_error(
+        "Unsupported policy artifact version " +
+        std::to_string(header.version) + " (expected " +
+        std::to_string(kArtifactVersion) + "): " + path);
+  if (header.byte_order != kByteOrderMark)
+    throw std::runtime_error(
+        "Policy artifact was compiled for another byte order: " + path);
+  if (header.payload_bytes != file->size - sizeof(header))
+    throw std::runtime_error("Policy artifact is truncated: " + path);
+
+  const char *payload = file->data + sizeof(header);
+  digest = crypto::sha256_hex(payload, header.payload_bytes);
+  if (digest.compare(0, digest.size(), header.digest, sizeof(header.digest)))
+    throw std::runtime_error("Policy artifact checksum mismatch: " + path);
+
+  ArtifactReader r{payload, static_cast<size_t>(header.payload_bytes)};
+  r.get_str(); // source
+  auto rules = std::make_shared<RuleSet>(r.get<uint32_t>());
+  for (auto &rule : *rules) {
+    rule.id = r.get_str();
+    rule.type = r.get_str();
+    rule.pattern = r.get_str();
+    rule.terms_file = r.get_str();
+    rule.limit = r.get<uint64_t>();
+    rule.burst = r.get<double>();
+    rule.whole_words = r.get<uint32_t>() != 0;
+    rule.literals.resize(r.get<uint32_t>());
+    for (auto &literal : rule.literals)
+      literal = r.get_str();
+    if (r.get<uint32_t>()) {
+      r.align();
+      TermAutomaton::Arrays a;
+      a.states = r.get<uint64_t>();
+      a.terms = r.get<uint64_t>();
+      a.root_next = r.get_array<uint32_t>(256);
+      a.first_child = r.get_array<uint32_t>(a.states + 1);
+      a.fail = r.get_array<uint32_t>(a.states);
+      a.depth = r.get_array<uint16_t>(a.states);
+      a.label = r.get_array<uint8_t>(a.states);
+      rule.terms = std::make_shared<const TermAutomaton>(a, file);
+    }
+    // The same invariants parse_policy_rules() guarantees
+    static const char *kTypes[] = {"deny_regex",     "max_output_bytes",
+                                   "max_tokens",     "max_token_rate",
+                                   "allow_literals", "deny_terms"};
+    if (std::find(std::begin(kTypes), std::end(kTypes), rule.type) ==
+            std::end(kTypes) ||
+        (rule.type == "deny_terms") != (rule.terms != nullptr) ||
+        (rule.type == "allow_literals" &&
+         (rule.literals.empty() ||
+          !std::is_sorted(rule.literals.begin(), rule.literals.end()))))
+      throw std::runtime_error("Policy artifact rule '" + rule.id +
+                               "' is malformed: " + path);
+  }
+  if (r.pos != r.size)
+    throw std::runtime_error("Policy artifact has trailing bytes: " + path);
+  return rules;
+}
+
+} // namespace
+
+std::string compile_policy(const std::string &policy_path,
+                           const std::string &artifact_path) {
+  std::ifstream f(policy_path);
+  if (!f.good())
+    throw std::runtime_error("Cannot open policy file: " + policy_path);
+  std::stringstream buffer;
+  buffer << f.rdbuf();
+  const RuleSet rules = parse_policy_rules(
+      buffer.str(),
+      std::filesystem::path(policy_path).parent_path().string());
+  const std::string payload = serialize_rules(rules, policy_path);
+
+  ArtifactHeader header{};
+  std::memcpy(header.magic, kArtifactMagic, sizeof(kArtifactMagic));
+  header.version = kArtifactVersion;
+  header.byte_order = kByteOrderMark;
+  header.payload_bytes = payload.size();
+  const std::string digest = crypto::sha256_hex(payload.data(), payload.size());
+  std::memcpy(header.digest, digest.data(), sizeof(header.digest));
+
+  // Write aside and rename: processes that mapped the previous artifact
+  // keep reading its (unlinked) pages instead of bytes changing under them
+  const std::string tmp = artifact_path + ".tmp";
+  {
+    std::ofstream out(tmp, std::ios::binary | std::ios::trunc);
+    out.write(reinterpret_cast<const char *>(&header), sizeof(header));
+    out.write(payload.data(), static_cast<std::streamsize>(payload.size()));
+    if (!out.good())
+      throw std::runtime_error("Cannot write policy artifact: " + tmp);
+  }
+  std::filesystem::rename(tmp, artifact_path);
+  std::cout << "[Invariant] Compiled " << rules.size() << " rules from "
+            << policy_path << " into " << artifact_path << " ("
+            << sizeof(header) + payload.size() << " bytes, sha256:" << digest
+            << ")" << std::endl;
+  return digest;
+}
+
+static std::atomic<uint64_t> g_boundaries_constructed{0};
+
+// Least-recently-used scan results, at most
+// ExecutionBoundary::kScanCacheEntries of them: a boundary lives as long as
+// the service, and every distinct context digest would otherwise stay.
+class ScanCache {
+public:
+  const std::vector<ContextViolation> *find(const std::string &key) {
+    auto it = index_.find(key);
+    if (it == index_.end())
+      return nullptr;
+    entries_.splice(entries_.begin(), entries_, it->second);
+    return &it->second->second;
+  }
+
+  void put(const std::string &key, std::vector<ContextViolation> found) {
+    auto it = index_.find(key);
+    if (it != index_.end()) {
+      it->second->second = std::move(found);
+      entries_.splice(entries_.begin(), entries_, it->second);
+      return;
+    }
+    entries_.emplace_front(key, std::move(found));
+    index_[key] = entries_.begin();
+    if (entries_.size() > ExecutionBoundary::kScanCacheEntries) {
+      index_.erase(entries_.back().first);
+      entries_.pop_back();
+    }
+  }
+
+  void clear() {
+    index_.clear();
+    entries_.clear();
+  }
+
+private:
+  using Entry = std::pair<std::string, std::vector<ContextViolation>>;
+  std::list<Entry> entries_;
+  std::unordered_map<std::string, std::list<Entry>::iterator> index_;
+};
+
 struct ExecutionBoundary::Impl {
   std::string current_policy_name;
-  std::vector<PolicyRule> active_rules;
+  // What seal() and the scan cache name the policy by: the policy name, or
+  // "sha256:<digest>" for an artifact so the proof does not depend on where
+  // the artifact was deployed
+  std::string policy_identity;
+  // Shared with policy_cache; never null
+  std::shared_ptr<const RuleSet> active_rules = std::make_shared<RuleSet>();
+  std::unordered_map<std::string, CompiledPolicy> policy_cache;
+  AllocStats allocs;
   ModelSpec model_spec;
   ContextSpec context_spec;
+  // Context admissibility: violations found by scan_context() for the
+  // currently loaded context, and scan results cached per
+  // (policy, content digest) so an unchanged source is only scanned once.
+  // Compiling a policy clears the cache: a path (the identity of a JSON
+  // policy) does not say which rules produced a cached result.
+  std::vector<ContextViolation> context_violations;
+  ScanCache scan_cache;
   std::string last_input_payload;
-  std::string last_output;
+  // Shared so output_buffer() can hand the bytes to Python without a copy
+  std::shared_ptr<std::string> last_output = std::make_shared<std::string>();
+  CopyStats copies;
+  Timeline timeline;
+  // Structural rule state for the current stream
+  std::vector<RuleState> rule_state;
+  uint64_t token_count = 0;
+  std::optional<RuleViolation> last_violation;
+  // Rule profiling (set_profiling); profile[i] belongs to (*profiled_rules)[i]
+  bool profiling = false;
+  std::shared_ptr<const RuleSet> profiled_rules;
+  std::vector<RuleProfile> profile;
   bool model_loaded = false;
   bool policy_loaded = false;
+
+  // Returns the output buffer for mutation, detaching from any outstanding
+  // zero-copy views first so they keep observing stable bytes.
+  std::string &writable_output() {
+    if (last_output.use_count() > 1) {
+      auto detached = std::make_shared<std::string>(*last_output);
+      copies.detach_bytes += last_output->size();
+      allocs.buffer_growths++;
+      last_output = std::move(detached);
+    }
+    return *last_output;
+  }
+
+  void record_violation(const PolicyRule &rule, const char *stage,
+                        uint64_t offset) {
+    last_violation = RuleViolation{rule.id, rule.type, stage, offset};
+  }
+
+  // Evaluates rule i through `eval` (returns true when the rule fires),
+  // charging its time and `bytes` to the rule's profile when profiling.
+  template <typename Eval>
+  bool evaluate(size_t i, size_t bytes, Eval &&eval) {
+    if (!profiling)
+      return eval();
+    if (profiled_rules != active_rules) {
+      profiled_rules = active_rules;
+      profile.assign(active_rules->size(), RuleProfile{});
+      for (size_t r = 0; r < active_rules->size(); ++r) {
+        profile[r].rule_id = (*active_rules)[r].id;
+        profile[r].type = (*active_rules)[r].type;
+      }
+    }
+    const auto t0 = std::chrono::steady_clock::now();
+    const bool fired = eval();
+    const uint64_t ns = static_cast<uint64_t>(
+        std::chrono::duration_cast<std::chrono::nanoseconds>(
+            std::chrono::steady_clock::now() - t0)
+            .count());
+    RuleProfile &p = profile[i];
+    p.evaluations++;
+    p.total_ns += ns;
+    p.max_ns = std::max(p.max_ns, ns);
+    p.bytes_scanned += bytes;
+    if (fired)
+      p.matches++;
+    return fired;
+  }
+
+  // Narrows an allow_literals candidate range to the literals that still
+  // have the output as a prefix after bytes [from, output.size()) arrived.
+  static bool narrow_literals(const PolicyRule &rule, RuleState &state,
+                              const std::string &output, size_t from) {
+    auto first = rule.literals.begin();
+    for (size_t p = from; p < output.size() && state.lo < state.hi; ++p) {
+      // Within [lo, hi) every literal shares output[0, p), so they are
+      // ordered by their byte at p (literals ending at p sort first).
+      auto key = [p](const std::string &lit) {
+        return lit.size() <= p ? -1 : static_cast<unsigned char>(lit[p]);
+      };
+      const int c = static_cast<unsigned char>(output[p]);
+      auto lo = std::partition_point(first + state.lo, first + state.hi,
+                                     [&](const std::string &l) { return key(l) < c; });
+      auto hi = std::partition_point(lo, first + state.hi,
+                                     [&](const std::string &l) { return key(l) == c; });
+      state.lo = lo - first;
+      state.hi = hi - first;
+    }
+    return state.lo < state.hi;
+  }
+
+  // O(1) structural checks for one token; false (and last_violation set)
+  // when a rule refuses the stream.
+  bool check_structural(const std::string &output, size_t offset) {
+    const auto &rules = *active_rules;
+    for (size_t i = 0; i < rules.size(); ++i) {
+      const PolicyRule &rule = rules[i];
+      RuleState &state = rule_state[i];
+      if (rule.type == "max_output_bytes") {
+        if (evaluate(i, 0, [&] { return output.size() > rule.limit; })) {
+          record_violation(rule, "stream", rule.limit);
+          return false;
+        }
+      } else if (rule.type == "max_tokens") {
+        if (evaluate(i, 0, [&] { return token_count > rule.limit; })) {
+          record_violation(rule, "stream", offset);
+          return false;
+        }
+      } else if (rule.type == "max_token_rate") {
+        const bool exhausted = evaluate(i, 0, [&] {
+          const auto now = std::chrono::steady_clock::now();
+          const double elapsed =
+              std::chrono::duration<double>(now - state.refilled).count();
+          state.tokens = std::min(rule.burst, state.tokens + elapsed * rule.limit);
+          state.refilled = now;
+          if (state.tokens < 1)
+            return true;
+          state.tokens -= 1;
+          return false;
+        });
+        if (exhausted) {
+          record_violation(rule, "stream", offset);
+          return false;
+        }
+      } else if (rule.type == "allow_literals") {
+        if (evaluate(i, output.size() - offset, [&] {
+              return !narrow_literals(rule, state, output, offset);
+            })) {
+          record_violation(rule, "stream", offset);
+          return false;
+        }
+      }
+    }
+    return true;
+  }
+
+  // Drops the output bytes, keeping the allocation unless a view holds it
+  void clear_output() {
+    if (last_output.use_count() > 1) {
+      last_output = std::make_shared<std::string>();
+      allocs.buffer_growths++;
+    } else {
+      last_output->clear();
+    }
+  }
 };
 
 ExecutionBoundary::ExecutionBoundary() : pimpl(std::make_unique<Impl>()) {
+  g_boundaries_constructed++;
   std::cout << "[Invariant] Enforcement Boundary Initialized" << std::endl;
 }
 
@@ -80,23 +771,75 @@ ExecutionBoundary::~ExecutionBoundary() = default;
 
 void ExecutionBoundary::load_policy(const std::string &policy_name) {
   pimpl->current_policy_name = policy_name;
+  pimpl->policy_identity = policy_name;
+  // Never carry rules over from the previously loaded policy
+  static const auto kNoRules = std::make_shared<const RuleSet>();
+  pimpl->active_rules = kNoRules;
 
   // Try to read file if it looks like a path or just use name
   std::string path = policy_name;
+  pimpl->policy_loaded = false;
+  const bool artifact = is_artifact_path(path);
   if (policy_name.find("/") == std::string::npos &&
-      policy_name.find(".json") == std::string::npos) {
+      policy_name.find(".json") == std::string::npos && !artifact) {
     // It's just a name, assume default or ignore for now
   } else {
-    std::ifstream f(path);
-    if (f.good()) {
-      std::stringstream buffer;
-      buffer << f.rdbuf();
-      pimpl->active_rules = parse_simple_rules(buffer.str());
-      std::cout << "[Invariant] Loaded " << pimpl->active_rules.size()
-                << " rules from " << path << std::endl;
+    auto cached = pimpl->policy_cache.find(path);
+    const bool fresh =
+        cached != pimpl->policy_cache.end() &&
+        std::all_of(cached->second.sources.begin(),
+                    cached->second.sources.end(),
+                    [](const FileStamp &f) { return f.unchanged(); });
+
+    if (fresh) {
+      // Compiled earlier by this boundary and unchanged on disk
+      pimpl->active_rules = cached->second.rules;
+      pimpl->policy_identity = cached->second.identity;
+      pimpl->allocs.policy_cache_hits++;
+    } else if (artifact) {
+      // Mapped and verified, never parsed; a damaged artifact throws and
+      // leaves no policy loaded (fail closed)
+      std::error_code ec;
+      FileStamp stamp = FileStamp::of(path, ec);
+      std::string digest;
+      auto rules = load_artifact(path, digest);
+      compile_rules(*rules);
+      pimpl->active_rules = rules;
+      pimpl->policy_identity = "sha256:" + digest;
+      pimpl->allocs.policy_compiles++;
+      pimpl->scan_cache.clear();
+      if (!ec)
+        pimpl->policy_cache[path] =
+            CompiledPolicy{rules, {stamp}, pimpl->policy_identity};
+      std::cout << "[Invariant] Mapped " << rules->size() << " rules from "
+                << path << " (sha256:" << digest << ")" << std::endl;
     } else {
-      std::cout << "[Invariant] Warning: Could not open policy file: " << path
-                << std::endl;
+      std::error_code ec;
+      FileStamp stamp = FileStamp::of(path, ec);
+      std::ifstream f(path);
+      if (f.good()) {
+        std::stringstream buffer;
+        buffer << f.rdbuf();
+        // Malformed policies throw and leave no policy loaded (fail closed)
+        auto rules = std::make_shared<RuleSet>(parse_policy_rules(
+            buffer.str(), std::filesystem::path(path).parent_path().string()));
+        compile_rules(*rules);
+        pimpl->active_rules = rules;
+        pimpl->allocs.policy_compiles++;
+        pimpl->scan_cache.clear();
+        CompiledPolicy compiled{rules, {stamp}, policy_name};
+        for (const auto &rule : *rules) {
+          if (!rule.terms_file.empty())
+            compiled.sources.push_back(FileStamp::of(rule.terms_file, ec));
+        }
+        if (!ec)
+          pimpl->policy_cache[path] = std::move(compiled);
+        std::cout << "[Invariant] Loaded " << rules->size() << " rules from "
+                  << path << std::endl;
+      } else {
+        std::cout << "[Invariant] Warning: Could not open policy file: "
+                  << path << std::endl;
+      }
     }
   }
 
@@ -113,17 +856,19 @@ void ExecutionBoundary::load_model(const ModelSpec &spec) {
 
 void ExecutionBoundary::load_context(const ContextSpec &context) {
   pimpl->context_spec = context;
+  pimpl->context_violations.clear();
   std::cout << "[Invariant] Context Loaded: " << context.sources.size()
             << " sources" << std::endl;
 }
 
-bool ExecutionBoundary::precheck(const std::string &input_payload) {
+bool ExecutionBoundary::precheck(std::string_view input_payload) {
   std::cout << "[Invariant] Running Admissibility Pre-Check..." << std::endl;
   // Check invariants
   if (!pimpl->policy_loaded)
     throw std::runtime_error("No policy loaded");
   if (!pimpl->model_loaded)
     throw std::runtime_error("No model specification loaded");
+  pimpl->last_violation.reset();
 
   // Placeholder logic: fail if input contains "ILLEGAL"
   // NOW: Check active rules
@@ -134,27 +879,39 @@ bool ExecutionBoundary::precheck(const std::string &input_payload) {
     return false;
   }
 
-  for (const auto &rule : pimpl->active_rules) {
-    if (rule.type == "deny_regex") {
-      // Basic regex check
-      try {
-        // Note: C++ regex might be slow or strict, for V0 basic find or regex
-        // We'll use std::regex for "realness" with case-insensitive flag
-        std::regex re(rule.pattern, std::regex_constants::icase);
-        if (std::regex_search(input_payload, re)) {
-          std::cout
-              << "[Invariant] Pre-Check FAILED: Input matched deny_regex '"
-              << rule.pattern << "'" << std::endl;
-          return false;
-        }
-      } catch (...) {
-        // Fallback if bad regex
-        if (input_payload.find(rule.pattern) != std::string::npos) {
-          std::cout << "[Invariant] Pre-Check FAILED: Input matched pattern "
-                       "(fallback) '"
-                    << rule.pattern << "'" << std::endl;
-          return false;
-        }
+  // Context admissibility (populated by scan_context)
+  if (!pimpl->context_violations.empty()) {
+    const auto &v = pimpl->context_violations.front();
+    std::cout << "[Invariant] Pre-Check FAILED: Context " << v.identifier
+              << " matched rule '" << v.rule_id << "' at byte " << v.offset
+              << std::endl;
+    std::string type = "deny_regex";
+    for (const auto &rule : *pimpl->active_rules) {
+      if (rule.id == v.rule_id)
+        type = rule.type;
+    }
+    pimpl->last_violation = RuleViolation{v.rule_id, type, "context", v.offset};
+    return false;
+  }
+
+  const auto &rules = *pimpl->active_rules;
+  for (size_t i = 0; i < rules.size(); ++i) {
+    const PolicyRule &rule = rules[i];
+    if (rule.type == "deny_regex" || rule.type == "deny_terms") {
+      // Rules are compiled once in load_policy (std::regex, case-insensitive;
+      // invalid regexes fall back to a literal find) or, for deny_terms,
+      // scanned with the term automaton.
+      size_t position = 0;
+      if (pimpl->evaluate(i, input_payload.size(), [&] {
+            return rule_matches(rule, input_payload,
+                                std::regex_constants::match_default, &position);
+          })) {
+        std::cout << "[Invariant] Pre-Check FAILED: Input matched rule '"
+                  << rule.id << "' (" << rule.type << " '" << rule.pattern
+                  << "')"
+                  << std::endl;
+        pimpl->record_violation(rule, "precheck", position);
+        return false;
       }
     }
   }
@@ -172,58 +929,358 @@ std::string ExecutionBoundary::run(const std::string &input_payload) {
   pimpl->last_input_payload = input_payload;
   std::cout << "[Invariant] Execution Started (Proxied)..." << std::endl;
   // Real implementation would invoke model adapter here
-  pimpl->last_output = "Simulated Output: Execution Allowed";
-  return pimpl->last_output;
+  pimpl->writable_output() = "Simulated Output: Execution Allowed";
+  return *pimpl->last_output;
 }
 
-void ExecutionBoundary::start(const std::string &input_payload) {
+void ExecutionBoundary::start(std::string_view input_payload) {
   if (!precheck(input_payload)) {
     throw std::runtime_error(
         "Execution Aborted: Policy Violation in Pre-Check");
   }
-  pimpl->last_input_payload = input_payload;
-  pimpl->last_output = "";
+  pimpl->copies = CopyStats{};
+  // The input is retained for seal(); this is the only copy we take of it.
+  const size_t input_capacity = pimpl->last_input_payload.capacity();
+  pimpl->last_input_payload.assign(input_payload.data(), input_payload.size());
+  pimpl->copies.ingress_bytes += input_payload.size();
+  if (pimpl->last_input_payload.capacity() != input_capacity)
+    pimpl->allocs.buffer_growths++;
+
+  // Reuse the existing allocation unless a view still references it
+  pimpl->clear_output();
+  if (pimpl->timeline.enabled)
+    pimpl->timeline.reset();
+
+  const auto &rules = *pimpl->active_rules;
+  const auto now = std::chrono::steady_clock::now();
+  pimpl->rule_state.assign(rules.size(), RuleState{});
+  for (size_t i = 0; i < rules.size(); ++i) {
+    pimpl->rule_state[i].tokens = rules[i].burst;
+    pimpl->rule_state[i].refilled = now;
+    pimpl->rule_state[i].hi = rules[i].literals.size();
+  }
+  pimpl->token_count = 0;
   std::cout << "[Invariant] Execution Started (Streaming Mode)..." << std::endl;
 }
 
-bool ExecutionBoundary::step(const std::string &token) {
-  pimpl->last_output += token;
+bool ExecutionBoundary::step(std::string_view token) {
+  // Per-rule state is sized by start() for the policy it started under
+  if (pimpl->rule_state.size() != pimpl->active_rules->size())
+    throw std::runtime_error("Execution not started");
+  Timeline &timeline = pimpl->timeline;
+  Timeline::clock::time_point arrived;
+  if (timeline.enabled)
+    arrived = Timeline::clock::now();
+  const uint64_t offset = pimpl->last_output->size();
+  const size_t capacity = pimpl->last_output->capacity();
+
+  pimpl->writable_output().append(token.data(), token.size());
+  pimpl->copies.ingress_bytes += token.size();
+  if (pimpl->last_output->capacity() != capacity)
+    pimpl->allocs.buffer_growths++;
+  const std::string &output = *pimpl->last_output;
+
+  pimpl->token_count++;
 
   // ACTIVE KERNEL LOGIC: Check policy on every step
-  for (const auto &rule : pimpl->active_rules) {
+  // Constant-time structural rules first, so runaway streams stop before
+  // paying for a regex pass over the whole output.
+  bool admitted = pimpl->check_structural(output, offset);
+  if (!admitted) {
+    std::cout << "[Invariant] \033[1;31mKERNEL INTERVENTION\033[0m: "
+                 "Stream violated rule '"
+              << pimpl->last_violation->rule_id << "' ("
+              << pimpl->last_violation->type << ")" << std::endl;
+  }
+  const auto &rules = *pimpl->active_rules;
+  for (size_t i = 0; i < rules.size() && admitted; ++i) {
+    const PolicyRule &rule = rules[i];
     if (rule.type == "deny_regex") {
-      try {
-        // In a real optimized kernel, we wouldn't re-compile regex every token.
-        // We would compile them once in load_policy.
-        // For V0 Safety Demo, this is acceptable.
-        std::regex re(rule.pattern, std::regex_constants::icase);
-        if (std::regex_search(pimpl->last_output, re)) {
-          std::cout << "[Invariant] \033[1;31mKERNEL INTERVENTION\033[0m: "
-                       "Stream matched deny_regex '"
-                    << rule.pattern << "'" << std::endl;
-          return false; // ABORT EXECUTION
+      // Compiled once in load_policy; no per-token regex construction.
+      size_t position = 0;
+      if (pimpl->evaluate(i, output.size(), [&] {
+            return rule_matches(rule, output,
+                                std::regex_constants::match_default, &position);
+          })) {
+        std::cout << "[Invariant] \033[1;31mKERNEL INTERVENTION\033[0m: "
+                     "Stream matched rule '"
+                  << rule.id << "' (deny_regex '" << rule.pattern << "')"
+                  << std::endl;
+        pimpl->record_violation(rule, "stream", position);
+        admitted = false; // ABORT EXECUTION
+      }
+    } else if (rule.type == "deny_terms") {
+      // Incremental: only the new token's bytes go through the automaton.
+      // A term that ended the previous token is decided by this one's first
+      // byte: "ann" + "ual" is a word, "ann" + " " a match.
+      RuleState &state = pimpl->rule_state[i];
+      size_t position = TermAutomaton::npos;
+      if (pimpl->evaluate(i, token.size(), [&] {
+            if (state.held_term != TermAutomaton::npos && !token.empty()) {
+              if (!TermAutomaton::is_word(static_cast<unsigned char>(token[0])))
+                position = state.held_term;
+              state.held_term = TermAutomaton::npos;
+            }
+            if (position == TermAutomaton::npos)
+              position = rule.terms->scan(output, offset, state.term_state,
+                                          rule.whole_words, nullptr,
+                                          &state.held_term);
+            return position != TermAutomaton::npos;
+          })) {
+        std::cout << "[Invariant] \033[1;31mKERNEL INTERVENTION\033[0m: "
+                     "Stream matched rule '"
+                  << rule.id << "' (deny_terms)" << std::endl;
+        pimpl->record_violation(rule, "stream", position);
+        admitted = false;
+      }
+    }
+  }
+
+  if (timeline.enabled) {
+    const size_t timeline_capacity = timeline.offsets.capacity();
+    timeline.record(offset, arrived, Timeline::clock::now());
+    if (timeline.offsets.capacity() != timeline_capacity)
+      pimpl->allocs.buffer_growths++;
+    if (!admitted)
+      timeline.abort_index =
+          static_cast<int64_t>(timeline.offsets.size()) - 1;
+  }
+  return admitted;
+}
+
+bool ExecutionBoundary::finish() {
+  // End-of-stream rules: an allow-list needs the whole output to match,
+  // not just a prefix of an allowed value.
+  const auto &rules = *pimpl->active_rules;
+  if (pimpl->rule_state.size() != rules.size())
+    throw std::runtime_error("Execution not started");
+  const std::string &output = *pimpl->last_output;
+  for (size_t i = 0; i < rules.size(); ++i) {
+    const RuleState &state = pimpl->rule_state[i];
+    // A whole-word term at the very end of the output: the end is a boundary
+    if (rules[i].type == "deny_terms" &&
+        pimpl->evaluate(i, 0, [&] {
+          return state.held_term != TermAutomaton::npos;
+        })) {
+      std::cout << "[Invariant] \033[1;31mKERNEL INTERVENTION\033[0m: "
+                   "Output ends with a term of rule '"
+                << rules[i].id << "'" << std::endl;
+      pimpl->record_violation(rules[i], "finish", state.held_term);
+      return false;
+    }
+    if (rules[i].type != "allow_literals")
+      continue;
+    if (pimpl->evaluate(i, 0, [&] {
+          return state.lo >= state.hi ||
+                 rules[i].literals[state.lo].size() != output.size();
+        })) {
+      std::cout << "[Invariant] \033[1;31mKERNEL INTERVENTION\033[0m: "
+                   "Output is not an allowed literal of rule '"
+                << rules[i].id << "'" << std::endl;
+      pimpl->record_violation(rules[i], "finish", output.size());
+      return false;
+    }
+  }
+  return true;
+}
+
+std::optional<RuleViolation> ExecutionBoundary::last_violation() const {
+  return pimpl->last_violation;
+}
+
+void ExecutionBoundary::reset() {
+  // Session state goes; compiled policies, scan results and buffer
+  // capacity stay so the next request starts warm.
+  pimpl->current_policy_name.clear();
+  pimpl->policy_identity.clear();
+  pimpl->active_rules = std::make_shared<const RuleSet>();
+  pimpl->policy_loaded = false;
+  pimpl->model_spec = ModelSpec{};
+  pimpl->model_loaded = false;
+  pimpl->context_spec.sources.clear();
+  pimpl->context_violations.clear();
+  pimpl->last_input_payload.clear();
+  pimpl->clear_output();
+  pimpl->copies = CopyStats{};
+  pimpl->rule_state.clear();
+  pimpl->token_count = 0;
+  pimpl->last_violation.reset();
+  pimpl->timeline.enabled = false;
+  pimpl->timeline.reset(0);
+  set_profiling(false);
+}
+
+AllocStats ExecutionBoundary::alloc_stats() const {
+  AllocStats stats = pimpl->allocs;
+  stats.boundaries_constructed = g_boundaries_constructed.load();
+  return stats;
+}
+
+void ExecutionBoundary::set_profiling(bool enabled) {
+  pimpl->profiling = enabled;
+  pimpl->profiled_rules.reset();
+  pimpl->profile.clear();
+}
+
+std::vector<RuleProfile> ExecutionBoundary::rule_profile() const {
+  if (!pimpl->profiling || pimpl->profiled_rules != pimpl->active_rules) {
+    // Nothing evaluated yet under the active policy
+    std::vector<RuleProfile> empty;
+    for (const auto &rule : *pimpl->active_rules)
+      empty.push_back(RuleProfile{rule.id, rule.type});
+    return empty;
+  }
+  return pimpl->profile;
+}
+
+void ExecutionBoundary::set_timeline(bool enabled) {
+  pimpl->timeline.enabled = enabled;
+  if (enabled)
+    pimpl->timeline.reset();
+}
+
+size_t ExecutionBoundary::timeline_size() const {
+  return pimpl->timeline.offsets.size();
+}
+
+std::string ExecutionBoundary::timeline_bytes() const {
+  return pimpl->timeline.encode();
+}
+
+// Chunks are scanned in parallel. Each chunk also reads `overlap_bytes` past
+// its end so matches straddling a boundary are seen, but only matches that
+// *start* inside the chunk are reported (the next chunk owns the rest).
+// Matches longer than the overlap that straddle a boundary can be missed.
+std::vector<ContextViolation>
+ExecutionBoundary::scan_context(const ContextSource &source, size_t chunk_bytes,
+                                size_t overlap_bytes) {
+  if (!pimpl->policy_loaded)
+    throw std::runtime_error("No policy loaded");
+  if (chunk_bytes == 0)
+    throw std::invalid_argument("chunk_bytes must be positive");
+
+  // A failed hash reports the same sentinel for every file it could not read
+  const bool cacheable = !source.content_hash.empty() &&
+                         source.content_hash != kErrorHash;
+  const std::string cache_key =
+      pimpl->policy_identity + "|" + source.content_hash;
+  std::vector<ContextViolation> found;
+
+  const auto *cached = cacheable ? pimpl->scan_cache.find(cache_key) : nullptr;
+  if (cached) {
+    found = *cached;
+    std::cout << "[Invariant] Context Scan (cached): " << source.identifier
+              << std::endl;
+  } else {
+    std::vector<const PolicyRule *> rules;
+    for (const auto &rule : *pimpl->active_rules) {
+      if (rule.type == "deny_regex" || rule.type == "deny_terms")
+        rules.push_back(&rule);
+    }
+
+    MappedFile file(source.identifier, "context file for scanning");
+    const size_t n_chunks =
+        file.size == 0 ? 0 : (file.size + chunk_bytes - 1) / chunk_bytes;
+
+    // Earliest match offset per rule, per chunk
+    std::vector<std::vector<size_t>> first_match(
+        n_chunks, std::vector<size_t>(rules.size(), SIZE_MAX));
+    std::atomic<size_t> next_chunk{0};
+
+    auto worker = [&]() {
+      for (size_t c = next_chunk++; c < n_chunks; c = next_chunk++) {
+        const size_t begin = c * chunk_bytes;
+        const size_t end = std::min(file.size, begin + chunk_bytes);
+        const size_t window_end = std::min(file.size, end + overlap_bytes);
+        std::string_view window(file.data + begin, window_end - begin);
+
+        auto flags = std::regex_constants::match_default;
+        if (begin > 0) // \b and ^ must see the byte before the window
+          flags |= std::regex_constants::match_prev_avail;
+        if (window_end < file.size)
+          flags |= std::regex_constants::match_not_eol |
+                   std::regex_constants::match_not_eow;
+
+        for (size_t r = 0; r < rules.size(); ++r) {
+          size_t pos = 0;
+          if (rules[r]->terms) {
+            // Include the byte before the window for whole-word checks
+            const size_t lead = begin > 0 ? 1 : 0;
+            std::string_view text(file.data + begin - lead,
+                                  window_end - begin + lead);
+            // Matches are found in order of their end; one starting past
+            // the chunk may still be followed by a longer one that starts
+            // inside it.
+            uint32_t state = 0;
+            size_t from = lead, match_end = 0;
+            while ((pos = rules[r]->terms->scan(text, from, state,
+                                                rules[r]->whole_words,
+                                                &match_end)) !=
+                   TermAutomaton::npos) {
+              if (begin + pos - lead < end) {
+                first_match[c][r] = begin + pos - lead;
+                break;
+              }
+              from = match_end;
+            }
+          } else if (rule_matches(*rules[r], window, flags, &pos) &&
+                     begin + pos < end) {
+            first_match[c][r] = begin + pos;
+          }
         }
-      } catch (...) {
-        // Fallback simple find if regex fails
-        if (pimpl->last_output.find(rule.pattern) != std::string::npos) {
-          std::cout << "[Invariant] \033[1;31mKERNEL INTERVENTION\033[0m: "
-                       "Stream matched pattern '"
-                    << rule.pattern << "'" << std::endl;
-          return false;
+      }
+    };
+
+    const size_t n_workers = std::min<size_t>(
+        n_chunks, std::max(1u, std::thread::hardware_concurrency()));
+    std::vector<std::thread> threads;
+    for (size_t i = 1; i < n_workers; ++i)
+      threads.emplace_back(worker);
+    worker();
+    for (auto &t : threads)
+      t.join();
+
+    for (size_t r = 0; r < rules.size(); ++r) {
+      for (size_t c = 0; c < n_chunks; ++c) {
+        if (first_match[c][r] != SIZE_MAX) {
+          found.push_back(
+              {source.identifier, rules[r]->id, rules[r]->pattern,
+               static_cast<uint64_t>(first_match[c][r])});
+          break;
         }
       }
     }
+    if (cacheable)
+      pimpl->scan_cache.put(cache_key, found);
+    std::cout << "[Invariant] Context Scanned: " << source.identifier << " ("
+              << file.size << " bytes, " << n_chunks << " chunks, "
+              << found.size() << " violations)" << std::endl;
   }
-  return true;
+
+  // Cached results may come from the same content under another name
+  for (auto &v : found) {
+    v.identifier = source.identifier;
+    pimpl->context_violations.push_back(v);
+  }
+  return found;
+}
+
+std::string ExecutionBoundary::get_output() {
+  pimpl->copies.egress_bytes += pimpl->last_output->size();
+  return *pimpl->last_output;
+}
+
+std::shared_ptr<const std::string> ExecutionBoundary::output_buffer() const {
+  return pimpl->last_output;
 }
 
-std::string ExecutionBoundary::get_output() { return pimpl->last_output; }
+CopyStats ExecutionBoundary::copy_stats() const { return pimpl->copies; }
 
 std::string ExecutionBoundary::seal() {
   std::cout << "[Invariant] Sealing Execution Proof..." << std::endl;
 
   std::stringstream proof_data;
-  proof_data << "POLICY:" << pimpl->current_policy_name << "|";
+  proof_data << "POLICY:" << pimpl->policy_identity << "|";
   proof_data << "MODEL:" << pimpl->model_spec.name << ":"
              << pimpl->model_spec.seed << "|";
 
@@ -250,7 +1307,7 @@ std::string ExecutionBoundary::seal() {
   }
 
   proof_data << "INPUT:" << pimpl->last_input_payload << "|";
-  proof_data << "OUTPUT:" << pimpl->last_output << "|";
+  proof_data << "OUTPUT:" << *pimpl->last_output << "|";
 
   return crypto::SHA256::hash(proof_data.str());
 }
@@ -1,10 +1,76 @@
 #pragma once
 #include "execution_graph.hpp"
+#include <cstdint>
 #include <memory>
+#include <optional>
 #include <string>
+#include <string_view>
+#include <vector>
 
 namespace invariant {
 
+// Bytes moved in or out of kernel-owned memory during one execution.
+// Reset by start(). Used to verify the zero-copy paths actually stay
+// zero-copy for large prompts and outputs.
+struct CopyStats {
+  uint64_t ingress_bytes = 0; // input + tokens copied into the kernel
+  uint64_t egress_bytes = 0;  // output copied out (get_output)
+  uint64_t detach_bytes = 0;  // copy-on-write detaches of a viewed output
+
+  uint64_t total() const {
+    return ingress_bytes + egress_bytes + detach_bytes;
+  }
+};
+
+// Tracked heap allocation events (policy compiles and buffer growths; other
+// allocations are not counted), to verify that pooled boundaries stay warm.
+// Counters are cumulative per boundary, except boundaries_constructed which
+// is process-wide.
+struct AllocStats {
+  uint64_t boundaries_constructed = 0;
+  uint64_t policy_compiles = 0;   // policy files parsed and compiled
+  uint64_t policy_cache_hits = 0; // load_policy served from the cache
+  uint64_t buffer_growths = 0;    // input/output/timeline reallocations
+
+  uint64_t total() const { return policy_compiles + buffer_growths; }
+};
+
+// A deny rule matched inside a context source (see scan_context)
+struct ContextViolation {
+  std::string identifier;
+  std::string rule_id;
+  std::string pattern;
+  uint64_t offset = 0; // byte offset of the first match for this rule
+};
+
+// The rule that refused the current execution (see last_violation)
+struct RuleViolation {
+  std::string rule_id;
+  std::string type;
+  std::string stage;   // "precheck", "context", "stream" or "finish"
+  uint64_t offset = 0; // byte offset in the input (precheck) or output
+};
+
+// Cost counters of one policy rule (see set_profiling). "matches" counts
+// the evaluations in which the rule fired: a deny rule matched or a
+// structural rule refused the stream.
+struct RuleProfile {
+  std::string rule_id;
+  std::string type;
+  uint64_t evaluations = 0;
+  uint64_t total_ns = 0;
+  uint64_t max_ns = 0;
+  uint64_t matches = 0;
+  uint64_t bytes_scanned = 0;
+};
+
+// Compiles a policy file into a binary artifact that load_policy() maps
+// read-only instead of parsing (any path ending in ".ipol"). Returns the hex
+// SHA-256 of the artifact; boundaries running the artifact seal proofs
+// with "sha256:<digest>" in place of the policy path.
+std::string compile_policy(const std::string &policy_path,
+                           const std::string &artifact_path);
+
 class ExecutionBoundary {
 public:
   ExecutionBoundary();
@@ -23,19 +89,73 @@ public:
   // Load context
   void load_context(const ContextSpec &context);
 
+  // Context admissibility: memory-map the source and apply the compiled
+  // deny rules in parallel chunks. Returns the first match per rule. Results
+  // are cached against the source's content_hash and also recorded so that
+  // precheck() refuses the execution while the context is inadmissible.
+  // The cache keeps the kScanCacheEntries most recently used results; a
+  // kErrorHash digest (hashing failed) names no content and is not cached.
+  // Touches no Python state, so bindings run it with the GIL released.
+  static constexpr size_t kScanChunkBytes = 4 << 20;
+  static constexpr size_t kScanOverlapBytes = 64 << 10;
+  static constexpr size_t kScanCacheEntries = 1024;
+  static constexpr const char *kErrorHash = "ERROR_HASH";
+  std::vector<ContextViolation>
+  scan_context(const ContextSource &source,
+               size_t chunk_bytes = kScanChunkBytes,
+               size_t overlap_bytes = kScanOverlapBytes);
+
   // Step 5: Admissibility Pre-Check
   // Returns true if admissible, raises exception or returns false otherwise
-  bool precheck(const std::string &input_payload);
+  bool precheck(std::string_view input_payload);
 
   // Step 7/9: Controlled Execution
   // Takes the input and returns the output token stream (as string for V0)
   std::string run(const std::string &input_payload);
 
   // Phase 8: Streaming Interface
-  void start(const std::string &input_payload);
-  bool step(const std::string &token);
+  void start(std::string_view input_payload);
+  bool step(std::string_view token);
+  // End-of-stream check for rules that need the complete output
+  // (allow_literals, and a whole-word deny_terms match that the last token
+  // ended, whose right boundary only the end of the stream settles). Call
+  // once after the last step(); false refuses it.
+  bool finish();
   std::string get_output();
 
+  // Why precheck()/step()/finish() last refused, if they did
+  std::optional<RuleViolation> last_violation() const;
+
+  // Zero-copy access to the accumulated output.
+  // The returned buffer is shared with the kernel and never mutated while
+  // a caller holds it: if the kernel needs to append or restart while a
+  // reference is outstanding, it detaches onto a fresh buffer (counted in
+  // CopyStats::detach_bytes). Holders may therefore keep it indefinitely.
+  std::shared_ptr<const std::string> output_buffer() const;
+
+  // Copy accounting for the current execution
+  CopyStats copy_stats() const;
+
+  // Clear all session state (policy selection, model, context, input,
+  // output, timeline) so the boundary can serve an unrelated request.
+  // Compiled policies, cached context scans and buffer capacity are kept.
+  void reset();
+  AllocStats alloc_stats() const;
+
+  // Per-token timeline (byte offset, arrival time, check duration).
+  // Off by default; when enabled it is reset by every start().
+  void set_timeline(bool enabled);
+  size_t timeline_size() const;
+  // Delta-encoded binary form (see Timeline::encode)
+  std::string timeline_bytes() const;
+
+  // Per-rule cost profile of precheck(), step() and finish(), accumulated
+  // across executions of the active policy. Off by default (no clock reads
+  // on the hot path); enabling clears the counters, as does loading a
+  // different policy. reset() turns it off.
+  void set_profiling(bool enabled);
+  std::vector<RuleProfile> rule_profile() const;
+
   // Step 8: Seal
   // Returns the cryptographic proof of the execution
   std::string seal();
@@ -0,0 +1,261 @@
+#pragma once
+#include <cstdint>
+#include <cstdlib>
+#include <stdexcept>
+#include <string>
+#include <string_view>
+#include <utility>
+#include <vector>
+
+// Minimal RFC 8259 JSON reader for policy files.
+// Self-contained (no third-party dependency), strict: malformed input throws
+// std::runtime_error with the byte offset, so a broken policy fails closed.
+
+namespace invariant {
+namespace json {
+
+struct Value {
+  enum class Type { Null, Bool, Number, String, Array, Object };
+
+  Type type = Type::Null;
+  bool boolean = false;
+  double number = 0;
+  std::string string;
+  std::vector<Value> items;                            // Array
+  std::vector<std::pair<std::string, Value>> members; // Object, in order
+
+  bool is_object() const { return type == Type::Object; }
+  bool is_array() const { return type == Type::Array; }
+  bool is_string() const { return type == Type::String; }
+  bool is_number() const { return type == Type::Number; }
+  bool is_bool() const { return type == Type::Bool; }
+
+  // Object member lookup; nullptr when absent (or not an object)
+  const Value *find(std::string_view key) const {
+    for (const auto &m : members) {
+      if (m.first == key)
+        return &m.second;
+    }
+    return nullptr;
+  }
+};
+
+class Parser {
+public:
+  explicit Parser(std::string_view text) : text_(text) {}
+
+  Value parse() {
+    Value v = parse_value(0);
+    skip_ws();
+    if (pos_ != text_.size())
+      fail("trailing characters");
+    return v;
+  }
+
+private:
+  static constexpr int kMaxDepth = 64;
+  std::string_view text_;
+  size_t pos_ = 0;
+
+  [[noreturn]] void fail(const std::string &what) const {
+    throw std::runtime_error("Invalid JSON at byte " + std::to_string(pos_) +
+                             ": " + what);
+  }
+
+  void skip_ws() {
+    while (pos_ < text_.size() &&
+           (text_[pos_] == ' ' || text_[pos_] == '\t' || text_[pos_] == '\n' ||
+            text_[pos_] == '\r'))
+      ++pos_;
+  }
+
+  bool consume(char c) {
+    skip_ws();
+    if (pos_ < text_.size() && text_[pos_] == c) {
+      ++pos_;
+      return true;
+    }
+    return false;
+  }
+
+  void expect(char c) {
+    if (!consume(c))
+      fail(std::string("expected '") + c + "'");
+  }
+
+  bool consume_word(std::string_view word) {
+    if (text_.substr(pos_, word.size()) != word)
+      return false;
+    pos_ += word.size();
+    return true;
+  }
+
+  Value parse_value(int depth) {
+    if (depth > kMaxDepth)
+      fail("nesting too deep");
+    skip_ws();
+    if (pos_ >= text_.size())
+      fail("unexpected end of input");
+
+    Value v;
+    const char c = text_[pos_];
+    if (c == '{') {
+      ++pos_;
+      v.type = Value::Type::Object;
+      if (consume('}'))
+        return v;
+      do {
+        skip_ws();
+        if (pos_ >= text_.size() || text_[pos_] != '"')
+          fail("expected object key");
+        std::string key = parse_string();
+        expect(':');
+        v.members.emplace_back(std::move(key), parse_value(depth + 1));
+      } while (consume(','));
+      expect('}');
+    } else if (c == '[') {
+      ++pos_;
+      v.type = Value::Type::Array;
+      if (consume(']'))
+        return v;
+      do {
+        v.items.push_back(parse_value(depth + 1));
+      } while (consume(','));
+      expect(']');
+    } else if (c == '"') {
+      v.type = Value::Type::String;
+      v.string = parse_string();
+    } else if (consume_word("true")) {
+      v.type = Value::Type::Bool;
+      v.boolean = true;
+    } else if (consume_word("false")) {
+      v.type = Value::Type::Bool;
+    } else if (consume_word("null")) {
+      v.type = Value::Type::Null;
+    } else if (c == '-' || (c >= '0' && c <= '9')) {
+      v.type = Value::Type::Number;
+      v.number = parse_number();
+    } else {
+      fail("unexpected character");
+    }
+    return v;
+  }
+
+  double parse_number() {
+    const size_t start = pos_;
+    auto digits = [&] {
+      const size_t from = pos_;
+      while (pos_ < text_.size() && text_[pos_] >= '0' && text_[pos_] <= '9')
+        ++pos_;
+      if (pos_ == from)
+        fail("expected digit");
+    };
+    if (text_[pos_] == '-')
+      ++pos_;
+    if (pos_ < text_.size() && text_[pos_] == '0')
+      ++pos_;
+    else
+      digits();
+    if (pos_ < text_.size() && text_[pos_] == '.') {
+      ++pos_;
+      digits();
+    }
+    if (pos_ < text_.size() && (text_[pos_] == 'e' || text_[pos_] == 'E')) {
+      ++pos_;
+      if (pos_ < text_.size() && (text_[pos_] == '+' || text_[pos_] == '-'))
+        ++pos_;
+      digits();
+    }
+    return std::strtod(std::string(text_.substr(start, pos_ - start)).c_str(),
+                       nullptr);
+  }
+
+  unsigned parse_hex4() {
+    if (pos_ + 4 > text_.size())
+      fail("truncated \\u escape");
+    unsigned code = 0;
+    for (int i = 0; i < 4; ++i) {
+      const char h = text_[pos_++];
+      code <<= 4;
+      if (h >= '0' && h <= '9')
+        code |= h - '0';
+      else if (h >= 'a' && h <= 'f')
+        code |= h - 'a' + 10;
+      else if (h >= 'A' && h <= 'F')
+        code |= h - 'A' + 10;
+      else
+        fail("invalid \\u escape");
+    }
+    return code;
+  }
+
+  static void append_utf8(std::string &out, uint32_t cp) {
+    if (cp < 0x80) {
+      out += static_cast<char>(cp);
+    } else if (cp < 0x800) {
+      out += static_cast<char>(0xC0 | (cp >> 6));
+      out += static_cast<char>(0x80 | (cp & 0x3F));
+    } else if (cp < 0x10000) {
+      out += static_cast<char>(0xE0 | (cp >> 12));
+      out += static_cast<char>(0x80 | ((cp >> 6) & 0x3F));
+      out += static_cast<char>(0x80 | (cp & 0x3F));
+    } else {
+      out += static_cast<char>(0xF0 | (cp >> 18));
+      out += static_cast<char>(0x80 | ((cp >> 12) & 0x3F));
+      out += static_cast<char>(0x80 | ((cp >> 6) & 0x3F));
+      out += static_cast<char>(0x80 | (cp & 0x3F));
+    }
+  }
+
+  std::string parse_string() {
+    ++pos_; // opening quote
+    std::string out;
+    while (true) {
+      if (pos_ >= text_.size())
+        fail("unterminated string");
+      const char c = text_[pos_++];
+      if (c == '"')
+        return out;
+      if (static_cast<unsigned char>(c) < 0x20)
+        fail("control character in string");
+      if (c != '\\') {
+        out += c;
+        continue;
+      }
+      if (pos_ >= text_.size())
+        fail("unterminated escape");
+      switch (text_[pos_++]) {
+      case '"': out += '"'; break;
+      case '\\': out += '\\'; break;
+      case '/': out += '/'; break;
+      case 'b': out += '\b'; break;
+      case 'f': out += '\f'; break;
+      case 'n': out += '\n'; break;
+      case 'r': out += '\r'; break;
+      case 't': out += '\t'; break;
+      case 'u': {
+        uint32_t cp = parse_hex4();
+        if (cp >= 0xD800 && cp <= 0xDBFF) {
+          if (!consume_word("\\u"))
+            fail("unpaired surrogate");
+          const uint32_t low = parse_hex4();
+          if (low < 0xDC00 || low > 0xDFFF)
+            fail("unpaired surrogate");
+          cp = 0x10000 + ((cp - 0xD800) << 10) + (low - 0xDC00);
+        } else if (cp >= 0xDC00 && cp <= 0xDFFF) {
+          fail("unpaired surrogate");
+        }
+        append_utf8(out, cp);
+        break;
+      }
+      default:
+        fail("invalid escape");
+      }
+    }
+  }
+};
+
+inline Value parse(std::string_view text) { return Parser(text).parse(); }
+
+} // namespace json
+} // namespace invariant
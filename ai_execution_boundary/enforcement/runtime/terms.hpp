@@ -0,0 +1,297 @@
+#pragma once
+#include <algorithm>
+#include <array>
+#include <cstdint>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <string_view>
+#include <vector>
+
+// Aho-Corasick automaton over a large set of literal terms (deny_terms).
+//
+// Built from the sorted term list level by level, so states are numbered in
+// BFS order and the children of a state are the contiguous id range
+// [first_child[s], first_child[s + 1]), sorted by label. That makes the
+// trie four flat arrays and no per-edge storage:
+//
+//   first_child  uint32  children range (monotone, size + 1 entries)
+//   label        uint8   byte on the edge into the state
+//   fail         uint32  longest proper suffix that is also a state
+//   depth        uint16  bytes from the root, plus two flags: kTerminal (a
+//                        term ends here) and kHasMatch (a term ends here or
+//                        at a state on the fail chain)
+//
+// i.e. 11 bytes per state. Matches are reported by walking the fail chain,
+// which only happens at states flagged kHasMatch. Transitions binary-search the label range, with
+// a direct 256-entry table at the root. Matching is ASCII case-insensitive
+// (terms and text are folded byte by byte; other bytes compare exactly) and
+// resumable: scan() takes and updates the state, so a stream is fed one
+// token at a time without rescanning earlier bytes.
+//
+// The arrays are either owned (built from terms) or borrowed from a policy
+// artifact mapped read-only into memory (see Arrays), in which case the
+// pages are shared by every process that maps the same artifact.
+
+namespace invariant {
+
+class TermAutomaton {
+public:
+  static constexpr uint16_t kTerminal = 0x8000;
+  static constexpr uint16_t kHasMatch = 0x4000;
+  static constexpr uint16_t kDepthMask = kHasMatch - 1;
+  static constexpr size_t kMaxTermBytes = kDepthMask;
+  static constexpr size_t npos = static_cast<size_t>(-1);
+
+  static unsigned char fold(unsigned char c) {
+    return (c >= 'A' && c <= 'Z') ? static_cast<unsigned char>(c + 32) : c;
+  }
+
+  // Word bytes for whole-word matching: ASCII alphanumerics, '_' and every
+  // non-ASCII byte (so UTF-8 letters never split a word).
+  static bool is_word(unsigned char c) {
+    return c >= 0x80 || c == '_' || (c >= '0' && c <= '9') ||
+           (c >= 'a' && c <= 'z') || (c >= 'A' && c <= 'Z');
+  }
+
+  // The flat form of an automaton, as stored in policy artifacts
+  struct Arrays {
+    const uint32_t *root_next = nullptr; // 256 entries
+    const uint32_t *first_child = nullptr; // states + 1 entries
+    const uint32_t *fail = nullptr;
+    const uint16_t *depth = nullptr;
+    const uint8_t *label = nullptr;
+    size_t states = 0;
+    size_t terms = 0;
+  };
+
+  // Terms may repeat and come in any order; empty terms are ignored.
+  explicit TermAutomaton(std::vector<std::string> terms) {
+    for (auto &term : terms) {
+      if (term.size() > kMaxTermBytes)
+        throw std::runtime_error("deny_terms term longer than " +
+                                 std::to_string(kMaxTermBytes) + " bytes");
+      for (auto &c : term)
+        c = static_cast<char>(fold(static_cast<unsigned char>(c)));
+    }
+    std::sort(terms.begin(), terms.end());
+    terms.erase(std::unique(terms.begin(), terms.end()), terms.end());
+    terms.erase(std::remove(terms.begin(), terms.end(), std::string()),
+                terms.end());
+    term_count_ = terms.size();
+    build(terms);
+  }
+
+  // Borrows `arrays` without copying them; `backing` owns their storage.
+  // The arrays are validated so a damaged (or crafted) artifact cannot make
+  // scan() read out of bounds: every transition adds exactly one byte of
+  // depth and every fail link removes at least one, so the depth of the
+  // current state never exceeds the bytes consumed and a match start never
+  // underflows. Labels must be sorted within each child range (binary
+  // search) and the root table must point at the matching root children.
+  TermAutomaton(const Arrays &arrays, std::shared_ptr<const void> backing)
+      : first_child_(arrays.first_child), label_(arrays.label),
+        fail_(arrays.fail), depth_(arrays.depth), states_(arrays.states),
+        term_count_(arrays.terms), backing_(std::move(backing)) {
+    auto invalid = [] {
+      return std::runtime_error("deny_terms automaton is corrupt");
+    };
+    if (states_ == 0 || states_ >= UINT32_MAX || first_child_[0] != 1 ||
+        first_child_[states_] != states_ || fail_[0] != 0 ||
+        (depth_[0] & kDepthMask) != 0)
+      throw invalid();
+    if (first_child_[1] < first_child_[0] || first_child_[1] > states_)
+      throw invalid();
+    for (size_t c = 0; c < 256; ++c) {
+      const uint32_t t = arrays.root_next[c];
+      if (t != 0 && (t < first_child_[0] || t >= first_child_[1] ||
+                     label_[t] != c))
+        throw invalid();
+      root_next_[c] = t;
+    }
+    for (size_t s = 0; s < states_; ++s) {
+      // BFS order: children follow their parent, fail links point back
+      if (s > 0 && (first_child_[s] < first_child_[s - 1] ||
+                    first_child_[s] <= s || fail_[s] >= s))
+        throw invalid();
+      // Depths drive match offsets, so they must be exact; fail links lead
+      // to strictly shallower states
+      if (s > 0 && (depth_[fail_[s]] & kDepthMask) >= (depth_[s] & kDepthMask))
+        throw invalid();
+      if (first_child_[s + 1] > states_)
+        throw invalid();
+      for (uint32_t t = first_child_[s]; t < first_child_[s + 1]; ++t) {
+        if ((depth_[t] & kDepthMask) != (depth_[s] & kDepthMask) + 1)
+          throw invalid();
+        if (t > first_child_[s] && label_[t] <= label_[t - 1])
+          throw invalid();
+      }
+    }
+  }
+
+  TermAutomaton(const TermAutomaton &) = delete;
+  TermAutomaton &operator=(const TermAutomaton &) = delete;
+
+  size_t term_count() const { return term_count_; }
+  size_t state_count() const { return states_; }
+  // Heap bytes owned by the automaton (zero when borrowed)
+  size_t memory_bytes() const {
+    return owned_first_child_.capacity() * sizeof(uint32_t) +
+           owned_label_.capacity() +
+           owned_fail_.capacity() * sizeof(uint32_t) +
+           owned_depth_.capacity() * sizeof(uint16_t) + sizeof(root_next_);
+  }
+  Arrays arrays() const {
+    return {root_next_.data(), first_child_, fail_, depth_, label_,
+            states_,           term_count_};
+  }
+
+  // Feeds text[from, text.size()) starting in `state` and returns the start
+  // offset (into text) of the first match, or npos. `state` is left after
+  // the last byte consumed, so the next call resumes the stream; a match
+  // returns early. With whole_words a match must not be preceded or
+  // followed by a word byte, and the end of `text` counts as a boundary.
+  // match_end, if given, receives the end offset of the returned match.
+  // A stream still arriving passes `held` instead: a whole-word match
+  // ending at text.size() is then undecided until the next byte, so it is
+  // not returned but its start is stored in *held.
+  size_t scan(std::string_view text, size_t from, uint32_t &state,
+              bool whole_words, size_t *match_end = nullptr,
+              size_t *held = nullptr) const {
+    uint32_t s = state;
+    for (size_t p = from; p < text.size(); ++p) {
+      s = next(s, fold(static_cast<unsigned char>(text[p])));
+      if (!(depth_[s] & kHasMatch))
+        continue;
+      // Longest first: s, then its suffixes along the fail chain
+      for (uint32_t m = s; m != 0; m = fail_[m]) {
+        if (!(depth_[m] & kTerminal))
+          continue;
+        const size_t start = p + 1 - (depth_[m] & kDepthMask);
+        if (whole_words && held && p + 1 == text.size()) {
+          // Longest first, as for a decided match
+          if (left_boundary_ok(text, start)) {
+            *held = start;
+            break;
+          }
+          continue;
+        }
+        if (!whole_words || boundary_ok(text, start, p + 1)) {
+          state = s;
+          if (match_end)
+            *match_end = p + 1;
+          return start;
+        }
+      }
+    }
+    state = s;
+    return npos;
+  }
+
+private:
+  const uint32_t *first_child_ = nullptr;
+  const uint8_t *label_ = nullptr;
+  const uint32_t *fail_ = nullptr;
+  const uint16_t *depth_ = nullptr;
+  size_t states_ = 0;
+  std::array<uint32_t, 256> root_next_{};
+  size_t term_count_ = 0;
+  // Storage of a built automaton; a borrowed one keeps `backing_` instead
+  std::vector<uint32_t> owned_first_child_;
+  std::vector<uint8_t> owned_label_;
+  std::vector<uint32_t> owned_fail_;
+  std::vector<uint16_t> owned_depth_;
+  std::shared_ptr<const void> backing_;
+
+  static bool left_boundary_ok(std::string_view text, size_t start) {
+    return start == 0 || !is_word(static_cast<unsigned char>(text[start - 1]));
+  }
+
+  static bool boundary_ok(std::string_view text, size_t start, size_t end) {
+    return left_boundary_ok(text, start) &&
+           (end >= text.size() ||
+            !is_word(static_cast<unsigned char>(text[end])));
+  }
+
+  // Child of s labelled c, or 0
+  uint32_t child(uint32_t s, unsigned char c) const {
+    if (s == 0)
+      return root_next_[c];
+    const uint8_t *first = label_ + first_child_[s];
+    const uint8_t *last = label_ + first_child_[s + 1];
+    const uint8_t *it = std::lower_bound(first, last, c);
+    return (it != last && *it == c) ? static_cast<uint32_t>(it - label_) : 0;
+  }
+
+  uint32_t next(uint32_t s, unsigned char c) const {
+    while (true) {
+      const uint32_t t = child(s, c);
+      if (t != 0 || s == 0)
+        return t;
+      s = fail_[s];
+    }
+  }
+
+  // Points the accessors at the owned storage (again after it grew)
+  void adopt() {
+    first_child_ = owned_first_child_.data();
+    label_ = owned_label_.data();
+    fail_ = owned_fail_.data();
+    depth_ = owned_depth_.data();
+    states_ = owned_label_.size();
+  }
+
+  void build(const std::vector<std::string> &terms) {
+    auto &first_child = owned_first_child_;
+    auto &label = owned_label_;
+    auto &fail = owned_fail_;
+    auto &depth = owned_depth_;
+    // Node s covers the sorted terms [lo[s], hi[s]) sharing its prefix
+    std::vector<uint32_t> lo{0}, hi{static_cast<uint32_t>(terms.size())};
+    label.push_back(0);
+    fail.push_back(0);
+    depth.push_back(0);
+
+    for (uint32_t s = 0; s < lo.size(); ++s) {
+      first_child.push_back(static_cast<uint32_t>(label.size()));
+      const size_t d = depth[s] & kDepthMask;
+      uint32_t i = lo[s];
+      // The term equal to the prefix (if any) sorts first
+      if (i < hi[s] && terms[i].size() == d)
+        ++i;
+      while (i < hi[s]) {
+        const unsigned char c = static_cast<unsigned char>(terms[i][d]);
+        uint32_t j = i + 1;
+        while (j < hi[s] && static_cast<unsigned char>(terms[j][d]) == c)
+          ++j;
+        const uint32_t t = static_cast<uint32_t>(label.size());
+        if (t == UINT32_MAX)
+          throw std::runtime_error("deny_terms automaton too large");
+        // Parents precede children in BFS order, so every state the fail
+        // chain can reach already has its children numbered.
+        adopt();
+        const uint32_t f = s == 0 ? 0 : next(fail[s], c);
+        uint16_t flags = static_cast<uint16_t>(d + 1);
+        if (terms[i].size() == d + 1)
+          flags |= kTerminal | kHasMatch;
+        flags |= depth[f] & kHasMatch;
+        label.push_back(c);
+        fail.push_back(f);
+        depth.push_back(flags);
+        lo.push_back(i);
+        hi.push_back(j);
+        if (s == 0)
+          root_next_[c] = t;
+        i = j;
+      }
+    }
+    first_child.push_back(static_cast<uint32_t>(label.size()));
+    first_child.shrink_to_fit();
+    label.shrink_to_fit();
+    fail.shrink_to_fit();
+    depth.shrink_to_fit();
+    adopt();
+  }
+};
+
+} // namespace invariant
@@ -0,0 +1,82 @@
+#pragma once
+#include <chrono>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+// Per-token timeline for latency forensics.
+// Columnar (one array per field) so recording is a few push_backs per token
+// and encoding is a linear pass per column.
+
+namespace invariant {
+
+struct Timeline {
+  using clock = std::chrono::steady_clock;
+
+  bool enabled = false;
+  clock::time_point origin; // start() of the current execution
+
+  std::vector<uint64_t> offsets;    // byte offset of the token in the output
+  std::vector<uint64_t> arrival_ns; // arrival time relative to origin
+  std::vector<uint32_t> check_ns;   // time spent checking the token
+  int64_t abort_index = -1;         // token index that triggered an abort
+
+  // Called from start(). Keeps the allocations of the previous execution.
+  void reset(size_t expected_tokens = 1024) {
+    offsets.clear();
+    arrival_ns.clear();
+    check_ns.clear();
+    abort_index = -1;
+    offsets.reserve(expected_tokens);
+    arrival_ns.reserve(expected_tokens);
+    check_ns.reserve(expected_tokens);
+    origin = clock::now();
+  }
+
+  void record(uint64_t offset, clock::time_point arrived,
+              clock::time_point checked) {
+    offsets.push_back(offset);
+    arrival_ns.push_back(static_cast<uint64_t>(
+        std::chrono::duration_cast<std::chrono::nanoseconds>(arrived - origin)
+            .count()));
+    check_ns.push_back(static_cast<uint32_t>(
+        std::chrono::duration_cast<std::chrono::nanoseconds>(checked - arrived)
+            .count()));
+  }
+
+  // Binary encoding "ITL1":
+  //   magic "ITL1" | varint count | varint abort_index+1 (0 = none)
+  //   | count x varint offset delta | count x varint arrival delta (ns)
+  //   | count x varint check duration (ns)
+  // Offsets and arrivals are monotonic, so deltas stay small.
+  std::string encode() const {
+    std::string out = "ITL1";
+    out.reserve(8 + offsets.size() * 6);
+    put_varint(out, offsets.size());
+    put_varint(out, static_cast<uint64_t>(abort_index + 1));
+    uint64_t prev = 0;
+    for (uint64_t v : offsets) {
+      put_varint(out, v - prev);
+      prev = v;
+    }
+    prev = 0;
+    for (uint64_t v : arrival_ns) {
+      put_varint(out, v - prev);
+      prev = v;
+    }
+    for (uint32_t v : check_ns)
+      put_varint(out, v);
+    return out;
+  }
+
+private:
+  static void put_varint(std::string &out, uint64_t v) {
+    while (v >= 0x80) {
+      out.push_back(static_cast<char>((v & 0x7f) | 0x80));
+      v >>= 7;
+    }
+    out.push_back(static_cast<char>(v));
+  }
+};
+
+} // namespace invariant
@@ -21,3 +21,13 @@ class ModelAdapter(ABC):
         Must return a token iterator to allow the boundary to intercept per-token.
         """
         pass
+
+    def close(self) -> None:
+        """
+        Cancels any in-flight generation (cancellation contract).
+        The orchestrator calls this as soon as the kernel aborts a stream, and
+        again once a stream ends normally. Adapters holding an upstream
+        connection must tear it down here so the provider stops generating.
+        Must be idempotent and safe to call from another thread.
+        """
+        pass
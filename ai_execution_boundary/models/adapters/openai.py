@@ -1,4 +1,5 @@
 import os
+import threading
 from typing import Iterator
 from openai import OpenAI
 from .base import ModelAdapter
@@ -25,8 +26,17 @@ class OpenAIAdapter(ModelAdapter):
             pass
         
         self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self._stream = None
+        self._cancelled = threading.Event()
 
     def generate(self, prompt: str) -> Iterator[str]:
+        # Reset when the request is created (see SimpleOpenAIAdapter)
+        self._cancelled.clear()
+        return self._generate(prompt)
+
+    def _generate(self, prompt: str) -> Iterator[str]:
+        if self._cancelled.is_set():
+            return  # closed before the request was opened
         # Parse decoding strategy (simplified for V0)
         # Expect strategy string like "greedy" or "temperature=0.7"
         temperature = 0.0
@@ -45,6 +55,18 @@ class OpenAIAdapter(ModelAdapter):
             stream=True
         )
 
-        for chunk in response:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+        self._stream = response
+
+        try:
+            for chunk in response:
+                if chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            self._stream = None
+
+    def close(self) -> None:
+        # Closing the SDK stream closes the underlying HTTP response
+        self._cancelled.set()
+        stream = self._stream
+        if stream is not None:
+            stream.close()
@@ -1,5 +1,6 @@
 import os
 import json
+import threading
 import requests
 from typing import Iterator
 from .base import ModelAdapter
@@ -11,11 +12,24 @@ class SimpleOpenAIAdapter(ModelAdapter):
     Avoids the heavy `openai` python package and its pydantic dependency issues.
     """
     def __init__(self, model_spec: ModelSpec):
+        super().__init__(model_spec)
         self.model_spec = model_spec
-        # Expect key in env, as set by app.py
-        self.api_key = os.environ.get("OPENAI_API_KEY")
+        # Expect key in env, as set by app.py (spec override wins, as in OpenAIAdapter)
+        self.api_key = model_spec.extra_params.get("api_key") or os.environ.get("OPENAI_API_KEY")
+        self.base_url = model_spec.extra_params.get("base_url")
+
+        # Pooled connections; close() releases the in-flight one back to the pool
+        self.session = requests.Session()
+        self._response = None
+        self._cancelled = threading.Event()
 
     def generate(self, prompt: str) -> Iterator[str]:
+        # Reset when the request is created, not on the first next(): a
+        # close() that lands before iteration starts must not be erased
+        self._cancelled.clear()
+        return self._generate(prompt)
+
+    def _generate(self, prompt: str) -> Iterator[str]:
         if not self.api_key:
              yield " [System: Please enter an API Key in the sidebar.]"
              return
@@ -23,7 +37,7 @@ class SimpleOpenAIAdapter(ModelAdapter):
         # Default Endpoint: OpenAI
         url = "https://api.openai.com/v1/chat/completions"
         model_name = "gpt-3.5-turbo"
-        
+
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
@@ -37,7 +51,11 @@ class SimpleOpenAIAdapter(ModelAdapter):
             # Default to a solid model on OpenRouter, or keep requesting gpt-3.5 and let them map it
             # But let's try to ask for 'google/gemini-2.0-flash-exp:free' or just 'gpt-3.5-turbo'?
             # Sticking to standard for compatibility unless user changed it.
-            model_name = "gpt-3.5-turbo" 
+            model_name = "gpt-3.5-turbo"
+
+        # Explicit endpoint override (self-hosted gateways, local stubs)
+        if self.base_url:
+            url = self.base_url.rstrip("/") + "/chat/completions"
 
         data = {
             "model": model_name,
@@ -45,28 +63,50 @@ class SimpleOpenAIAdapter(ModelAdapter):
             "temperature": 0.7,
             "stream": True # Force streaming for kernel interception
         }
-        
+
         try:
-            with requests.post(url, headers=headers, json=data, stream=True) as r:
+            if self._cancelled.is_set():
+                return  # closed before the request was opened
+            with self.session.post(url, headers=headers, json=data, stream=True) as r:
+                self._response = r
+                if self._cancelled.is_set():
+                    return
                 if r.status_code != 200:
                     yield f" [API Error {r.status_code} from {url}: {r.text}]"
                     return
-                
+
                 # Standard SSE Parser (Works for OpenAI & OpenRouter)
                 for line in r.iter_lines():
+                    if self._cancelled.is_set():
+                        return
                     if line:
                         decoded = line.decode("utf-8")
                         if decoded.startswith("data: "):
                             content = decoded[6:]
-                            if content == "[DONE]": 
+                            if content == "[DONE]":
                                 break
                             try:
                                 chunk = json.loads(content)
                                 if "choices" in chunk and len(chunk["choices"]) > 0:
                                     delta = chunk["choices"][0]["delta"].get("content", "")
-                                    if delta: 
+                                    if delta:
                                         yield delta
                             except Exception:
                                 pass
         except Exception as e:
+            # A cancelled stream fails mid-read by design; that is not an error
+            if self._cancelled.is_set():
+                return
             yield f" [Network Exception: {e}]"
+        finally:
+            self._response = None
+
+    def close(self) -> None:
+        """
+        Aborts the in-flight HTTP stream so the provider stops generating.
+        Closing the response drops the half-read connection and frees its pool slot.
+        """
+        self._cancelled.set()
+        response = self._response
+        if response is not None:
+            response.close()
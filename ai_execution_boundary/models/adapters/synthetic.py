@@ -0,0 +1,102 @@
+import math
+import random
+import threading
+import time
+from typing import Iterator
+from .base import ModelAdapter
+
+# Neutral vocabulary: none of these words trip the shipped policies
+_VOCAB = [
+    "kernel", "policy", "token", "stream", "proof", "graph", "context", "model",
+    "boundary", "receipt", "input", "output", "seal", "hash", "execution", "node",
+    "trace", "rule", "state", "system", "data", "value", "record", "check",
+]
+
+class SyntheticAdapter(ModelAdapter):
+    """
+    A configurable, seeded token generator for load and capacity testing.
+    Output is deterministic for a given (ModelSpec.seed, prompt) pair.
+
+    Behaviour is set through ModelSpec.extra_params:
+        output_bytes        total bytes to generate (default 512)
+        tokens_per_second   pacing, 0 for unthrottled (default 0)
+        chunk_distribution  "fixed" | "uniform" | "lognormal" (default "lognormal")
+        chunk_mean_bytes    mean token size in bytes (default 4)
+        chunk_max_bytes     upper bound on token size (default 32)
+        violation_phrase    text to inject (default "perhaps")
+        violation_rate      probability an execution contains the phrase (default 0)
+        violation_at        position of the phrase as a fraction of output_bytes;
+                            omitted = uniformly random
+    """
+
+    def __init__(self, model_spec):
+        super().__init__(model_spec)
+        p = model_spec.extra_params
+        self.output_bytes = int(p.get("output_bytes", 512))
+        self.tokens_per_second = float(p.get("tokens_per_second", 0))
+        self.chunk_distribution = p.get("chunk_distribution", "lognormal")
+        self.chunk_mean_bytes = max(1, int(p.get("chunk_mean_bytes", 4)))
+        self.chunk_max_bytes = max(self.chunk_mean_bytes, int(p.get("chunk_max_bytes", 32)))
+        self.violation_phrase = p.get("violation_phrase", "perhaps")
+        self.violation_rate = float(p.get("violation_rate", 0.0))
+        self.violation_at = p.get("violation_at")
+
+        if self.chunk_distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown chunk_distribution: {self.chunk_distribution}")
+        self._cancelled = threading.Event()
+
+    def _chunk_size(self, rng: random.Random) -> int:
+        if self.chunk_distribution == "fixed":
+            size = self.chunk_mean_bytes
+        elif self.chunk_distribution == "uniform":
+            size = rng.randint(1, 2 * self.chunk_mean_bytes - 1)
+        else:
+            # Real tokenizers emit mostly short pieces with a long tail
+            sigma = 0.6
+            size = round(rng.lognormvariate(math.log(self.chunk_mean_bytes) - sigma * sigma / 2, sigma))
+        return max(1, min(size, self.chunk_max_bytes))
+
+    def _text(self, rng: random.Random) -> str:
+        words = []
+        length = 0
+        while length < self.output_bytes:
+            word = rng.choice(_VOCAB)
+            words.append(word)
+            length += len(word) + 1
+        text = " ".join(words)[:self.output_bytes]
+
+        if self.violation_rate and rng.random() < self.violation_rate:
+            at = self.violation_at if self.violation_at is not None else rng.random()
+            pos = int(max(0.0, min(1.0, float(at))) * len(text))
+            text = text[:pos] + f" {self.violation_phrase} " + text[pos:]
+        return text
+
+    def generate(self, prompt: str) -> Iterator[str]:
+        # Reset when the request is created (see SimpleOpenAIAdapter)
+        self._cancelled.clear()
+        return self._generate(prompt)
+
+    def _generate(self, prompt: str) -> Iterator[str]:
+        rng = random.Random(f"{self.spec.seed}:{prompt}")
+        text = self._text(rng)
+
+        interval = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        deadline = time.perf_counter()
+        pos = 0
+        while pos < len(text):
+            if self._cancelled.is_set():
+                return
+            size = self._chunk_size(rng)
+            yield text[pos:pos + size]
+            pos += size
+
+            if interval:
+                # Pace against an absolute schedule so sleep jitter does not accumulate
+                deadline += interval
+                delay = deadline - time.perf_counter()
+                # close() from another thread wakes the pacing wait
+                if delay > 0 and self._cancelled.wait(delay):
+                    return
+
+    def close(self) -> None:
+        self._cancelled.set()
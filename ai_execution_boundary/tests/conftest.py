@@ -0,0 +1,35 @@
+import json
+import os
+import pytest
+
+@pytest.fixture
+def make_boundary(tmp_path):
+    """Factory for policy-loaded boundaries on either engine.
+
+    ``policy`` is a rule list or raw policy JSON, written to
+    ``tmp_path/policy.json``, or the path of an existing policy or artifact.
+    """
+    def make(policy, engine="native", model=True):
+        if engine == "native":
+            module = pytest.importorskip("invariant_enforcement")
+        else:
+            from ai_execution_boundary.enforcement import python_engine as module
+        if isinstance(policy, os.PathLike):
+            path = policy
+        else:
+            path = tmp_path / "policy.json"
+            path.write_text(policy if isinstance(policy, str) else json.dumps(policy))
+        boundary = module.ExecutionBoundary()
+        boundary.load_policy(str(path))
+        if model:
+            boundary.load_model(module.ModelSpec())
+        return boundary
+    return make
+
+@pytest.fixture
+def violation():
+    """``(rule_id, type, stage, offset)`` of a boundary's last violation."""
+    def describe(boundary):
+        v = boundary.last_violation()
+        return (v.rule_id, v.type, v.stage, v.offset)
+    return describe
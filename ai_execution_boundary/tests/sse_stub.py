@@ -0,0 +1,81 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional, Union
+
+class SSEStub:
+    """
+    Local OpenAI-compatible streaming endpoint used by adapter tests and benchmarks.
+    Streams `tokens` as chat.completion chunks and records every byte it manages
+    to write, so callers can measure how quickly a client hangs up.
+    first_token_delay may be a callable, drawn per request (injected latency).
+    """
+
+    def __init__(self, tokens: List[str], interval: float = 0.0,
+                 first_token_delay: Union[float, Callable[[], float]] = 0.0):
+        self.tokens = tokens
+        self.interval = interval
+        self.first_token_delay = first_token_delay
+
+        self.writes = []  # (monotonic timestamp, bytes written)
+        self.finished = threading.Event()
+        self.disconnected: Optional[bool] = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def bytes_sent_after(self, timestamp: float) -> int:
+        return sum(n for t, n in self.writes if t > timestamp)
+
+    def start(self) -> "SSEStub":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+
+                delay = stub.first_token_delay
+                time.sleep(delay() if callable(delay) else delay)
+                events = [{"choices": [{"delta": {"content": t}}]} for t in stub.tokens]
+                lines = [f"data: {json.dumps(e)}\n\n".encode() for e in events]
+                lines.append(b"data: [DONE]\n\n")
+                try:
+                    for line in lines:
+                        self.wfile.write(line)
+                        self.wfile.flush()
+                        stub.writes.append((time.monotonic(), len(line)))
+                        if stub.interval:
+                            time.sleep(stub.interval)
+                    stub.disconnected = False
+                except (BrokenPipeError, ConnectionResetError):
+                    stub.disconnected = True
+                finally:
+                    stub.finished.set()
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,122 @@
+import json
+import time
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ai_execution_boundary.control.analytics import ReceiptStore, DIMENSIONS, TIMESTAMP, main, receipt_row
+from ai_execution_boundary.control.scheduler import percentile
+
+def _receipt(org, status, total_ms, rule=None):
+    result = {"status": status, "output": "ok", "timing": {"total_ms": total_ms, "admission_ms": 1.0,
+                                                           "ttfat_ms": None}}
+    if rule:
+        result["violation"] = {"rule_id": rule, "type": "deny_regex", "stage": "stream", "offset": 0}
+    return {
+        "schema": "invariant.receipt.v1",
+        "meta": {"timestamp": "2026-01-04T10:00:00Z", "proof_id": None},
+        "graph": {"identity": {"user_id": "u", "role": "r", "org": org, "env": "prod"},
+                  "policy_name": "/srv/policies/reality_only.json",
+                  "model": {"provider": "mock", "name": "m", "version": "v1"}},
+        "result": result,
+    }
+
+def test_incremental_ingest_and_group_by(tmp_path):
+    batch = tmp_path / "batch.jsonl"
+    with open(batch, "w") as f:
+        for i in range(10):
+            f.write(json.dumps(_receipt("acme", "COMPLETED", float(i))) + "\n")
+        f.write(json.dumps(_receipt("acme", "ABORTED", 5.0, rule="deny_speculation_output")) + "\n")
+    single = tmp_path / "one.json"
+    single.write_text(json.dumps(_receipt("globex", "ABORTED", 7.0, rule="cap_tokens")))
+
+    store = ReceiptStore(str(tmp_path / "store"))
+    assert store.ingest([str(batch)]) == 11
+    # A second ingest appends a segment; existing ones are untouched
+    reopened = ReceiptStore(str(tmp_path / "store"))
+    assert reopened.ingest([str(single)]) == 1
+    assert len(reopened.segments()) == 2 and len(reopened) == 12
+
+    by_org = {r["org"]: r for r in reopened.group_by(["org"])}
+    assert by_org["acme"]["count"] == 11
+    assert by_org["acme"]["total_ms_p50"] == pytest.approx(percentile(sorted(list(range(10)) + [5.0]), 50))
+    assert by_org["globex"]["total_ms_p99"] == pytest.approx(7.0)
+
+    blocked = reopened.group_by(["rule", "policy"], where={"status": "ABORTED"})
+    assert [(r["rule"], r["policy"], r["count"]) for r in blocked] == [
+        ("deny_speculation_output", "reality_only", 1), ("cap_tokens", "reality_only", 1)]
+    # Missing metrics are ignored, not counted as zero
+    assert np.isnan(reopened.group_by(["org"], metric="ttfat_ms")[0]["ttfat_ms_p50"])
+
+def test_timestamps_are_utc_whatever_the_local_zone(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("needs time.tzset")
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        assert receipt_row(_receipt("acme", "COMPLETED", 1.0))[TIMESTAMP] == 1767520800.0
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+def test_percentiles_are_nearest_rank(tmp_path):
+    rng = np.random.default_rng(7)
+    n = 50_000
+    store = ReceiptStore(str(tmp_path / "store"))
+    for org in ("a", "b", "c"):
+        store.encode("org", org)
+    columns = {d: np.zeros(n, dtype=np.uint32) for d in DIMENSIONS}
+    columns["org"] = rng.integers(0, 3, n).astype(np.uint32)
+    latency = rng.lognormal(3, 1, n).astype(np.float32)
+    latency[::13] = np.nan
+    columns["total_ms"] = latency
+    store.write_segment(columns)
+
+    for row in store.group_by(["org"], percentiles=(50, 99)):
+        values = latency[(columns["org"] == "abc".index(row["org"])) & ~np.isnan(latency)].astype(np.float64)
+        # Same definition as the scheduler's and loadgen's reports
+        assert row["total_ms_p50"] == percentile(sorted(values), 50)
+        assert row["total_ms_p99"] == percentile(sorted(values), 99)
+        assert row["total_ms_p99"] == np.percentile(values, 99, method="inverted_cdf")
+
+def test_cli_report(tmp_path, capsys):
+    receipt = tmp_path / "r.json"
+    receipt.write_text(json.dumps(_receipt("acme", "COMPLETED", 3.0)))
+    main(["ingest", str(tmp_path / "store"), str(receipt)])
+    main(["report", str(tmp_path / "store"), "--by", "org,status"])
+    out = capsys.readouterr().out
+    assert "acme" in out and "COMPLETED" in out
+
+    for where, error in (("stauts=ABORTED", "Unknown dimension in --where: stauts"), ("status", "dimension=value")):
+        with pytest.raises(SystemExit):
+            main(["report", str(tmp_path / "store"), "--where", where])
+        assert error in capsys.readouterr().err
+
+def test_kernel_receipts_carry_timing_and_violations(tmp_path):
+    pytest.importorskip("invariant_enforcement")
+    pytest.importorskip("cryptography")
+    from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+    from ai_execution_boundary.control.errors import ExecutionAborted
+    from ai_execution_boundary.control.orchestrator import Invariant
+
+    policy = tmp_path / "policy.json"
+    policy.write_text('[{"id": "cap", "type": "max_output_bytes", "limit": 4}]')
+    inv = Invariant(pool_size=1)
+    identity = Identity("u", "r", "acme", "test")
+    model = ModelSpec("mock", "m", "v1", 42, "greedy")
+
+    completed = inv.build_receipt(inv.execute("Explain", identity, model, ContextSpec([])))
+    with pytest.raises(ExecutionAborted) as err:
+        inv.execute("Explain", identity, model, ContextSpec([]), policy_name=str(policy))
+    aborted = inv.build_receipt(err.value.to_result())
+    assert aborted["meta"]["proof_id"] is None
+    assert aborted["integrity"]["signatures"][0]["signed_field"] == "result.status|graph.id"
+
+    store = ReceiptStore(str(tmp_path / "store"))
+    store.append(completed)
+    store.append(aborted)
+    store.flush()
+    rows = {r["status"]: r for r in store.group_by(["status", "rule"])}
+    assert rows["ABORTED"]["rule"] == "cap"
+    assert rows["COMPLETED"]["rule"] == ""
+    assert rows["COMPLETED"]["total_ms_p50"] > 0
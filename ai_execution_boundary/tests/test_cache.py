@@ -0,0 +1,81 @@
+import time
+import pytest
+
+pytest.importorskip("invariant_enforcement")
+pytest.importorskip("cryptography")
+
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, DeterminismLevel
+from ai_execution_boundary.control.cache import ExecutionCache
+from ai_execution_boundary.control.orchestrator import Invariant
+from ai_execution_boundary.models.adapters.mock import MockAdapter
+
+IDENTITY = Identity("u", "r", "o", "test")
+STRICT = ModelSpec("mock", "cache-model", "v1", 42, "greedy")
+
+@pytest.fixture
+def model_calls(monkeypatch):
+    calls = []
+    generate = MockAdapter.generate
+    monkeypatch.setattr(MockAdapter, "generate", lambda self, prompt: calls.append(prompt) or generate(self, prompt))
+    return calls
+
+def test_determinism_levels():
+    assert STRICT.determinism == DeterminismLevel.STRICT
+    assert ModelSpec("openai", "m", "v1", 1, "greedy").determinism == DeterminismLevel.BOUNDED
+    assert ModelSpec("mock", "m", "v1", 1, "temperature=0.7").determinism == DeterminismLevel.BEST_EFFORT
+    declared = ModelSpec("openai", "m", "v1", 1, "greedy", extra_params={"determinism": "STRICT"})
+    assert declared.determinism == DeterminismLevel.STRICT
+
+def test_strict_executions_are_served_from_cache(tmp_path, model_calls):
+    inv = Invariant(pool_size=1, cache=ExecutionCache(str(tmp_path / "cache.db")))
+    first = inv.execute("Explain", IDENTITY, STRICT, ContextSpec([]))
+    second = inv.execute("Explain", IDENTITY, STRICT, ContextSpec([]))
+
+    assert len(model_calls) == 1
+    assert first["cache"] == {"hit": False}
+    assert second["cache"]["hit"] is True
+    assert (second["output"], second["proof"]) == (first["output"], first["proof"])
+
+    receipt = inv.build_receipt(second)
+    assert receipt["result"]["cache"]["hit"] is True
+    assert receipt["integrity"]["signatures"][0]["signed_field"] == "meta.proof_id|result.cache.hit"
+
+    # Persistent: a new node with the same store still hits
+    again = Invariant(pool_size=1, cache=ExecutionCache(str(tmp_path / "cache.db")))
+    assert again.execute("Explain", IDENTITY, STRICT, ContextSpec([]))["cache"]["hit"] is True
+    assert len(model_calls) == 1
+
+def test_non_strict_and_changed_policies_miss(tmp_path, model_calls):
+    inv = Invariant(pool_size=1, cache=ExecutionCache())
+    sampled = ModelSpec("mock", "cache-model", "v1", 42, "temperature=0.7")
+    for _ in range(2):
+        assert inv.execute("Explain", IDENTITY, sampled, ContextSpec([]))["cache"] is None
+    assert len(model_calls) == 2
+
+    policy = tmp_path / "policy.json"
+    policy.write_text('[{"id": "a", "pattern": "forbidden"}]')
+    inv.execute("Explain", IDENTITY, STRICT, ContextSpec([]), policy_name=str(policy))
+    policy.write_text('[{"id": "b", "pattern": "normally"}]')
+    # Same graph ID, but the stored approval came from another policy
+    with pytest.raises(RuntimeError, match="Mid-Stream"):
+        inv.execute("Explain", IDENTITY, STRICT, ContextSpec([]), policy_name=str(policy))
+    assert len(model_calls) == 4
+
+def test_eviction_bounds():
+    cache = ExecutionCache(max_entries=2, ttl_seconds=60)
+    for key in ("a", "b"):
+        cache.put(key, "out", "proof", "digest")
+    assert cache.get("a", "digest") is not None  # "b" is now least recently used
+    cache.put("c", "out", "proof", "digest")
+    assert cache.get("b", "digest") is None
+    assert cache.stats()["entries"] == 2
+
+    sized = ExecutionCache(max_bytes=10)
+    sized.put("a", "x" * 6, "proof", "digest")
+    sized.put("b", "y" * 6, "proof", "digest")
+    assert sized.get("a", "digest") is None and sized.get("b", "digest") is not None
+
+    expiring = ExecutionCache(ttl_seconds=0.01)
+    expiring.put("a", "out", "proof", "digest")
+    time.sleep(0.02)
+    assert expiring.get("a", "digest") is None
@@ -0,0 +1,111 @@
+import time
+import pytest
+
+pytest.importorskip("requests")
+
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+from ai_execution_boundary.models.adapters.simple_openai import SimpleOpenAIAdapter
+from sse_stub import SSEStub
+
+# 2000 chunks at 2ms each: a stream left open would keep going for ~4s
+TOKENS = [f"tok{i} " for i in range(2000)]
+INTERVAL = 0.002
+
+def _spec(base_url):
+    return ModelSpec("openai", "stub-model", "v1", 42, "greedy",
+                     extra_params={"base_url": base_url, "api_key": "test-key"})
+
+def test_adapter_close_tears_down_stream():
+    with SSEStub(TOKENS, interval=INTERVAL) as stub:
+        adapter = SimpleOpenAIAdapter(_spec(stub.base_url))
+        stream = adapter.generate("prompt")
+        received = [next(stream) for _ in range(5)]
+        assert received == TOKENS[:5]
+
+        aborted_at = time.monotonic()
+        adapter.close()
+        stream.close()
+
+        assert stub.finished.wait(timeout=2.0), "stub kept streaming after close()"
+        assert stub.disconnected is True
+        # Only what was already in flight may be written after the abort
+        bytes_after_abort = stub.bytes_sent_after(aborted_at)
+        assert bytes_after_abort < 1024, bytes_after_abort
+
+def test_close_from_another_thread_ends_iteration_quietly():
+    import threading
+
+    with SSEStub(TOKENS, interval=INTERVAL) as stub:
+        adapter = SimpleOpenAIAdapter(_spec(stub.base_url))
+        tokens = []
+        for token in adapter.generate("prompt"):
+            tokens.append(token)
+            if len(tokens) == 3:
+                threading.Thread(target=adapter.close).start()
+        # No "[Network Exception ...]" token leaks out of a cancelled stream
+        assert all(t.startswith("tok") for t in tokens)
+        assert len(tokens) < len(TOKENS)
+        assert stub.finished.wait(timeout=2.0)
+
+def test_kernel_abort_cancels_upstream(tmp_path):
+    pytest.importorskip("invariant_enforcement")
+    pytest.importorskip("cryptography")
+    from ai_execution_boundary.control.orchestrator import Invariant
+
+    policy = tmp_path / "deny.json"
+    policy.write_text('[{"id": "deny_forbidden", "type": "deny_regex", "pattern": "forbidden"}]')
+
+    tokens = TOKENS[:3] + ["forbidden "] + TOKENS[3:]
+    with SSEStub(tokens, interval=INTERVAL) as stub:
+        inv = Invariant()
+        with pytest.raises(RuntimeError, match="Policy Violation"):
+            inv.execute("prompt", Identity("u", "r", "o", "test"), _spec(stub.base_url),
+                        ContextSpec([]), policy_name=str(policy))
+        aborted_at = time.monotonic()
+
+        assert stub.finished.wait(timeout=2.0), "upstream stream was not cancelled"
+        assert stub.disconnected is True
+        assert stub.bytes_sent_after(aborted_at) < 1024
+
+def test_speculative_request_cancelled_when_precheck_denies(tmp_path):
+    pytest.importorskip("invariant_enforcement")
+    pytest.importorskip("cryptography")
+    from ai_execution_boundary.control.orchestrator import Invariant
+
+    policy = tmp_path / "deny.json"
+    policy.write_text('[{"id": "deny_forbidden", "type": "deny_regex", "pattern": "forbidden"}]')
+    identity = Identity("u", "r", "o", "test")
+
+    with SSEStub(TOKENS, interval=INTERVAL) as stub:
+        inv = Invariant()
+        with pytest.raises(RuntimeError, match="Pre-Check"):
+            inv.execute("a forbidden prompt", identity, _spec(stub.base_url),
+                        ContextSpec([]), policy_name=str(policy), speculative=True)
+        assert stub.finished.wait(timeout=2.0), "speculative request was not cancelled"
+        assert stub.disconnected is True
+
+    # Admitted requests produce the same sealed result with or without overlap
+    with SSEStub(TOKENS[:20]) as stub:
+        sequential = inv.execute("prompt", identity, _spec(stub.base_url), ContextSpec([]),
+                                 policy_name=str(policy))
+        overlapped = inv.execute("prompt", identity, _spec(stub.base_url), ContextSpec([]),
+                                 policy_name=str(policy), speculative=True)
+    assert overlapped["output"] == sequential["output"] == "".join(TOKENS[:20])
+    assert overlapped["proof"] == sequential["proof"]
+    assert overlapped["timing"]["ttfat_ms"] is not None
+
+def test_close_before_the_first_token_never_opens_the_request():
+    from ai_execution_boundary.models.adapters.synthetic import SyntheticAdapter
+
+    with SSEStub(TOKENS, interval=INTERVAL) as stub:
+        adapter = SimpleOpenAIAdapter(_spec(stub.base_url))
+        stream = adapter.generate("prompt")
+        adapter.close()  # e.g. a pre-check denial racing the speculative pump
+        assert list(stream) == []
+        time.sleep(0.1)
+        assert not stub.writes
+
+    synthetic = SyntheticAdapter(ModelSpec("synthetic", "s", "v1", 1, "greedy"))
+    stream = synthetic.generate("prompt")
+    synthetic.close()
+    assert list(stream) == []
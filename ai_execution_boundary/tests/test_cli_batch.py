@@ -0,0 +1,67 @@
+import io
+import json
+import threading
+import time
+import pytest
+
+pytest.importorskip("cryptography")
+
+import cli
+from ai_execution_boundary.control.orchestrator import Invariant
+from ai_execution_boundary.control.receipts import ReceiptWriter
+
+def _records(out):
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+def test_batch_writes_results_and_receipts(tmp_path):
+    lines = [json.dumps({"id": "a", "prompt": "Explain the plan"}),
+             "",
+             json.dumps({"id": "b", "prompt": "What if we tried", "policy": "reality_only"}),
+             "not json",
+             json.dumps({"prompt": "Summarize", "policy": "reality_only"})]
+    inv = Invariant(pool_size=2)
+    out = io.StringIO()
+    with ReceiptWriter(inv, str(tmp_path / "receipts.jsonl")) as writer:
+        counts = cli.run_batch(inv, lines, out, policy="reality_only", concurrency=2, writer=writer)
+    assert counts == {"COMPLETED": 2, "ABORTED": 1, "ERROR": 1}
+
+    records = {r["line"]: r for r in _records(out)}
+    assert sorted(records) == [1, 3, 4, 5]
+    assert records[1]["id"] == "a" and records[1]["status"] == "COMPLETED" and records[1]["proof"]
+    assert records[3]["status"] == "ABORTED" and records[3]["proof"] is None
+    assert records[3]["violation"]["stage"] == "precheck"
+    assert records[4]["status"] == "ERROR"
+    assert all("wall_ms" in r["timing"] for r in records.values())
+
+    with open(tmp_path / "receipts.jsonl") as f:
+        receipts = [json.loads(line) for line in f]
+    assert sorted(r["result"]["status"] for r in receipts) == ["ABORTED", "COMPLETED", "COMPLETED"]
+    assert {r["meta"]["proof_id"] for r in receipts} == {records[n]["proof"] for n in (1, 3, 5)}
+
+class _Slow:
+    """Stands in for Invariant: counts executions in flight."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = self.peak = 0
+
+    def execute(self, prompt, *args, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.002)
+        with self.lock:
+            self.in_flight -= 1
+        return {"status": "COMPLETED", "output": prompt, "proof": "p", "timing": None}
+
+def test_batch_reads_no_further_than_the_requests_in_flight():
+    inv, out, concurrency = _Slow(), io.StringIO(), 3
+
+    def lines():
+        for i in range(300):
+            # Constant memory: the reader never runs ahead of the results
+            assert i - len(out.getvalue().splitlines()) <= concurrency
+            yield json.dumps({"prompt": f"p{i}"})
+
+    counts = cli.run_batch(inv, lines(), out, concurrency=concurrency)
+    assert counts["COMPLETED"] == 300 and inv.peak <= concurrency
+    assert sorted(r["output"] for r in _records(out)) == sorted(f"p{i}" for i in range(300))
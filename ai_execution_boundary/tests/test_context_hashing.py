@@ -0,0 +1,32 @@
+import pytest
+
+enforcement = pytest.importorskip("invariant_enforcement")
+pytest.importorskip("cryptography")
+
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ContextSource
+from ai_execution_boundary.control.orchestrator import Invariant
+
+IDENTITY = Identity("u", "r", "o", "test")
+MODEL = ModelSpec("mock", "hash-model", "v1", 42, "greedy")
+
+def test_duplicate_sources_are_hashed_once(tmp_path, monkeypatch):
+    files = []
+    for i in range(6):
+        f = tmp_path / f"doc{i}.txt"
+        f.write_text(f"document {i}")
+        files.append(str(f))
+    sources = [ContextSource("file", "internal", path) for path in files]
+    # Same file again, by identical path and through a different spelling
+    sources.append(ContextSource("file", "internal", files[0]))
+    sources.append(ContextSource("file", "internal", str(tmp_path / "." / "doc1.txt")))
+
+    hashed = []
+    native = enforcement.crypto_hash_file
+    monkeypatch.setattr(enforcement, "crypto_hash_file", lambda path: hashed.append(path) or native(path))
+
+    inv = Invariant(pool_size=1)
+    graph = inv.execute("Explain", IDENTITY, MODEL, ContextSpec(sources))["graph"]
+
+    assert len(hashed) == len(files)
+    # Every source (duplicates included) carries the digest of its file, in order
+    assert [s.content_hash for s in graph.context.sources] == [native(s.identifier) for s in sources]
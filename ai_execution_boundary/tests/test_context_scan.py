@@ -0,0 +1,125 @@
+import pytest
+
+enforcement = pytest.importorskip("invariant_enforcement")
+
+POLICY = '[{"id": "deny_perhaps", "type": "deny_regex", "pattern": "\\\\bperhaps\\\\b"}]'
+
+def _source(path, digest):
+    source = enforcement.ContextSource()
+    source.type = "file"
+    source.identifier = str(path)
+    source.content_hash = digest
+    return source
+
+def test_match_straddling_chunk_boundary_is_found_once(tmp_path, make_boundary):
+    data = bytearray(b"a " * 200)
+    data[96:105] = b" perhaps "  # crosses the 100-byte chunk boundary
+    ctx = tmp_path / "ctx.txt"
+    ctx.write_bytes(bytes(data))
+
+    boundary = make_boundary(POLICY, model=False)
+    violations = boundary.scan_context(_source(ctx, "d1"), chunk_bytes=100, overlap_bytes=16)
+    assert [(v.identifier, v.offset) for v in violations] == [(str(ctx), 97)]
+
+def test_chunk_start_respects_word_boundaries(tmp_path, make_boundary):
+    # "xperhaps" is not a word match, even when a chunk starts at "perhaps"
+    data = b"a" * 99 + b"xperhaps tail"
+    ctx = tmp_path / "ctx.txt"
+    ctx.write_bytes(data)
+
+    boundary = make_boundary(POLICY, model=False)
+    assert boundary.scan_context(_source(ctx, "d2"), chunk_bytes=100, overlap_bytes=16) == []
+
+def test_scan_results_are_cached_by_digest(tmp_path, make_boundary):
+    ctx = tmp_path / "ctx.txt"
+    ctx.write_bytes(b"perhaps")
+    boundary = make_boundary(POLICY, model=False)
+    assert len(boundary.scan_context(_source(ctx, "same-digest"))) == 1
+
+    # Same digest: the file is not read again, so a rewrite is not observed
+    ctx.write_bytes(b"clean")
+    assert len(boundary.scan_context(_source(ctx, "same-digest"))) == 1
+    assert boundary.scan_context(_source(ctx, "new-digest")) == []
+
+@pytest.mark.parametrize("engine", ["native", "python"])
+def test_scan_cache_skips_failed_hashes_and_evicts_least_recent(tmp_path, engine, make_boundary):
+    if engine == "native":
+        module = enforcement
+    else:
+        from ai_execution_boundary.enforcement import python_engine as module
+    boundary = make_boundary(POLICY, engine, model=False)
+    entries = module.ExecutionBoundary.kScanCacheEntries
+    ctx = tmp_path / "ctx.txt"
+
+    def scan(digest):
+        source = module.ContextSource()
+        source.identifier, source.content_hash = str(ctx), digest
+        return len(boundary.scan_context(source))
+
+    # Every unhashable file reports the same sentinel: never share its result
+    ctx.write_bytes(b"perhaps")
+    assert scan(module.ExecutionBoundary.kErrorHash) == 1
+    ctx.write_bytes(b"clean")
+    assert scan(module.ExecutionBoundary.kErrorHash) == 0
+
+    ctx.write_bytes(b"perhaps")
+    assert scan("oldest") == 1 and scan("recent") == 1
+    ctx.write_bytes(b"clean")
+    for i in range(entries - 2):
+        assert scan(f"filler-{i}") == 0
+    assert scan("oldest") == 1  # still cached, and now the most recent
+    assert scan("one-too-many") == 0
+    assert scan("recent") == 0  # evicted, so rescanned
+    assert scan("oldest") == 1
+
+def test_orchestrator_refuses_inadmissible_context(tmp_path):
+    pytest.importorskip("cryptography")
+    from ai_execution_boundary.control.orchestrator import Invariant, ExecutionAborted
+    from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ContextSource
+
+    policy = tmp_path / "policy.json"
+    policy.write_text(POLICY)
+    ctx = tmp_path / "rag.txt"
+    ctx.write_bytes(b"Facts only. Perhaps not.")
+
+    inv = Invariant()
+    args = ("Query", Identity("u", "r", "o", "test"), ModelSpec("mock", "m", "v1", 1, "greedy"),
+            ContextSpec([ContextSource("file", "internal", str(ctx))]))
+
+    # Without the scan the context is only hashed
+    assert inv.execute(*args, policy_name=str(policy))["status"] == "COMPLETED"
+
+    with pytest.raises(ExecutionAborted, match="Policy Violation in Context") as err:
+        inv.execute(*args, policy_name=str(policy), scan_context=True)
+    violations = err.value.graph.context_violations
+    assert [(v.identifier, v.rule_id, v.offset) for v in violations] == [(str(ctx), "deny_perhaps", 12)]
+    assert "context_violations" in err.value.graph.to_json()
+    assert err.value.violation["type"] == "deny_regex"
+
+    # The reported type is the rule's own, as precheck() reports it
+    policy.write_text('[{"id": "names", "type": "deny_terms", "terms": ["perhaps"]}]')
+    with pytest.raises(ExecutionAborted) as err:
+        inv.execute(*args, policy_name=str(policy), scan_context=True)
+    assert err.value.violation == {"rule_id": "names", "type": "deny_terms", "stage": "context", "offset": 12}
+
+@pytest.mark.parametrize("engine", ["native", "python"])
+def test_recompiled_policy_is_not_served_stale_scans(tmp_path, engine):
+    if engine == "python":
+        from ai_execution_boundary.enforcement import python_engine as module
+    else:
+        module = enforcement
+    ctx = tmp_path / "ctx.txt"
+    ctx.write_bytes(b"the secret plan")
+    policy = tmp_path / "policy.json"
+    policy.write_text(POLICY)
+    boundary = module.ExecutionBoundary()
+    boundary.load_policy(str(policy))
+    source = module.ContextSource()
+    source.identifier, source.content_hash = str(ctx), "digest"
+    assert boundary.scan_context(source) == []
+
+    # Same path, same context digest, different rules (size changes the stamp)
+    policy.write_text('[{"id": "secret", "type": "deny_regex", "pattern": "secret"}]')
+    boundary.reset()
+    boundary.load_policy(str(policy))
+    assert [v.rule_id for v in boundary.scan_context(source)] == ["secret"]
@@ -0,0 +1,110 @@
+import os
+import random
+import pytest
+
+enforcement = pytest.importorskip("invariant_enforcement")
+
+def test_terms_are_case_folded_whole_words(make_boundary, violation):
+    boundary = make_boundary([{"id": "skus", "type": "deny_terms", "terms": ["SKU-1234", "acme corp"]}])
+    assert not boundary.precheck(b"order sku-1234 now")
+    assert violation(boundary) == ("skus", "deny_terms", "precheck", 6)
+    assert not boundary.precheck(b"Ask ACME Corp.")
+    assert boundary.precheck(b"SKU-12345 and xacme corp")  # embedded in longer words
+
+    substrings = make_boundary([{"id": "skus", "type": "deny_terms", "terms": ["SKU-1234"],
+                                 "whole_words": False}])
+    assert not substrings.precheck(b"SKU-12345")
+
+def test_stream_matching_is_incremental(make_boundary, violation):
+    boundary = make_boundary([{"id": "names", "type": "deny_terms", "terms": ["jane doe", "doe"]}])
+    boundary.set_profiling(True)
+    boundary.start(b"prompt")
+    assert boundary.step(b"Ask Ja") and boundary.step(b"ne D") and boundary.step(b"o")
+    # The term spans four tokens and ends the output so far: the next byte
+    # decides whether it is a whole word
+    assert boundary.step(b"e")
+    assert not boundary.step(b"?")
+    assert violation(boundary) == ("names", "deny_terms", "stream", 4)
+
+    # Each step only scans the bytes of its own token
+    assert boundary.rule_profile()[0].bytes_scanned == len(b"prompt") + 6 + 4 + 1 + 1 + 1
+
+@pytest.mark.parametrize("engine", ["native", "python"])
+def test_a_term_ending_a_token_waits_for_the_next_byte(engine, make_boundary, violation):
+    boundary = make_boundary([{"id": "names", "type": "deny_terms", "terms": ["ann"]}], engine)
+
+    # "ann" + "ual" is the word "annual", not the term
+    boundary.start(b"prompt")
+    assert boundary.step(b"the ann") and boundary.step(b"") and boundary.step(b"ual report")
+    assert boundary.finish()
+
+    boundary.start(b"prompt")
+    assert boundary.step(b"ask ann") and not boundary.step(b", she knows")
+    assert boundary.last_violation().stage == "stream" and boundary.last_violation().offset == 4
+
+    # The end of the stream is a boundary too
+    boundary.start(b"prompt")
+    assert boundary.step(b"ask ") and boundary.step(b"Ann")
+    assert not boundary.finish()
+    assert violation(boundary) == ("names", "deny_terms", "finish", 4)
+
+def test_a_term_completed_inside_a_token_needs_a_boundary(make_boundary, violation):
+    boundary = make_boundary([{"id": "names", "type": "deny_terms", "terms": ["dream"]}])
+    boundary.start(b"prompt")
+    assert boundary.step(b"dreamy") and boundary.step(b" dreams")
+    assert not boundary.step(b" dream.")
+    assert violation(boundary) == ("names", "deny_terms", "stream", 14)
+
+def test_terms_file_is_relative_to_the_policy_and_tracked_by_the_cache(tmp_path, make_boundary):
+    (tmp_path / "lists").mkdir()
+    terms = tmp_path / "lists" / "names.txt"
+    terms.write_text("# customers\nAlice Smith\n\n  Bob Jones  \r\n")
+    boundary = make_boundary([{"id": "names", "type": "deny_terms", "terms_file": "lists/names.txt"}])
+    assert not boundary.precheck(b"bob jones called")
+    assert boundary.precheck(b"carol white called")
+
+    compiles = boundary.alloc_stats().policy_compiles
+    boundary.load_policy(str(tmp_path / "policy.json"))
+    assert boundary.alloc_stats().policy_compiles == compiles  # cached
+
+    terms.write_text("Carol White\n")
+    os.utime(terms, (1, 1))
+    boundary.load_policy(str(tmp_path / "policy.json"))
+    assert boundary.alloc_stats().policy_compiles == compiles + 1
+    assert not boundary.precheck(b"carol white called")
+    assert boundary.precheck(b"bob jones called")
+
+def test_context_scan_finds_terms_across_chunks(tmp_path, make_boundary, violation):
+    boundary = make_boundary([{"id": "names", "type": "deny_terms", "terms": ["needle in haystack"]}])
+    doc = tmp_path / "doc.txt"
+    doc.write_bytes(b"x " * 500 + b"needle in haystack" + b" y" * 500)
+    source = enforcement.ContextSource()
+    source.identifier = str(doc)
+    found = boundary.scan_context(source, chunk_bytes=1005, overlap_bytes=64)
+    assert [(v.rule_id, v.offset) for v in found] == [("names", 1000)]
+    assert not boundary.precheck(b"prompt")
+    assert violation(boundary) == ("names", "deny_terms", "context", 1000)
+
+@pytest.mark.parametrize("rule, error", [
+    ({"type": "deny_terms"}, "terms_file"),
+    ({"type": "deny_terms", "terms": []}, "no terms"),
+    ({"type": "deny_terms", "terms": ["a"], "whole_words": "yes"}, "whole_words"),
+    ({"type": "deny_terms", "terms_file": "missing.txt"}, "cannot open"),
+])
+def test_invalid_term_rules_fail_closed(rule, error, make_boundary):
+    with pytest.raises(RuntimeError, match=error):
+        make_boundary([rule])
+
+def test_automaton_agrees_with_a_naive_search(make_boundary):
+    rng = random.Random(7)
+    terms = sorted({"".join(rng.choice("abc") for _ in range(rng.randint(1, 6))) for _ in range(40)})
+    boundary = make_boundary([{"id": "t", "type": "deny_terms", "terms": terms, "whole_words": False}])
+    for _ in range(300):
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 30)))
+        # First match by end position, longest first
+        expected = next(((end - len(t)) for end in range(1, len(text) + 1)
+                         for t in sorted(terms, key=len, reverse=True)
+                         if end >= len(t) and text[end - len(t):end] == t), None)
+        assert boundary.precheck(text.upper().encode()) == (expected is None), text
+        if expected is not None:
+            assert boundary.last_violation().offset == expected
@@ -0,0 +1,107 @@
+import time
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("invariant_enforcement")
+pytest.importorskip("cryptography")
+
+from ai_execution_boundary.control.errors import ExecutionAborted
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+from ai_execution_boundary.control.orchestrator import Invariant
+from sse_stub import SSEStub
+
+IDENTITY = Identity("u", "r", "o", "test")
+# A stream left open would keep going for ~4s
+SLOW = [f"slow{i} " for i in range(2000)]
+FAST = [f"fast{i} " for i in range(20)]
+
+def _spec(name, stub):
+    return ModelSpec("openai", name, "v1", 42, "greedy",
+                     extra_params={"base_url": stub.base_url, "api_key": "test-key"})
+
+@pytest.fixture
+def policy(tmp_path):
+    path = tmp_path / "deny.json"
+    path.write_text('[{"id": "deny_forbidden", "type": "deny_regex", "pattern": "forbidden"}]')
+    return str(path)
+
+def _hedged(inv, specs, policy, **options):
+    return inv.execute_hedged("prompt", IDENTITY, specs, ContextSpec([]), policy_name=policy, **options)
+
+def test_fast_backup_wins_and_slow_primary_is_cancelled(policy):
+    with SSEStub(SLOW, interval=0.002) as slow, SSEStub(FAST) as fast:
+        inv = Invariant()
+        result = _hedged(inv, [_spec("primary", slow), _spec("backup", fast)], policy, hedge_delay=0.05)
+        assert result["output"] == "".join(FAST)
+        assert slow.finished.wait(timeout=2.0), "losing candidate was not cancelled"
+        assert slow.disconnected is True
+
+        hedge = result["hedge"]
+        assert hedge["winner"] == 1
+        assert [(c["name"], c["status"]) for c in hedge["candidates"]] == [("primary", "CANCELLED"), ("backup", "WON")]
+        assert hedge["candidates"][1]["launched_ms"] >= 50
+
+        # The winner is sealed exactly as if it had run alone
+        single = inv.execute("prompt", IDENTITY, _spec("backup", fast), ContextSpec([]), policy_name=policy)
+        assert result["proof"] == single["proof"]
+        assert result["graph"].model.name == "backup"
+        receipt = inv.build_receipt(result)
+        assert receipt["result"]["hedge"] == hedge
+
+    # The launched-candidates record is signed
+    from ai_execution_boundary.control.orchestrator import hedge_digest
+    sig = receipt["integrity"]["signatures"][0]
+    assert sig["signed_field"] == "meta.proof_id|sha256(result.hedge)"
+    message = f"{result['proof']}|{hedge_digest(receipt['result']['hedge'])}".encode()
+    inv.public_key.verify(bytes.fromhex(sig["signature"]), message)
+
+def test_primary_finishing_within_the_delay_launches_nothing_else(policy):
+    with SSEStub(FAST) as fast, SSEStub(SLOW) as never:
+        result = _hedged(Invariant(), [_spec("primary", fast), _spec("backup", never)], policy, hedge_delay=1.0)
+    assert result["hedge"]["winner"] == 0
+    assert [c["name"] for c in result["hedge"]["candidates"]] == ["primary"]
+    assert not never.writes
+
+def test_refused_candidate_is_replaced_at_once(policy):
+    with SSEStub(["a ", "forbidden ", "b "]) as bad, SSEStub(FAST) as good:
+        result = _hedged(Invariant(), [_spec("primary", bad), _spec("backup", good)], policy, hedge_delay=5.0)
+    assert result["output"] == "".join(FAST)
+    primary, backup = result["hedge"]["candidates"]
+    assert primary["status"] == "ABORTED" and primary["violation"]["rule_id"] == "deny_forbidden"
+    assert backup["launched_ms"] < 5000
+
+def test_concurrency_cap_and_all_refused(policy):
+    with SSEStub(FAST, first_token_delay=0.2) as slow, SSEStub(FAST) as fast:
+        # One in flight: the backup only starts if the primary fails
+        result = _hedged(Invariant(), [_spec("primary", slow), _spec("backup", fast)], policy,
+                         hedge_delay=0.0, max_concurrent=1)
+    assert result["hedge"]["winner"] == 0 and len(result["hedge"]["candidates"]) == 1
+
+    with SSEStub(["forbidden "]) as bad:
+        with pytest.raises(ExecutionAborted) as e:
+            _hedged(Invariant(), [_spec("a", bad), _spec("b", bad)], policy, hedge_delay=0.0)
+    assert e.value.graph.model.name == "a"
+
+def test_silent_loser_does_not_hold_up_the_winner(policy):
+    with SSEStub(FAST, first_token_delay=1.5) as silent, SSEStub(FAST) as fast:
+        t0 = time.monotonic()
+        result = _hedged(Invariant(), [_spec("primary", silent), _spec("backup", fast)], policy, hedge_delay=0.05)
+        assert time.monotonic() - t0 < 1.0
+    assert result["hedge"]["winner"] == 1
+
+def test_candidate_losing_during_admission_never_opens_its_stream(policy, monkeypatch):
+    inv = Invariant()
+    prepare = inv._prepare
+
+    def slow_backup_admission(boundary, input_payload, identity, model_spec, *args):
+        graph = prepare(boundary, input_payload, identity, model_spec, *args)
+        if model_spec.name == "backup":
+            time.sleep(0.3)  # the primary wins meanwhile
+        return graph
+    monkeypatch.setattr(inv, "_prepare", slow_backup_admission)
+
+    with SSEStub(FAST, first_token_delay=0.05) as primary, SSEStub(FAST) as backup:
+        result = _hedged(inv, [_spec("primary", primary), _spec("backup", backup)], policy, hedge_delay=0.0)
+        assert result["hedge"]["winner"] == 0
+        time.sleep(0.5)
+        assert not backup.writes
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import shutil
+import struct
+import pytest
+
+enforcement = pytest.importorskip("invariant_enforcement")
+
+from ai_execution_boundary.control.compile_policy import compile_policy
+
+HEADER_BYTES = 96
+
+RULES = [
+    {"id": "secrets", "pattern": "api[_-]?key"},
+    {"id": "short", "type": "max_output_bytes", "limit": 64},
+    {"id": "names", "type": "deny_terms", "terms_file": "names.txt", "terms": ["Acme Corp"]},
+    {"id": "codes", "type": "deny_terms", "terms": ["zx"], "whole_words": False},
+]
+
+def _policy(tmp_path, rules=RULES):
+    (tmp_path / "names.txt").write_text("# people\nJane Doe\nBob Jones\n")
+    policy = tmp_path / "policy.json"
+    policy.write_text(json.dumps(rules))
+    return policy
+
+def _run(boundary, prompt, tokens):
+    if not boundary.precheck(prompt):
+        v = boundary.last_violation()
+        return ("precheck", v.rule_id, v.offset)
+    boundary.start(prompt)
+    for token in tokens:
+        if not boundary.step(token):
+            v = boundary.last_violation()
+            return ("stream", v.rule_id, v.offset)
+    return ("ok", boundary.get_output())
+
+def test_artifact_decides_like_the_policy_file(tmp_path, make_boundary):
+    policy = _policy(tmp_path)
+    artifact = tmp_path / "policy.ipol"
+    digest = compile_policy(str(policy), str(artifact))
+    assert digest == hashlib.sha256(artifact.read_bytes()[HEADER_BYTES:]).hexdigest()
+
+    from_json, from_artifact = make_boundary(policy), make_boundary(artifact)
+    cases = [
+        (b"hello", [b"fine ", b"answer"]),
+        (b"my API-KEY please", []),
+        (b"call jane doe", []),
+        (b"ok", [b"ask Bob ", b"Jones"]),
+        (b"ok", [b"acme", b" corp"]),
+        (b"ok", [b"fizzy"]),
+        (b"ok", [b"x" * 40, b"y" * 40]),
+        (b"ok", [b"Bob Jonesy"]),
+    ]
+    for prompt, tokens in cases:
+        assert _run(from_artifact, prompt, tokens) == _run(from_json, prompt, tokens)
+    assert [(r.rule_id, r.type) for r in from_artifact.rule_profile()] == \
+        [(r.rule_id, r.type) for r in from_json.rule_profile()]
+
+def test_proof_names_the_artifact_by_digest_not_path(tmp_path, make_boundary):
+    policy = _policy(tmp_path)
+    digest = compile_policy(str(policy), str(tmp_path / "policy.ipol"))
+    (tmp_path / "deployed").mkdir()
+    copy = tmp_path / "deployed" / "renamed.ipol"
+    shutil.copy(tmp_path / "policy.ipol", copy)
+
+    def proof(path):
+        boundary = make_boundary(path)
+        boundary.start(b"prompt")
+        boundary.step(b"answer")
+        return boundary.seal()
+
+    assert proof(tmp_path / "policy.ipol") == proof(copy)
+    assert proof(copy) != proof(policy)
+
+    # Same digest as recompiling: the artifact is deterministic
+    assert compile_policy(str(policy), str(tmp_path / "again.ipol")) == digest
+
+@pytest.mark.parametrize("offset, value, error", [
+    (HEADER_BYTES + 40, None, "checksum mismatch"),
+    (8, struct.pack("<I", 99), "version 99"),
+    (0, b"JUNK", "Not a policy artifact"),
+])
+def test_damaged_artifacts_fail_closed(tmp_path, offset, value, error):
+    artifact = tmp_path / "policy.ipol"
+    compile_policy(str(_policy(tmp_path)), str(artifact))
+    data = bytearray(artifact.read_bytes())
+    if value is None:
+        data[offset] ^= 0xFF
+    else:
+        data[offset:offset + len(value)] = value
+    artifact.write_bytes(bytes(data))
+
+    boundary = enforcement.ExecutionBoundary()
+    with pytest.raises(RuntimeError, match=error):
+        boundary.load_policy(str(artifact))
+    with pytest.raises(RuntimeError, match="No policy loaded"):
+        boundary.precheck(b"hello")
+
+    artifact.write_bytes(bytes(data[:HEADER_BYTES + 10]))
+    with pytest.raises(RuntimeError):
+        boundary.load_policy(str(artifact))
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/maps"), reason="needs /proc")
+def test_artifact_is_mapped_and_recompiling_keeps_running_boundaries(tmp_path, make_boundary):
+    policy = _policy(tmp_path)
+    artifact = tmp_path / "policy.ipol"
+    compile_policy(str(policy))  # default output: next to the policy
+    assert artifact.exists()
+    old = make_boundary(artifact)
+    with open("/proc/self/maps") as f:
+        assert str(artifact) in f.read()
+
+    policy.write_text(json.dumps([{"id": "names", "type": "deny_terms", "terms": ["carol"]}]))
+    compile_policy(str(policy))
+    assert not old.precheck(b"jane doe")  # still the artifact it mapped
+    old.load_policy(str(artifact))
+    assert old.alloc_stats().policy_cache_hits == 0
+    assert old.precheck(b"jane doe") and not old.precheck(b"Carol")
+
+@pytest.mark.parametrize("engine", ["native", "python"])
+def test_crafted_automaton_is_refused(tmp_path, engine):
+    # Terms "ab" and "b": states root, a, b, ab with first_child 1,3,4,4,4
+    # and fail 0,0,0,2. Point fail[b] at "a", which is not shallower, and
+    # re-seal the checksum so only the automaton checks stand in the way.
+    policy = tmp_path / "policy.json"
+    policy.write_text(json.dumps([{"id": "t", "type": "deny_terms", "terms": ["ab", "b"]}]))
+    artifact = tmp_path / "policy.ipol"
+    compile_policy(str(policy), str(artifact))
+    data = bytearray(artifact.read_bytes())
+    arrays = struct.pack("<5I", 1, 3, 4, 4, 4) + struct.pack("<4I", 0, 0, 0, 2)
+    at = data.index(arrays, HEADER_BYTES) + 20 + 8
+    data[at:at + 4] = struct.pack("<I", 1)
+    data[24:88] = hashlib.sha256(bytes(data[HEADER_BYTES:])).hexdigest().encode()
+    artifact.write_bytes(bytes(data))
+
+    if engine == "native":
+        boundary = enforcement.ExecutionBoundary()
+    else:
+        from ai_execution_boundary.enforcement import python_engine
+        boundary = python_engine.ExecutionBoundary()
+    with pytest.raises(RuntimeError, match="automaton is corrupt"):
+        boundary.load_policy(str(artifact))
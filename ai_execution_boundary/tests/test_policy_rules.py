@@ -0,0 +1,107 @@
+import json
+import pytest
+
+enforcement = pytest.importorskip("invariant_enforcement")
+
+def test_rule_ids_and_json_escapes_are_honoured(make_boundary, violation):
+    # \u00e9 must match the UTF-8 bytes of "é"; the old parser kept it verbatim
+    boundary = make_boundary(r'{"rules": [{"id": "no_cafe", "pattern": "caf\u00e9\\s+noir"}]}')
+    assert not boundary.precheck("un café noir".encode())
+    assert violation(boundary) == ("no_cafe", "deny_regex", "precheck", 3)
+    assert boundary.precheck(b"cafeteria")
+    assert boundary.last_violation() is None
+
+@pytest.mark.parametrize("rules, error", [
+    ('[{"id": "x", "type": "deny_everything"}]', "unknown type"),
+    ('[{"id": "x", "type": "max_tokens"}]', "limit"),
+    ('[{"id": "x", "type": "max_tokens", "limit": -1}]', "limit"),
+    ('[{"id": "x", "type": "allow_literals", "values": []}]', "values"),
+    ('[{"id": "x", "pattern": "a",}]', "Invalid JSON"),
+])
+def test_invalid_policies_fail_closed(tmp_path, rules, error, make_boundary):
+    with pytest.raises(RuntimeError, match=error):
+        make_boundary(rules)
+
+    # Nothing usable is left loaded
+    boundary = enforcement.ExecutionBoundary()
+    policy = tmp_path / "policy.json"
+    with pytest.raises(RuntimeError):
+        boundary.load_policy(str(policy))
+    boundary.load_model(enforcement.ModelSpec())
+    with pytest.raises(RuntimeError, match="No policy loaded"):
+        boundary.precheck(b"prompt")
+
+def test_output_and_token_caps(make_boundary, violation):
+    boundary = make_boundary([{"id": "cap_bytes", "type": "max_output_bytes", "limit": 10},
+                              {"id": "cap_tokens", "type": "max_tokens", "limit": 3}])
+    boundary.start(b"prompt")
+    assert boundary.step(b"12345") and boundary.step(b"67890")
+    assert not boundary.step(b"!")
+    assert violation(boundary) == ("cap_bytes", "max_output_bytes", "stream", 10)
+
+    boundary.start(b"prompt")
+    assert all(boundary.step(b"a") for _ in range(3))
+    assert not boundary.step(b"a")
+    assert violation(boundary) == ("cap_tokens", "max_tokens", "stream", 3)
+
+def test_token_rate_allows_bursts_then_refuses(make_boundary, violation):
+    boundary = make_boundary([{"id": "rate", "type": "max_token_rate", "limit": 1, "burst": 3}])
+    boundary.start(b"prompt")
+    assert all(boundary.step(b"t") for _ in range(3))
+    assert not boundary.step(b"t")
+    assert violation(boundary)[:3] == ("rate", "max_token_rate", "stream")
+
+def test_allow_literals_checks_prefix_per_token_and_whole_output_at_finish(make_boundary, violation):
+    rules = [{"id": "verdict", "type": "allow_literals", "values": ["yes", "no", "not sure"]}]
+    boundary = make_boundary(rules)
+
+    boundary.start(b"prompt")
+    assert boundary.step(b"no") and boundary.step(b"t s") and boundary.step(b"ure")
+    assert boundary.finish()
+
+    # A prefix of an allowed value streams fine but is refused at the end
+    boundary.start(b"prompt")
+    assert boundary.step(b"no") and boundary.step(b"t")
+    assert not boundary.finish()
+    assert violation(boundary) == ("verdict", "allow_literals", "finish", 3)
+
+    # Leaving the allow-list aborts immediately
+    boundary.start(b"prompt")
+    assert boundary.step(b"y")
+    assert not boundary.step(b"ep")
+    assert violation(boundary) == ("verdict", "allow_literals", "stream", 1)
+
+@pytest.mark.parametrize("engine", ["native", "python"])
+def test_stream_calls_before_start_are_refused(tmp_path, engine, make_boundary):
+    rules = [{"id": "cap", "type": "max_output_bytes", "limit": 8},
+             {"id": "verdict", "type": "allow_literals", "values": ["yes"]},
+             {"id": "rate", "type": "max_token_rate", "limit": 1, "burst": 3}]
+    boundary = make_boundary(rules, engine)
+
+    # No per-rule stream state yet: refuse instead of reading past it
+    with pytest.raises(RuntimeError, match="Execution not started"):
+        boundary.step(b"yes")
+    with pytest.raises(RuntimeError, match="Execution not started"):
+        boundary.finish()
+
+    boundary.start(b"prompt")
+    assert boundary.step(b"yes") and boundary.finish()
+    boundary.reset()
+    boundary.load_policy(str(tmp_path / "policy.json"))
+    with pytest.raises(RuntimeError, match="Execution not started"):
+        boundary.step(b"yes")
+
+def test_orchestrator_reports_violated_rule(tmp_path):
+    pytest.importorskip("cryptography")
+    from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+    from ai_execution_boundary.control.errors import ExecutionAborted
+    from ai_execution_boundary.control.orchestrator import Invariant
+
+    policy = tmp_path / "policy.json"
+    policy.write_text(json.dumps([{"id": "short_answers", "type": "max_output_bytes", "limit": 8}]))
+    with pytest.raises(ExecutionAborted, match="short_answers") as err:
+        Invariant(pool_size=1).execute("Explain", Identity("u", "r", "o", "test"),
+                                       ModelSpec("mock", "m", "v1", 42, "greedy"), ContextSpec([]),
+                                       policy_name=str(policy))
+    assert err.value.violation == {"rule_id": "short_answers", "type": "max_output_bytes",
+                                   "stage": "stream", "offset": 8}
@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+import pytest
+
+enforcement = pytest.importorskip("invariant_enforcement")
+pytest.importorskip("cryptography")
+
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+from ai_execution_boundary.control.orchestrator import Invariant
+from ai_execution_boundary.control.pool import BoundaryPool
+
+IDENTITY = Identity("u", "r", "o", "test")
+MODEL = ModelSpec("mock", "pool-model", "v1", 42, "greedy")
+
+def test_reset_clears_session_but_keeps_compiled_policy(tmp_path):
+    policy = tmp_path / "deny.json"
+    policy.write_text('[{"id": "deny_x", "type": "deny_regex", "pattern": "forbidden"}]')
+
+    boundary = enforcement.ExecutionBoundary()
+    boundary.load_policy(str(policy))
+    boundary.load_model(enforcement.ModelSpec())
+    boundary.start(b"prompt")
+    boundary.step(b"hello")
+    boundary.reset()
+
+    # Session state is gone
+    with pytest.raises(RuntimeError, match="No policy loaded"):
+        boundary.precheck(b"prompt")
+    assert boundary.copy_stats().total == 0
+
+    # The compiled policy is reused, not parsed again
+    boundary.load_policy(str(policy))
+    stats = boundary.alloc_stats()
+    assert stats.policy_compiles == 1
+    assert stats.policy_cache_hits == 1
+    boundary.load_model(enforcement.ModelSpec())
+    assert not boundary.precheck(b"a forbidden prompt")
+
+    # Editing the file invalidates the cached compilation
+    policy.write_text('[{"id": "deny_y", "type": "deny_regex", "pattern": "other"}]')
+    os.utime(policy, ns=(0, 0))
+    boundary.load_policy(str(policy))
+    assert boundary.alloc_stats().policy_compiles == 2
+    assert boundary.precheck(b"a forbidden prompt")
+
+def test_warm_executions_allocate_nothing():
+    inv = Invariant(pool_size=1)
+    constructed = enforcement.ExecutionBoundary().alloc_stats().boundaries_constructed
+
+    first = inv.execute("Explain", IDENTITY, MODEL, ContextSpec([]), policy_name="reality_only")
+    second = inv.execute("Explain", IDENTITY, MODEL, ContextSpec([]), policy_name="reality_only")
+
+    assert first["allocations"] > 0
+    assert second["allocations"] == 0
+    assert second["proof"] == first["proof"]
+    # Both requests ran on the same pooled kernel
+    assert enforcement.ExecutionBoundary().alloc_stats().boundaries_constructed == constructed + 1
+
+def test_pool_is_bounded():
+    pool = BoundaryPool(enforcement.ExecutionBoundary, max_size=2, prewarm=0)
+    assert pool.stats()["size"] == 0
+
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with pool.acquire():
+            held.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    held.wait()
+    with pool.acquire():
+        assert pool.stats()["size"] == 2
+        with pytest.raises(TimeoutError):
+            with pool.acquire(timeout=0.05):
+                pass
+    release.set()
+    holder.join()
+    assert pool.stats() == {"size": 2, "idle": 2, "max_size": 2}
+
+def test_concurrent_checkouts_never_grow_past_max_size():
+    created = []
+
+    def slow_factory():
+        created.append(1)
+        time.sleep(0.02)  # widen the window between the size check and creation
+        return enforcement.ExecutionBoundary()
+
+    pool = BoundaryPool(slow_factory, max_size=2, prewarm=0)
+    barrier = threading.Barrier(8)
+
+    def use():
+        barrier.wait()
+        with pool.acquire():
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=use) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(created) == 2 and pool.stats()["size"] == 2
+
+class _BadReset:
+    def __init__(self, fail):
+        self.fail = fail
+
+    def reset(self):
+        if self.fail:
+            raise RuntimeError("reset failed")
+
+def test_failed_reset_wakes_a_waiting_checkout():
+    pool = BoundaryPool(lambda: _BadReset(False), max_size=1)
+    waiting = []
+    with pool.acquire() as first:
+        first.fail = True  # this kernel will not reset cleanly
+        waiter = threading.Thread(target=lambda: waiting.append(pool._checkout(None)))
+        waiter.start()
+        time.sleep(0.05)  # let it block on the exhausted pool
+    waiter.join(timeout=2.0)
+    assert not waiter.is_alive(), "waiter hung after the failed reset"
+    assert waiting and waiting[0] is not first
@@ -0,0 +1,71 @@
+import json
+import pytest
+
+enforcement = pytest.importorskip("invariant_enforcement")
+
+from ai_execution_boundary.control.profile_policy import profile_policy, format_profile, iter_corpus
+
+def test_rule_counters(tmp_path, make_boundary):
+    policy = tmp_path / "p.json"
+    policy.write_text(json.dumps([
+        {"id": "deny_secret", "pattern": "secret"},
+        {"id": "cap", "type": "max_output_bytes", "limit": 12},
+    ]))
+    boundary = make_boundary(policy)
+    boundary.start("hello")
+    assert [p.evaluations for p in boundary.rule_profile()] == [0, 0]  # off by default
+
+    boundary.set_profiling(True)
+    boundary.start("hello")  # precheck: one deny_regex evaluation over 5 bytes
+    assert boundary.step(b"abcd")
+    assert not boundary.step(b"secret")
+    deny, cap = boundary.rule_profile()
+    assert (deny.rule_id, deny.type) == ("deny_secret", "deny_regex")
+    assert (deny.evaluations, deny.matches, deny.bytes_scanned) == (3, 1, 5 + 4 + 10)
+    assert (cap.evaluations, cap.matches, cap.bytes_scanned) == (2, 0, 0)
+    assert deny.total_ns >= deny.max_ns > 0
+
+    # Counters accumulate across executions of the same policy...
+    boundary.start("again")
+    assert boundary.rule_profile()[0].evaluations == 4
+    # ...and reset() turns profiling off
+    boundary.reset()
+    boundary.load_policy(str(policy))
+    assert boundary.rule_profile()[0].evaluations == 0
+
+def test_profile_flags_superlinear_patterns(tmp_path):
+    policy = tmp_path / "p.json"
+    policy.write_text(json.dumps([
+        {"id": "quadratic", "pattern": "a.*b"},
+        {"id": "literal", "pattern": "zebra"},
+        {"id": "cap", "type": "max_output_bytes", "limit": 100000},
+    ]))
+    corpus = tmp_path / "out.txt"
+    corpus.write_text("a" * 2500)
+    receipt = tmp_path / "r.json"
+    receipt.write_text(json.dumps({"graph": {"input_payload": "q"},
+                                   "result": {"output": "no zebra here"}}))
+
+    report = profile_policy(str(policy), iter_corpus([str(corpus), str(receipt)]),
+                            token_bytes=2500, probe_sizes=(256, 512, 1024, 2048))
+    assert (report["executions"], report["refused"]) == (2, 1)
+    rows = {r["rule"]: r for r in report["rules"]}
+    assert report["rules"][0]["rule"] == "quadratic"  # ranked by total time
+    assert rows["quadratic"]["superlinear"] and rows["quadratic"]["growth"] > 1.5
+    assert not rows["literal"]["superlinear"]
+    assert rows["literal"]["matches"] == 1
+    assert rows["cap"]["growth"] is None
+    assert "SUPERLINEAR" in format_profile(report["rules"])
+
+def test_probe_scans_past_matches(tmp_path):
+    # Every "a" starts a match that runs to the last "b" of the line: one
+    # search is linear, finding all of them is quadratic
+    policy = tmp_path / "p.json"
+    policy.write_text(json.dumps([{"id": "greedy", "pattern": "a.*b"}]))
+    corpus = tmp_path / "out.txt"
+    corpus.write_text("ab" * 1500)
+
+    report = profile_policy(str(policy), iter_corpus([str(corpus)]), token_bytes=4096,
+                            probe_sizes=(256, 512, 1024, 2048))
+    row = report["rules"][0]
+    assert row["superlinear"] and row["growth"] > 1.5
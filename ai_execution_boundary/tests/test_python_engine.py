@@ -0,0 +1,197 @@
+import json
+import random
+import pytest
+
+from ai_execution_boundary.enforcement import python_engine
+
+# Conformance corpus: the Python engine must decide, report and seal exactly
+# like the C++ kernel. Tests comparing the two skip without the extension.
+
+def _native():
+    return pytest.importorskip("invariant_enforcement")
+
+def _write(tmp_path, rules, name="policy.json"):
+    (tmp_path / "names.txt").write_text("# customers\nJane Doe\nBob Jones\n")
+    policy = tmp_path / name
+    policy.write_text(json.dumps(rules))
+    return str(policy)
+
+def _run(engine, policy, prompt, tokens, seed=7):
+    """Everything observable about one execution, comparable across engines."""
+    boundary = engine.ExecutionBoundary()
+    try:
+        boundary.load_policy(policy)
+    except RuntimeError as e:
+        return ("load failed", str(e).split(":")[0])
+    model = engine.ModelSpec()
+    model.name, model.seed = "m", seed
+    boundary.load_model(model)
+    admitted = boundary.precheck(prompt)
+    steps, finished = [], None
+    if admitted:
+        boundary.start(prompt)
+        for token in tokens:
+            steps.append(boundary.step(token))
+            if not steps[-1]:
+                break
+        else:
+            finished = boundary.finish()
+    v = boundary.last_violation()
+    return (admitted, steps, finished, v and (v.rule_id, v.type, v.stage, v.offset),
+            bytes(boundary.output_view()), boundary.seal())
+
+POLICY = [
+    {"id": "hypotheticals", "pattern": r"\b(what\s+if|imagine\s+if|suppose\s+that)\b"},
+    {"id": "keys", "pattern": "api[_-]?key|sk-[a-z0-9]{8}"},
+    {"id": "names", "type": "deny_terms", "terms_file": "names.txt", "terms": ["Acme Corp"]},
+    {"id": "codes", "type": "deny_terms", "terms": ["zx"], "whole_words": False},
+    {"id": "cap", "type": "max_output_bytes", "limit": 64},
+    {"id": "tokens", "type": "max_tokens", "limit": 12},
+]
+
+CASES = [
+    (b"hello", [b"fine ", b"answer"]),
+    (b"What   IF we tried", []),
+    (b"ILLEGAL", []),
+    (b"my API-KEY please", []),
+    (b"ok", [b"here: sk-", b"ab12cd", b"34"]),
+    (b"ok", [b"so what", b" if", b" it"]),
+    (b"call jane doe", []),
+    (b"ok", [b"ask Bob ", b"Jones"]),
+    (b"ok", [b"Bob Jonesy", b"!"]),
+    (b"ok", [b"acme", b" corp"]),
+    (b"ok", [b"fizzy"]),
+    (b"ok", [b"x" * 40, b"y" * 40]),
+    (b"ok", [b"t"] * 13),
+    ("café été", ["é", " ok"]),
+]
+
+@pytest.mark.parametrize("prompt, tokens", CASES)
+def test_decisions_and_proofs_match_the_kernel(tmp_path, prompt, tokens):
+    native = _native()
+    policy = _write(tmp_path, POLICY)
+    assert _run(python_engine, policy, prompt, tokens) == _run(native, policy, prompt, tokens)
+
+def test_allow_literals_and_artifacts_match_the_kernel(tmp_path):
+    native = _native()
+    policy = _write(tmp_path, [{"id": "verdict", "type": "allow_literals", "values": ["yes", "no", "not sure"]}] + POLICY)
+    artifact = str(tmp_path / "policy.ipol")
+    native.compile_policy(policy, artifact)
+    for prompt, tokens in [(b"q", [b"no"]), (b"q", [b"no", b"t"]), (b"q", [b"not", b" sure"]), (b"q", [b"maybe"]),
+                           (b"q", []), (b"jane doe?", [b"yes"])]:
+        for path in (policy, artifact):
+            assert _run(python_engine, path, prompt, tokens) == _run(native, path, prompt, tokens)
+
+# The kernel's regex dialect (libstdc++ ECMAScript, case-insensitive over
+# bytes), including patterns it rejects and then matches as literal text
+DIALECT = [
+    (r"a.c", [b"abc", b"a\nc", b"a\rc", b"a\xffc"]),
+    (r"end$", [b"the end", b"the end\n", b"endless"]),
+    (r"\bword\b", [b"a word.", b"swordfish", b"word\xc3\xa9"]),
+    (r"\B", [b"", b"a", b" "]),
+    (r"[[:punct:]]+", [b"a_b", b"x!"]),
+    (r"[[:lower:]]{3}", [b"ABC", b"a1b"]),
+    (r"[[.hyphen.][=space=]]x", [b"-x", b" x", b"ax"]),
+    (r"[é-a]", [b"\xe9", b"\x01", b"b"]),
+    (r"\cJ\x41B", [b"JAB", b"jab", b"\nAB"]),
+    (r"a**b", [b"aaab", b"b"]),
+    (r"(a)\1", [b"aA", b"ab"]),
+    (r"\00", [b"\x000", b"\x00\x00"]),
+    (r"[]a]", [b"a]", b"a"]),
+    (r"[^]x", [b"\nx", b"x"]),
+    (r"(?<=a)b", [b"ab", b"(?<=a)b"]),
+    (r"a{,2}", [b"a{,2}", b"aa"]),
+    (r"[z-a]", [b"[z-a]", b"m"]),
+    (r"[[:word:]]", [b"w", b"x[[:word:]]"]),
+    (r"\8", [b"\\8", b"8"]),
+]
+
+@pytest.mark.parametrize("pattern, texts", DIALECT)
+def test_regex_dialect_matches_the_kernel(tmp_path, pattern, texts):
+    native = _native()
+    policy = _write(tmp_path, [{"id": "r", "pattern": pattern}])
+    for text in texts:
+        assert _run(python_engine, policy, text, [text]) == _run(native, policy, text, [text])
+
+def test_random_policies_match_the_kernel(tmp_path):
+    native = _native()
+    atoms = ["a", "b", "A", r"\d", r"\w", r"\s", r"\b", r"\B", ".", "[a-c]", "[^a]", "[[:alpha:]]", "(ab|c)",
+             "(?:a|bc)", "$", "^", r"\.", "(?=a)", "(?!b)", r"\x41", "[]", r"\1", "é", "(?<=a)", "a{,2}", "["]
+    quantifiers = ["", "", "*", "+", "?", "{2}", "{1,3}", "*?", "**"]
+    rng = random.Random(1234)
+    for i in range(150):
+        rules = [{"id": f"r{j}", "pattern": "".join(rng.choice(atoms) + rng.choice(quantifiers)
+                                                     for _ in range(rng.randint(1, 4)))}
+                 for j in range(rng.randint(1, 3))]
+        if rng.random() < 0.5:
+            rules.insert(rng.randint(0, len(rules)), {"id": "t", "type": "deny_terms", "terms": ["ab", "c a"],
+                                                      "whole_words": rng.random() < 0.5})
+        policy = _write(tmp_path, rules, f"p{i}.json")
+        text = lambda n: bytes(rng.choice(b"abcAB x_.\n1\xc3\xa9") for _ in range(n))
+        prompt, tokens = text(rng.randint(0, 6)), [text(rng.randint(1, 4)) for _ in range(rng.randint(1, 12))]
+        assert _run(python_engine, policy, prompt, tokens) == _run(native, policy, prompt, tokens), rules
+
+def test_context_scan_matches_the_kernel(tmp_path):
+    native = _native()
+    policy = _write(tmp_path, POLICY + [{"id": "tail", "pattern": "_$"}])
+    context = tmp_path / "ctx.txt"
+    context.write_bytes(b"notes " * 50 + b"jane doe said what  if_" + b" filler" * 30 + b"zx sk-0123abcd_")
+
+    def scan(engine, chunk, overlap):
+        boundary = engine.ExecutionBoundary()
+        boundary.load_policy(policy)
+        source = engine.ContextSource()
+        source.identifier = str(context)
+        return [(v.rule_id, v.offset) for v in boundary.scan_context(source, chunk, overlap)]
+
+    for chunk, overlap in [(4 << 20, 64 << 10), (7, 0), (16, 3), (64, 8)]:
+        assert scan(python_engine, chunk, overlap) == scan(native, chunk, overlap)
+    assert python_engine.crypto_hash_file(str(context)) == native.crypto_hash_file(str(context))
+
+def test_proof_format_without_the_kernel(tmp_path):
+    boundary = python_engine.ExecutionBoundary()
+    boundary.load_policy("x")
+    model = python_engine.ModelSpec()
+    model.name, model.seed = "m", 7
+    boundary.load_model(model)
+    boundary.start(b"ab")
+    assert boundary.step(b"cd")
+    # V0 hash of "POLICY:x|MODEL:m:7|INPUT:ab|OUTPUT:cd|", length in hex
+    assert boundary.seal() == "inv_v0_d614d557733070ff26"
+
+    policy = _write(tmp_path, POLICY)
+    boundary.load_policy(policy)
+    assert boundary.precheck(b"see Jane  Doe")  # two spaces: not the term
+    assert not boundary.precheck(b"see JANE DOE")
+    assert boundary.last_violation().offset == 4
+    with pytest.raises(RuntimeError, match="unknown type"):
+        boundary.load_policy(_write(tmp_path, [{"id": "x", "type": "deny_everything"}], "bad.json"))
+    with pytest.raises(RuntimeError, match="No policy loaded"):
+        boundary.precheck(b"prompt")
+
+def test_orchestrator_runs_on_the_python_engine(tmp_path, monkeypatch):
+    native = _native()
+    pytest.importorskip("cryptography")
+    from ai_execution_boundary.control import orchestrator
+    from ai_execution_boundary.control.errors import ExecutionAborted
+    from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ContextSource
+
+    policy = _write(tmp_path, [{"id": "no_proceeding", "type": "deny_terms", "terms": ["proceeding"]}])
+    context = tmp_path / "notes.txt"
+    context.write_text("meeting notes")
+
+    def execute(engine, seed):
+        monkeypatch.setattr(orchestrator, "enforcement", engine)
+        inv = orchestrator.Invariant(pool_size=1)
+        try:
+            result = inv.execute("Explain", Identity("u", "r", "o", "test"), ModelSpec("mock", "m", "v1", seed, "greedy"),
+                                 ContextSpec([ContextSource("file", "low", str(context))]), policy_name=policy)
+        except ExecutionAborted as e:
+            return "ABORTED", e.violation, e.graph.to_json()
+        return result["status"], result["output"], result["proof"], result["graph"].to_json()
+
+    completed = execute(python_engine, 0)
+    assert completed[0] == "COMPLETED" and completed == execute(native, 0)
+    # Seed 2 streams "Execution is proceeding normally."
+    aborted = execute(python_engine, 2)
+    assert aborted[0] == "ABORTED" and aborted == execute(native, 2)
@@ -0,0 +1,167 @@
+import json
+import subprocess
+import sys
+import threading
+import pytest
+
+from ai_execution_boundary.control.receipts import ReceiptWriter
+
+class _Echo:
+    """Stands in for Invariant: the receipt is the result plus its timestamp."""
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.building = threading.Event()  # the writer thread has taken a result
+
+    def build_receipt(self, result, timestamp=None):
+        self.building.set()
+        if self.gate is not None:
+            self.gate.wait()
+        return {"n": result["n"], "timestamp": timestamp}
+
+def _lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_group_commit_keeps_order_and_flushes_on_close(tmp_path):
+    path = str(tmp_path / "receipts.jsonl")
+    with ReceiptWriter(_Echo(), path, max_batch=64) as writer:
+        futures = [writer.submit({"n": i}) for i in range(500)]
+        writer.flush()
+        assert all(f.done() for f in futures)
+        futures += [writer.submit({"n": i}) for i in range(500, 600)]
+    assert [r["n"] for r in _lines(path)] == list(range(600))
+    assert futures[-1].result()["n"] == 599
+    stats = writer.stats()
+    assert stats["written"] == 600 and stats["largest_batch"] <= 64
+    assert stats["fsyncs"] <= stats["batches"] + 1
+
+def test_backpressure_when_disk_lags(tmp_path):
+    gate = threading.Event()
+    echo = _Echo(gate)
+    writer = ReceiptWriter(echo, str(tmp_path / "r.jsonl"), max_queue=2, max_batch=1)
+    writer.submit({"n": 0})  # taken by the (blocked) writer thread
+    assert echo.building.wait(timeout=2)
+    writer.submit({"n": 1})
+    writer.submit({"n": 2})
+    with pytest.raises(TimeoutError, match="disk is lagging"):
+        writer.submit({"n": 3}, timeout=0.05)
+    gate.set()
+    writer.close()
+    assert [r["n"] for r in _lines(writer.path)] == [0, 1, 2]
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.submit({"n": 4})
+
+def test_signed_receipts_from_invariant(tmp_path):
+    pytest.importorskip("invariant_enforcement")
+    pytest.importorskip("cryptography")
+    from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+    from ai_execution_boundary.control.orchestrator import Invariant
+
+    inv = Invariant()
+    result = inv.execute("Explain", Identity("u", "r", "o", "test"),
+                         ModelSpec("mock", "m", "v1", 1, "greedy"), ContextSpec([]))
+    with ReceiptWriter(inv, str(tmp_path / "r.jsonl"), fsync="interval") as writer:
+        receipt = writer.submit(result).result()
+    assert _lines(writer.path) == [receipt]
+    assert receipt["meta"]["proof_id"] == result["proof"]
+    assert receipt["graph"] == json.loads(result["graph"].to_json())
+
+CRASHING_WRITER = """
+import os, sys, threading
+from ai_execution_boundary.control.receipts import ReceiptWriter
+
+stuck = threading.Event()
+
+class Echo:
+    def build_receipt(self, result, timestamp=None):
+        if result["n"] == 300:
+            stuck.set()
+            threading.Event().wait()  # the writer hangs here until the crash
+        return {"n": result["n"], "pad": "x" * 512}
+
+writer = ReceiptWriter(Echo(), sys.argv[1], fsync="always", max_batch=8)
+acked = [writer.submit({"n": i}) for i in range(100)]
+for f in acked:
+    f.result()
+print("acked", flush=True)
+for i in range(100, 400):
+    writer.submit({"n": i})
+# Die mid-stream, leaving half of a receipt at the end of the log
+stuck.wait()
+with open(sys.argv[1], "ab") as f:
+    f.write(b'{"n": 99999, "pad": "xx')
+os._exit(9)
+"""
+
+def test_acknowledged_receipts_survive_a_crash(tmp_path):
+    path = str(tmp_path / "receipts.jsonl")
+    proc = subprocess.run([sys.executable, "-c", CRASHING_WRITER, path], capture_output=True, text=True)
+    assert proc.returncode == 9 and "acked" in proc.stdout, proc.stderr
+
+    # Reopening truncates the torn tail; every acknowledged receipt is intact
+    with ReceiptWriter(_Echo(), path) as writer:
+        writer.submit({"n": "after-restart"})
+    numbers = [r["n"] for r in _lines(path)]
+    assert numbers[:100] == list(range(100))
+    assert 99999 not in numbers and numbers[-1] == "after-restart"
+    assert numbers[100:-1] == list(range(100, 100 + len(numbers) - 101))
+
+class _FailingFile:
+    """Wraps the log file; write() fails once `fail` is set."""
+    def __init__(self, f):
+        self.f, self.fail = f, False
+
+    def write(self, data):
+        if self.fail:
+            self.f.write(data[:10])  # a partial batch reaches the file
+            raise OSError(28, "No space left on device")
+        return self.f.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.f, name)
+
+def test_write_error_stops_the_writer(tmp_path):
+    gate = threading.Event()
+    echo = _Echo(gate)
+    writer = ReceiptWriter(echo, str(tmp_path / "r.jsonl"), max_batch=1)
+    writer._file = _FailingFile(writer._file)
+    gate.set()
+    writer.submit({"n": 0}).result()
+
+    writer._file.fail = True
+    gate.clear()
+    echo.building.clear()
+    failing = writer.submit({"n": 1})  # taken by the (blocked) writer thread
+    assert echo.building.wait(timeout=2)
+    queued = [writer.submit({"n": i}) for i in range(2, 5)]
+    gate.set()
+    with pytest.raises(OSError):
+        failing.result(timeout=2)
+    for future in queued:
+        with pytest.raises(OSError):
+            future.result(timeout=2)
+    with pytest.raises(RuntimeError, match="No space"):
+        writer.submit({"n": 5})
+    with pytest.raises(RuntimeError, match="No space"):
+        writer.flush()
+    writer.close()
+    # Nothing was appended after the partial batch
+    with open(writer.path, "rb") as f:
+        assert f.read().count(b"\n") == 1
+
+def test_idle_fsync_error_fails_fast(tmp_path, monkeypatch):
+    from ai_execution_boundary.control import receipts
+
+    writer = ReceiptWriter(_Echo(), str(tmp_path / "r.jsonl"), fsync="interval", fsync_interval_s=0.01)
+
+    def broken_fsync(fd):
+        raise OSError(5, "Input/output error")
+    monkeypatch.setattr(receipts.os, "fsync", broken_fsync)
+    writer.submit({"n": 0}).result(timeout=2)  # written; the idle sync then fails
+    writer._thread.join(timeout=2)
+    assert not writer._thread.is_alive()
+    with pytest.raises(RuntimeError, match="Input/output"):
+        writer.flush()
+    with pytest.raises(RuntimeError, match="Input/output"):
+        writer.submit({"n": 1})
+    writer.close()
@@ -0,0 +1,184 @@
+import threading
+import time
+import pytest
+
+pytest.importorskip("invariant_enforcement")
+pytest.importorskip("cryptography")
+
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+from ai_execution_boundary.control.errors import ExecutionRejected
+from ai_execution_boundary.control.orchestrator import Invariant
+from ai_execution_boundary.control.scheduler import Scheduler, percentile
+
+# ~10 ms per execution, spent waiting on the (paced) model
+MODEL = ModelSpec("synthetic", "sched-model", "v1", 1, "greedy", extra_params={
+    "output_bytes": 64, "tokens_per_second": 800, "chunk_distribution": "fixed", "chunk_mean_bytes": 8})
+QUIET = Identity("quiet", "r", "quiet-org", "test")
+
+def _quiet_latencies(scheduler, runs=15):
+    latencies = []
+    for i in range(runs):
+        t0 = time.perf_counter()
+        scheduler.execute(f"quiet {i}", QUIET, MODEL, ContextSpec([]))
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return sorted(latencies)
+
+def test_noisy_tenant_does_not_degrade_quiet_tenant():
+    inv = Invariant(pool_size=4)
+    scheduler = Scheduler(inv, max_concurrency=4, per_org_concurrency=3, per_identity_concurrency=3,
+                          max_queue_per_org=256, max_wait_s=None)
+    solo_p99 = percentile(_quiet_latencies(scheduler), 99)
+
+    stop = threading.Event()
+    def flood(n):
+        noisy = Identity(f"bot{n}", "r", "noisy-org", "test")
+        while not stop.is_set():
+            scheduler.execute("flood", noisy, MODEL, ContextSpec([]))
+    flooders = [threading.Thread(target=flood, args=(n,)) for n in range(12)]
+    for t in flooders:
+        t.start()
+    try:
+        time.sleep(0.1)
+        assert scheduler.metrics()["orgs"]["noisy-org"]["queued"] > 0
+        loaded_p99 = percentile(_quiet_latencies(scheduler), 99)
+    finally:
+        stop.set()
+        for t in flooders:
+            t.join()
+
+    # The quiet org keeps a reserved share: it waits for at most one slot
+    # to free up, never behind the noisy org's backlog.
+    assert loaded_p99 < solo_p99 * 2 + 25
+    metrics = scheduler.metrics()
+    assert metrics["queue_depth"] == 0 and metrics["in_flight"] == 0
+    assert metrics["orgs"]["noisy-org"]["admitted"] > metrics["orgs"]["quiet-org"]["admitted"]
+
+def test_tags_order_orgs_without_a_per_org_reserve():
+    # per_org_concurrency == max_concurrency: the noisy org may hold every
+    # slot, so only the virtual finish tags can put the quiet org first
+    gate = threading.Event()
+    order = []
+
+    class Blocking:
+        def execute(self, input_payload, *args, **kwargs):
+            order.append(input_payload)
+            if input_payload == "noisy 0":
+                gate.wait()
+
+    scheduler = Scheduler(Blocking(), max_concurrency=1, per_org_concurrency=1,
+                          per_identity_concurrency=8, max_wait_s=5)
+    noisy = Identity("bot", "r", "noisy-org", "test")
+    threads = []
+    for i in range(6):
+        threads.append(threading.Thread(target=scheduler.execute, args=(f"noisy {i}", noisy, MODEL, ContextSpec([]))))
+        threads[-1].start()
+        while scheduler.metrics()["queue_depth"] + scheduler.metrics()["in_flight"] < i + 1:
+            time.sleep(0.001)
+    threads.append(threading.Thread(target=scheduler.execute, args=("quiet", QUIET, MODEL, ContextSpec([]))))
+    threads[-1].start()
+    while scheduler.metrics()["queue_depth"] < 6:
+        time.sleep(0.001)
+
+    gate.set()
+    for t in threads:
+        t.join()
+    assert order == ["noisy 0", "quiet"] + [f"noisy {i}" for i in range(1, 6)]
+
+def test_rate_budgets_and_queue_limits_shed_load():
+    gate = threading.Event()
+
+    class Blocking:
+        def execute(self, *args, **kwargs):
+            gate.wait()
+            return {"status": "COMPLETED"}
+
+    scheduler = Scheduler(Blocking(), max_concurrency=1, max_queue_per_org=1, max_wait_s=5,
+                          rate_limits={"limited": (0.001, 3)})
+    limited = Identity("u", "r", "limited", "test")
+    other = Identity("u", "r", "other", "test")
+
+    running = threading.Thread(target=scheduler.execute, args=("a", limited, MODEL, ContextSpec([])))
+    running.start()
+    queued = threading.Thread(target=scheduler.execute, args=("b", limited, MODEL, ContextSpec([])))
+    queued.start()
+    while scheduler.metrics()["queue_depth"] < 1:
+        time.sleep(0.001)
+
+    # A request shed by the full queue is not charged: no budget, no tag
+    with pytest.raises(ExecutionRejected) as err:
+        scheduler.execute("c", limited, MODEL, ContextSpec([]))
+    assert err.value.reason == "queue_full"
+    assert scheduler._tenants["limited"].last_tag == 2.0
+
+    gate.set()
+    for t in (running, queued):
+        t.join()
+    gate.clear()
+    running = threading.Thread(target=scheduler.execute, args=("c", limited, MODEL, ContextSpec([])))
+    running.start()
+    while scheduler.metrics()["in_flight"] < 1:
+        time.sleep(0.001)
+
+    # Burst of 3 is used up
+    with pytest.raises(ExecutionRejected) as err:
+        scheduler.execute("c", limited, MODEL, ContextSpec([]))
+    assert err.value.reason == "rate_limited"
+
+    # The other org has its own budget but the queue slot for it is the last one
+    waiting = threading.Thread(target=scheduler.execute, args=("d", other, MODEL, ContextSpec([])))
+    waiting.start()
+    while scheduler.metrics()["queue_depth"] < 1:
+        time.sleep(0.001)
+    with pytest.raises(ExecutionRejected) as err:
+        scheduler.execute("e", other, MODEL, ContextSpec([]))
+    assert err.value.reason == "queue_full"
+
+    gate.set()
+    for t in (running, waiting):
+        t.join()
+    assert scheduler.metrics()["rejected"] == {"rate_limited": 1, "queue_full": 2}
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 11))
+    assert [percentile(values, p) for p in (0, 10, 50, 55, 99, 100)] == [1, 1, 5, 6, 10, 10]
+    assert percentile(list(range(1, 101)), 7) == 7
+    assert percentile([], 50) != percentile([], 50)  # nan
+
+def test_token_budget_charges_streamed_tokens():
+    class Streaming:
+        def execute(self, input_payload, *args, on_token=None, **kwargs):
+            for _ in range(5):
+                on_token("tok")
+            return {"status": "COMPLETED"}
+
+    scheduler = Scheduler(Streaming(), token_rate_limits={"o": (0.001, 3)})
+    identity = Identity("u", "r", "o", "test")
+    streamed = []
+    scheduler.execute("a", identity, MODEL, ContextSpec([]), on_token=streamed.append)
+    assert streamed == ["tok"] * 5
+
+    # The stream overdrew the budget of 3 tokens
+    with pytest.raises(ExecutionRejected, match="token budget") as err:
+        scheduler.execute("b", identity, MODEL, ContextSpec([]))
+    assert err.value.reason == "rate_limited"
+
+def test_queue_wait_timeout():
+    gate = threading.Event()
+
+    class Blocking:
+        def execute(self, *args, **kwargs):
+            gate.wait()
+
+    scheduler = Scheduler(Blocking(), max_concurrency=1, max_wait_s=0.05)
+    busy = threading.Thread(target=scheduler.execute, args=("a", QUIET, MODEL, ContextSpec([])))
+    busy.start()
+    while scheduler.metrics()["in_flight"] < 1:
+        time.sleep(0.001)
+    with pytest.raises(ExecutionRejected, match="no capacity") as err:
+        scheduler.execute("b", Identity("x", "r", "other", "test"), MODEL, ContextSpec([]))
+    assert err.value.reason == "timeout"
+    assert scheduler.metrics()["queue_depth"] == 0
+    # The request never ran: the org's next one is not pushed back for it
+    assert scheduler._tenants["other"].last_tag == 0.0
+    gate.set()
+    busy.join()
@@ -0,0 +1,110 @@
+import pytest
+
+pytest.importorskip("invariant_enforcement")
+pytest.importorskip("cryptography")
+
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ContextSource
+from ai_execution_boundary.control.errors import ExecutionAborted, ExecutionRejected
+from ai_execution_boundary.control.client import RemoteInvariant
+from ai_execution_boundary.control.service import InvariantService
+from ai_execution_boundary.control.orchestrator import Invariant
+
+IDENTITY = Identity("u", "r", "o", "test")
+MODEL = ModelSpec("mock", "svc-model", "v1", 42, "greedy")
+
+@pytest.fixture
+def remote(tmp_path):
+    service = InvariantService(str(tmp_path / "kernel.sock"), pool_size=2)
+    service.start_background()
+    yield RemoteInvariant(service.socket_path), service
+    service.shutdown()
+
+def test_remote_execution_matches_in_process(remote, tmp_path):
+    client, service = remote
+    ctx = tmp_path / "ctx.txt"
+    ctx.write_text("knowledge")
+    context = ContextSpec([ContextSource("file", "internal", str(ctx))])
+
+    streamed = []
+    result = client.execute("Explain", IDENTITY, MODEL, context, policy_name="reality_only",
+                            on_token=streamed.append, record_timeline=True)
+    local = Invariant().execute("Explain", IDENTITY, MODEL, context, policy_name="reality_only")
+
+    assert "".join(streamed) == result["output"] == local["output"]
+    assert result["proof"] == local["proof"]
+    assert result["graph"].id == local["graph"].id
+    assert isinstance(result["timeline"], bytes)
+
+    # Receipts are signed with the service's node key
+    receipt = client.build_receipt(result)
+    sig = receipt["integrity"]["signatures"][0]
+    assert sig["pub_key"] == service.private_key.public_key().public_bytes_raw().hex()
+
+def test_remote_abort_is_reported(remote, tmp_path):
+    client, _ = remote
+    policy = tmp_path / "deny.json"
+    policy.write_text('[{"id": "deny_normal", "type": "deny_regex", "pattern": "normally"}]')
+    # Seed 42 -> "Execution is proceeding normally."
+    with pytest.raises(ExecutionAborted, match="Mid-Stream") as err:
+        client.execute("Explain", IDENTITY, MODEL, ContextSpec([]), policy_name=str(policy))
+    assert err.value.graph.input_payload == "Explain"
+
+    with pytest.raises(RuntimeError, match="Unsupported provider"):
+        client.execute("Explain", IDENTITY, ModelSpec("nope", "m", "v1", 1, "greedy"), ContextSpec([]))
+
+    # Kernels are returned to the pool after failures
+    assert client.execute("Explain", IDENTITY, MODEL, ContextSpec([]))["status"] == "COMPLETED"
+
+def test_service_admits_executions_through_the_scheduler(tmp_path):
+    service = InvariantService(str(tmp_path / "kernel.sock"), pool_size=2,
+                               admission={"rate_limits": {"o": (0.001, 1)}})
+    service.start_background()
+    try:
+        client = RemoteInvariant(service.socket_path)
+        assert client.execute("Explain", IDENTITY, MODEL, ContextSpec([]))["status"] == "COMPLETED"
+        with pytest.raises(ExecutionRejected) as err:
+            client.execute("Explain", IDENTITY, MODEL, ContextSpec([]))
+        assert err.value.reason == "rate_limited"
+        assert service.scheduler.metrics()["orgs"]["o"] == {"queued": 0, "in_flight": 0,
+                                                           "admitted": 1, "rejected": 1}
+    finally:
+        service.shutdown()
+
+def test_service_only_signs_results_it_issued(remote, tmp_path):
+    client, _ = remote
+    result = client.execute("Explain", IDENTITY, MODEL, ContextSpec([]), policy_name="reality_only")
+
+    # The receipt carries what the service produced, not what the client sends back
+    tampered = dict(result, output="something else", cache={"hit": True, "stored_at": 0})
+    receipt = client.build_receipt(tampered)
+    assert receipt["result"]["output"] == result["output"]
+    assert "cache" not in receipt["result"] or not receipt["result"]["cache"]
+
+    with pytest.raises(RuntimeError, match="did not issue"):
+        client.build_receipt(dict(result, proof="inv_v0_forged"))
+
+    policy = tmp_path / "deny.json"
+    policy.write_text('[{"id": "deny_normal", "type": "deny_regex", "pattern": "normally"}]')
+    with pytest.raises(ExecutionAborted) as err:
+        client.execute("Explain", IDENTITY, MODEL, ContextSpec([]), policy_name=str(policy))
+    assert client.build_receipt(err.value.to_result())["result"]["status"] == "ABORTED"
+
+def test_remote_sessions_and_wire_options(remote, tmp_path):
+    from ai_execution_boundary.control.session import Session
+    client, _ = remote
+    session = Session(client, IDENTITY, "reality_only", ContextSpec([]))
+    for i in range(2):
+        receipt = client.build_receipt(session.execute(f"turn {i}", MODEL))
+        assert receipt["session"]["turn"] == i
+
+    forged = session.execute("turn 2", MODEL)
+    forged["session"] = dict(forged["session"], prev_link="0" * 64)
+    with pytest.raises(RuntimeError, match="Session link"):
+        client.build_receipt(forged)
+
+    # Context digests are always computed by the service
+    from ai_execution_boundary.control.protocol import request_to_wire
+    message = request_to_wire("Explain", IDENTITY, MODEL, ContextSpec([]), "reality_only")
+    message["options"] = {"trust_context_hashes": True}
+    with pytest.raises(RuntimeError, match="not allowed over the wire: trust_context_hashes"):
+        client._request(message)
@@ -0,0 +1,54 @@
+import pytest
+
+enforcement = pytest.importorskip("invariant_enforcement")
+pytest.importorskip("cryptography")
+
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ContextSource
+from ai_execution_boundary.control.orchestrator import Invariant
+from ai_execution_boundary.control.session import Session, genesis_link, verify_link
+
+IDENTITY = Identity("u", "r", "o", "test")
+MODEL = ModelSpec("mock", "session-model", "v1", 42, "greedy")
+
+def test_turns_form_a_verifiable_chain(tmp_path, monkeypatch):
+    ctx = tmp_path / "ctx.txt"
+    ctx.write_text("knowledge")
+    inv = Invariant(pool_size=1)
+    session = Session(inv, IDENTITY, "reality_only", ContextSpec([ContextSource("file", "internal", str(ctx))]))
+
+    hashed = []
+    native = enforcement.crypto_hash_file
+    monkeypatch.setattr(enforcement, "crypto_hash_file", lambda path: hashed.append(path) or native(path))
+
+    receipts = [inv.build_receipt(session.execute(f"turn {i}", MODEL)) for i in range(4)]
+
+    # Context digests are computed once and reused by later turns
+    assert len(hashed) == 1
+    assert len({r["graph"]["context"]["sources"][0]["content_hash"] for r in receipts}) == 1
+
+    prev = None
+    for i, receipt in enumerate(receipts):
+        block = receipt["session"]
+        assert block["turn"] == i
+        assert verify_link(block, receipt["meta"]["proof_id"], receipt["graph"]["id"], prev)
+        assert receipt["integrity"]["signatures"][0]["signed_field"] == "meta.proof_id|session.link"
+        prev = block["link"]
+    assert receipts[0]["session"]["prev_link"] == genesis_link(session.id)
+    assert session.link == prev
+
+    # A turn cannot be moved to another position or swapped for another proof
+    last = receipts[-1]
+    assert not verify_link(last["session"], last["meta"]["proof_id"], last["graph"]["id"],
+                           receipts[1]["session"]["link"])
+    assert not verify_link(last["session"], receipts[0]["meta"]["proof_id"], last["graph"]["id"])
+
+def test_aborted_turn_leaves_chain_unchanged(tmp_path):
+    policy = tmp_path / "deny.json"
+    policy.write_text('[{"id": "deny_x", "type": "deny_regex", "pattern": "forbidden"}]')
+    session = Session(Invariant(pool_size=1), IDENTITY, str(policy), ContextSpec([]))
+
+    session.execute("hello", MODEL)
+    link = session.link
+    with pytest.raises(RuntimeError):
+        session.execute("something forbidden", MODEL)
+    assert (session.turn, session.link) == (1, link)
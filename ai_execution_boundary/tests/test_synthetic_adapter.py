@@ -0,0 +1,64 @@
+import threading
+import time
+from ai_execution_boundary.control.execution_graph import ModelSpec
+from ai_execution_boundary.models.adapters.synthetic import SyntheticAdapter
+
+def _adapter(seed=7, **params):
+    return SyntheticAdapter(ModelSpec("synthetic", "syn", "v1", seed, "greedy", extra_params=params))
+
+def test_output_is_deterministic_per_seed_and_prompt():
+    a = list(_adapter(output_bytes=300).generate("prompt"))
+    b = list(_adapter(output_bytes=300).generate("prompt"))
+    assert a == b
+    assert len("".join(a)) == 300
+    assert list(_adapter(seed=8, output_bytes=300).generate("prompt")) != a
+    assert list(_adapter(output_bytes=300).generate("other prompt")) != a
+
+def test_chunk_sizes_follow_configuration():
+    tokens = list(_adapter(output_bytes=400, chunk_distribution="fixed", chunk_mean_bytes=5).generate("p"))
+    assert all(len(t) == 5 for t in tokens[:-1])
+
+    tokens = list(_adapter(output_bytes=4000, chunk_mean_bytes=4, chunk_max_bytes=9).generate("p"))
+    assert max(len(t) for t in tokens) <= 9
+    assert 2 <= len("".join(tokens)) / len(tokens) <= 6
+
+def test_violation_injection_position():
+    text = "".join(_adapter(output_bytes=1000, violation_rate=1.0, violation_at=0.5,
+                            violation_phrase="forbidden").generate("p"))
+    assert 480 <= text.index(" forbidden ") <= 520
+
+    clean = "".join(_adapter(output_bytes=1000, violation_rate=0.0).generate("p"))
+    assert "perhaps" not in clean
+
+def test_pacing_and_close():
+    adapter = _adapter(output_bytes=40, chunk_distribution="fixed", chunk_mean_bytes=4, tokens_per_second=200)
+    t0 = time.perf_counter()
+    tokens = list(adapter.generate("p"))
+    assert len(tokens) == 10
+    assert time.perf_counter() - t0 >= 0.04
+
+    stream = adapter.generate("p")
+    next(stream)
+    adapter.close()
+    assert list(stream) == []
+
+def test_close_interrupts_a_pacing_wait():
+    adapter = _adapter(output_bytes=40, chunk_distribution="fixed", chunk_mean_bytes=4, tokens_per_second=0.2)
+    stream = adapter.generate("p")
+    first = threading.Event()
+    tokens = []
+
+    def consume():
+        for token in stream:
+            tokens.append(token)
+            first.set()
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    assert first.wait(timeout=2)
+    t0 = time.perf_counter()
+    adapter.close()  # the consumer is now waiting 5s for the next token
+    consumer.join(timeout=2)
+    assert not consumer.is_alive()
+    assert time.perf_counter() - t0 < 1
+    assert len(tokens) == 1
@@ -0,0 +1,56 @@
+import json
+import pytest
+
+enforcement = pytest.importorskip("invariant_enforcement")
+
+from ai_execution_boundary.control.timeline import decode_timeline, timeline_from_receipt
+
+POLICY = '[{"id": "deny_x", "type": "deny_regex", "pattern": "forbidden"}]'
+
+def test_timeline_columns_and_abort_index(make_boundary):
+    boundary = make_boundary(POLICY)
+    boundary.set_timeline(True)
+    boundary.start("prompt")
+    for token in ["alpha ", "beta ", "gamma "]:
+        assert boundary.step(token)
+    assert not boundary.step("forbidden")
+
+    timeline = decode_timeline(boundary.timeline_bytes())
+    assert timeline["offsets"] == [0, 6, 11, 17]
+    assert timeline["abort_index"] == 3
+    assert timeline["arrival_ns"] == sorted(timeline["arrival_ns"])
+    assert all(ns >= 0 for ns in timeline["check_ns"])
+
+    # A new execution starts a fresh timeline
+    boundary.start("prompt")
+    boundary.step("x")
+    timeline = decode_timeline(boundary.timeline_bytes())
+    assert timeline["offsets"] == [0]
+    assert timeline["abort_index"] is None
+
+def test_timeline_disabled_records_nothing(make_boundary):
+    boundary = make_boundary(POLICY)
+    boundary.start("prompt")
+    boundary.step("alpha")
+    assert boundary.timeline_size() == 0
+    assert decode_timeline(boundary.timeline_bytes())["offsets"] == []
+
+def test_receipt_embeds_and_signs_timeline(tmp_path):
+    pytest.importorskip("cryptography")
+    from ai_execution_boundary.control.orchestrator import Invariant
+    from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+
+    inv = Invariant()
+    res = inv.execute("Explain", Identity("u", "r", "o", "test"), ModelSpec("mock", "m", "v1", 42, "greedy"),
+                      ContextSpec([]), policy_name="reality_only", record_timeline=True)
+    path = tmp_path / "receipt.json"
+    inv.save_record(res, str(path))
+    receipt = json.loads(path.read_text())
+
+    blob = timeline_from_receipt(receipt["timeline"])
+    assert len(decode_timeline(blob)["offsets"]) == len(res["output"].split())
+
+    sig = receipt["integrity"]["signatures"][0]
+    assert sig["signed_field"] == "meta.proof_id|timeline.digest"
+    message = f"{receipt['meta']['proof_id']}|{receipt['timeline']['digest']}"
+    inv.public_key.verify(bytes.fromhex(sig["signature"]), message.encode())
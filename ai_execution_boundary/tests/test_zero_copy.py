@@ -0,0 +1,70 @@
+import pytest
+
+enforcement = pytest.importorskip("invariant_enforcement")
+
+def _started_boundary(payload):
+    boundary = enforcement.ExecutionBoundary()
+    boundary.load_policy("inline_policy")
+    spec = enforcement.ModelSpec()
+    spec.name = "zero-copy-test"
+    spec.seed = 1
+    boundary.load_model(spec)
+    boundary.start(payload)
+    return boundary
+
+def test_buffer_inputs_are_accepted():
+    boundary = _started_boundary(memoryview(b"long rag prompt"))
+    assert boundary.step(b"alpha ")
+    assert boundary.step(memoryview(b"beta "))
+    assert boundary.step(bytearray(b"gamma"))
+    assert bytes(boundary.output_view()) == b"alpha beta gamma"
+
+    # Non-contiguous views cannot be read in place and are rejected
+    with pytest.raises(ValueError):
+        boundary.step(memoryview(b"abcdef")[::2])
+
+def test_output_view_is_read_only_and_not_copied():
+    boundary = _started_boundary(b"prompt")
+    boundary.step(b"x" * 4096)
+
+    view = boundary.output_view()
+    assert view.readonly
+    assert len(view) == 4096
+
+    stats = boundary.copy_stats()
+    # Input retained once for seal() plus the appended token; nothing copied out
+    assert stats.ingress_bytes == len(b"prompt") + 4096
+    assert stats.egress_bytes == 0
+    assert stats.detach_bytes == 0
+
+    # The legacy accessor still works but is accounted as a copy
+    assert boundary.get_output() == "x" * 4096
+    assert boundary.copy_stats().egress_bytes == 4096
+
+def test_view_survives_further_steps_and_restart():
+    boundary = _started_boundary(b"prompt")
+    boundary.step(b"first")
+    view = boundary.output_view()
+
+    # Appending while a view is held detaches instead of mutating in place
+    boundary.step(b" second")
+    assert bytes(view) == b"first"
+    assert bytes(boundary.output_view()) == b"first second"
+    assert boundary.copy_stats().detach_bytes == len(b"first")
+
+    # Restarting must not clear bytes that are still viewed either
+    boundary.start(b"next prompt")
+    assert bytes(view) == b"first"
+    assert bytes(boundary.output_view()) == b""
+    assert boundary.copy_stats().total == len(b"next prompt")
+
+    # Without outstanding views, appends do not detach
+    del view
+    boundary.step(b"tail")
+    assert boundary.copy_stats().detach_bytes == 0
+
+if __name__ == "__main__":
+    test_buffer_inputs_are_accepted()
+    test_output_view_is_read_only_and_not_copied()
+    test_view_survives_further_steps_and_restart()
+    print("All tests passed!")
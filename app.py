@@ -3,7 +3,10 @@ import os
 import time
 import json
 from dotenv import load_dotenv
-from ai_execution_boundary.control.orchestrator import Invariant, Identity, ModelSpec, ContextSpec, ContextSource
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ContextSource
+from ai_execution_boundary.control.client import RemoteInvariant
+from ai_execution_boundary.control.protocol import SOCKET_ENV
+from ai_execution_boundary.control.session import Session
 
 # Load environment logic (keys should be in .env or system env)
 load_dotenv()
@@ -57,7 +60,13 @@ st.markdown(
 if "messages" not in st.session_state:
     st.session_state.messages = []
 if "invariant" not in st.session_state:
-    st.session_state.invariant = Invariant()
+    # Thin client when a kernel service is running. Note the service's own
+    # environment must then hold the API key; the sidebar key stays local.
+    if os.environ.get(SOCKET_ENV):
+        st.session_state.invariant = RemoteInvariant(os.environ[SOCKET_ENV])
+    else:
+        from ai_execution_boundary.control.orchestrator import Invariant
+        st.session_state.invariant = Invariant()
 
 # Setup Identity & Context
 identity = Identity("user_guest", "tester", "public", "streamlit")
@@ -66,6 +75,9 @@ ctx_file = "demo_ctx.txt"
 if not os.path.exists(ctx_file):
     with open(ctx_file, "w") as f: f.write("Invariant Demo Knowledge Base.")
 context = ContextSpec([ContextSource("file", "internal", ctx_file)])
+# One hash-chained session per conversation (identity, policy and context stay warm)
+if "session" not in st.session_state:
+    st.session_state.session = Session(st.session_state.invariant, identity, policy_option, context)
 
 
 # Display Chat History
@@ -115,13 +127,7 @@ if prompt := st.chat_input("Enter your message..."):
             model_spec = ModelSpec(selected_model, "chat-model", "v1", 42, "greedy")
             
             # EXECUTE (This runs the C++ Boundary Loop)
-            result = st.session_state.invariant.execute(
-                prompt, 
-                identity, 
-                model_spec, 
-                context, 
-                policy_name=policy_option
-            )
+            result = st.session_state.session.execute(prompt, model_spec)
             
             output_text = result["output"]
             proof_id = result["proof"]
@@ -151,6 +157,7 @@ if prompt := st.chat_input("Enter your message..."):
                 "schema": "invariant.receipt.v1",
                 "meta": {"proof_id": proof_id, "timestamp": "2026-01-04T..."},
                 "graph": json.loads(result["graph"].to_json()),
+                "session": result["session"],
                 "integrity": result.get("integrity")
             }
             
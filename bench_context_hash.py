@@ -0,0 +1,53 @@
+import argparse
+import os
+import tempfile
+import time
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ContextSource
+from loadgen import quiet_stdout
+
+# Context hashing latency for a request with many context files:
+# sequential native hashing (the old loop) versus the concurrent,
+# deduplicating hash pass in Invariant.execute.
+
+IDENTITY = Identity("bench", "tester", "invariant", "bench")
+MODEL = ModelSpec("mock", "bench-model", "v1", 42, "greedy")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent context hashing")
+    parser.add_argument("--files", type=int, default=32)
+    parser.add_argument("--file-mb", type=float, default=8)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    paths = []
+    for i in range(args.files):
+        path = os.path.join(tmp, f"ctx_{i}.bin")
+        with open(path, "wb") as f:
+            f.write(os.urandom(int(args.file_mb * 1024 * 1024)))
+        paths.append(path)
+    total_mb = args.files * args.file_mb
+    # Every file listed twice: duplicates must not cost anything
+    context = ContextSpec([ContextSource("file", "internal", p) for p in paths + paths])
+
+    with quiet_stdout(True) as out:
+        import invariant_enforcement as enforcement
+        from ai_execution_boundary.control.orchestrator import Invariant
+        inv = Invariant(pool_size=1, hash_workers=args.workers)
+
+        t0 = time.perf_counter()
+        for source in context.sources:
+            enforcement.crypto_hash_file(source.identifier)
+        sequential = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        inv.execute("Explain", IDENTITY, MODEL, context)
+        concurrent = time.perf_counter() - t0
+
+        print(f"=== Context Hashing: {len(context.sources)} sources, {total_mb:.0f} MB distinct ===", file=out)
+        print(f"sequential  {sequential * 1000:8.1f} ms  ({2 * total_mb / sequential:7.1f} MB/s)", file=out)
+        print(f"concurrent  {concurrent * 1000:8.1f} ms  ({total_mb / concurrent:7.1f} MB/s, "
+              f"{args.workers} workers)", file=out)
+
+if __name__ == "__main__":
+    main()
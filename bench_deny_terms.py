@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import random
+import re
+import tempfile
+import time
+from loadgen import quiet_stdout
+
+# deny_terms at compliance-list scale: load time and resident memory of the
+# term automaton, and matching throughput for a whole input (precheck) and
+# a token stream (step), next to the same terms as deny_regex rules.
+
+FIRST = ["anna", "bruno", "carla", "dmitri", "elena", "farid", "greta", "hugo", "ines", "jonas",
+         "kira", "liam", "maya", "nils", "olga", "pablo", "rosa", "sven", "tara", "uwe"]
+SYLLABLES = ["ba", "ker", "son", "mann", "ov", "ic", "ez", "ar", "di", "lo", "vic", "berg", "ton", "ska"]
+
+def make_terms(n: int, rng: random.Random):
+    terms = set()
+    while len(terms) < n:
+        kind = rng.random()
+        if kind < 0.4:
+            terms.add(f"SKU-{rng.randrange(10**8):08d}")
+        elif kind < 0.7:
+            last = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+            terms.add(f"{rng.choice(FIRST)} {last}")
+        else:
+            terms.add("".join(rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ23456789") for _ in range(rng.randint(8, 12))))
+    return sorted(terms)
+
+def make_text(n_bytes: int, rng: random.Random):
+    words = FIRST + SYLLABLES + ["the", "order", "shipped", "to", "customer", "invoice", "SKU-1234", "code"]
+    out, size = [], 0
+    while size < n_bytes:
+        w = rng.choice(words)
+        out.append(w)
+        size += len(w) + 1
+    return " ".join(out).encode()[:n_bytes]
+
+def boundary_for(enforcement, rules, tmp):
+    policy = os.path.join(tmp, f"policy_{len(rules)}_{rules[0]['type']}.json")
+    with open(policy, "w") as f:
+        json.dump(rules, f)
+    boundary = enforcement.ExecutionBoundary()
+    # Keep the kernel's load log: it reports the automaton size
+    log_path = os.path.join(tmp, "load.log")
+    saved = os.dup(1)
+    with open(log_path, "w") as log:
+        os.dup2(log.fileno(), 1)
+        try:
+            t0 = time.perf_counter()
+            boundary.load_policy(policy)
+            load_s = time.perf_counter() - t0
+        finally:
+            os.dup2(saved, 1)
+            os.close(saved)
+    boundary.load_model(enforcement.ModelSpec())
+    with open(log_path) as f:
+        sizes = re.search(r"(\d+) states, (\d+) KiB", f.read())
+    return boundary, load_s, sizes
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark deny_terms (term automaton)")
+    parser.add_argument("--terms", type=int, default=1_000_000)
+    parser.add_argument("--text-mb", type=float, default=16)
+    parser.add_argument("--stream-kb", type=int, default=1024)
+    parser.add_argument("--token-bytes", type=int, default=16)
+    parser.add_argument("--regex-rules", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    tmp = tempfile.mkdtemp()
+    terms = make_terms(args.terms, rng)
+    terms_path = os.path.join(tmp, "terms.txt")
+    with open(terms_path, "w") as f:
+        f.write("\n".join(terms) + "\n")
+    text = make_text(int(args.text_mb * 1024 * 1024), rng)
+    stream = text[:args.stream_kb * 1024]
+
+    with quiet_stdout(True) as out:
+        import invariant_enforcement as enforcement
+
+        boundary, load_s, sizes = boundary_for(
+            enforcement, [{"id": "terms", "type": "deny_terms", "terms_file": terms_path}], tmp)
+        states, kib = int(sizes.group(1)), int(sizes.group(2))
+
+        t0 = time.perf_counter()
+        admitted = boundary.precheck(text)
+        scan_s = time.perf_counter() - t0
+
+        boundary.start(b"")
+        t0 = time.perf_counter()
+        for i in range(0, len(stream), args.token_bytes):
+            boundary.step(stream[i:i + args.token_bytes])
+        stream_s = time.perf_counter() - t0
+
+        # The same kind of list as one deny_regex rule per term
+        regex_terms = terms[:args.regex_rules]
+        regex, regex_load_s, _ = boundary_for(
+            enforcement, [{"id": f"r{i}", "type": "deny_regex", "pattern": t} for i, t in enumerate(regex_terms)], tmp)
+        sample = text[:64 * 1024]
+        t0 = time.perf_counter()
+        regex.precheck(sample)
+        regex_s = time.perf_counter() - t0
+
+        text_mb = len(text) / 1e6
+        print(f"=== deny_terms: {len(terms):,} terms ({os.path.getsize(terms_path) / 1e6:.1f} MB file) ===", file=out)
+        print(f"load        {load_s * 1000:9.1f} ms   ({len(terms) / load_s / 1e6:.2f} M terms/s)", file=out)
+        print(f"memory      {kib / 1024:9.1f} MB  ({states:,} states, {kib * 1024 / len(terms):.0f} B/term)", file=out)
+        print(f"precheck    {text_mb / scan_s:9.1f} MB/s  ({text_mb:.0f} MB input, admitted={admitted})", file=out)
+        print(f"stream      {len(stream) / stream_s / 1e6:9.1f} MB/s  ({args.token_bytes}-byte tokens, "
+              f"{len(stream) // args.token_bytes / stream_s / 1e3:.0f}k steps/s)", file=out)
+        print(f"deny_regex  {len(sample) / regex_s / 1e6:9.3f} MB/s  ({len(regex_terms)} rules, "
+              f"load {regex_load_s * 1000:.0f} ms)", file=out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import random
+import time
+from loadgen import quiet_stdout, summarize
+from ai_execution_boundary.control.orchestrator import Invariant
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+from ai_execution_boundary.tests.sse_stub import SSEStub
+
+# Hedged multi-model execution against single-model execution. Two stub
+# servers play remote models with injected first-token latency: a fast
+# primary with a slow tail and a slower but steadier backup. Reports p50/p99
+# end-to-end latency of execute() on the primary versus execute_hedged().
+
+def latency(rng: random.Random, base_ms: float, tail_ms: float, tail_rate: float):
+    def draw() -> float:
+        ms = tail_ms if rng.random() < tail_rate else base_ms
+        return ms * rng.uniform(0.8, 1.2) / 1000
+    return draw
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hedged multi-model execution")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--primary-ms", type=float, default=40.0)
+    parser.add_argument("--primary-tail-ms", type=float, default=800.0)
+    parser.add_argument("--primary-tail-rate", type=float, default=0.05)
+    parser.add_argument("--backup-ms", type=float, default=80.0)
+    parser.add_argument("--backup-tail-ms", type=float, default=800.0)
+    parser.add_argument("--backup-tail-rate", type=float, default=0.01)
+    parser.add_argument("--hedge-delay-ms", type=float, default=60.0)
+    parser.add_argument("--tokens", type=int, default=40)
+    args = parser.parse_args()
+
+    identity = Identity("bench", "tester", "invariant", "bench")
+    tokens = [f"token{i} " for i in range(args.tokens)]
+    rng = random.Random(42)
+
+    with SSEStub(tokens, first_token_delay=latency(rng, args.primary_ms, args.primary_tail_ms,
+                                                   args.primary_tail_rate)) as primary, \
+         SSEStub(tokens, first_token_delay=latency(rng, args.backup_ms, args.backup_tail_ms,
+                                                   args.backup_tail_rate)) as backup:
+        specs = [ModelSpec("openai", name, "v1", 42, "greedy",
+                           extra_params={"base_url": stub.base_url, "api_key": "bench"})
+                 for name, stub in (("primary", primary), ("backup", backup))]
+
+        with quiet_stdout(True) as out:
+            inv = Invariant()
+            single, hedged, wins, launched = [], [], [0, 0], 0
+            for _ in range(args.runs):
+                t0 = time.perf_counter()
+                inv.execute("Benchmark prompt", identity, specs[0], ContextSpec([]), policy_name="reality_only")
+                single.append((time.perf_counter() - t0) * 1000)
+
+                t0 = time.perf_counter()
+                result = inv.execute_hedged("Benchmark prompt", identity, specs, ContextSpec([]),
+                                            policy_name="reality_only", hedge_delay=args.hedge_delay_ms / 1000)
+                hedged.append((time.perf_counter() - t0) * 1000)
+                wins[result["hedge"]["winner"]] += 1
+                launched += len(result["hedge"]["candidates"])
+
+    print("=== Hedged execution (end-to-end latency) ===")
+    print(f"primary {args.primary_ms:.0f} ms ({args.primary_tail_rate:.0%} at {args.primary_tail_ms:.0f} ms), "
+          f"backup {args.backup_ms:.0f} ms ({args.backup_tail_rate:.0%} at {args.backup_tail_ms:.0f} ms), "
+          f"hedge delay {args.hedge_delay_ms:.0f} ms, {args.runs} runs")
+    for label, values in (("single", single), ("hedged", hedged)):
+        s = summarize(values)
+        print(f"{label:8} p50 {s['p50']:7.1f} ms   p99 {s['p99']:7.1f} ms   max {s['max']:7.1f} ms")
+    print(f"hedged wins: primary {wins[0]}, backup {wins[1]}; "
+          f"{launched / args.runs:.2f} candidates launched per request")
+
+if __name__ == "__main__":
+    main()
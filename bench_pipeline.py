@@ -0,0 +1,56 @@
+import argparse
+import os
+import statistics
+import tempfile
+from ai_execution_boundary.control.orchestrator import Invariant
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ContextSource
+from ai_execution_boundary.tests.sse_stub import SSEStub
+
+# Time-to-first-approved-token, sequential vs speculative (overlapped) pipeline.
+# The stub server plays a remote model with a fixed first-token latency while
+# the orchestrator hashes a set of context files locally.
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speculative execution pipeline")
+    parser.add_argument("--first-token-ms", type=float, default=250.0)
+    parser.add_argument("--context-files", type=int, default=4)
+    parser.add_argument("--context-mb", type=int, default=32, help="Size of each context file")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    identity = Identity("bench", "tester", "invariant", "bench")
+    tokens = [f"token{i} " for i in range(50)]
+
+    with tempfile.TemporaryDirectory() as tmp, \
+         SSEStub(tokens, first_token_delay=args.first_token_ms / 1000) as stub:
+        sources = []
+        for i in range(args.context_files):
+            path = os.path.join(tmp, f"ctx_{i}.txt")
+            with open(path, "wb") as f:
+                f.write(os.urandom(args.context_mb * 1024 * 1024))
+            sources.append(ContextSource("file", "internal", path))
+        context = ContextSpec(sources)
+
+        model = ModelSpec("openai", "stub-model", "v1", 42, "greedy",
+                          extra_params={"base_url": stub.base_url, "api_key": "bench"})
+
+        inv = Invariant()
+        report = {}
+        for speculative in (False, True):
+            ttfat, admission = [], []
+            for _ in range(args.runs):
+                res = inv.execute("Benchmark prompt", identity, model, context,
+                                  policy_name="reality_only", speculative=speculative)
+                ttfat.append(res["timing"]["ttfat_ms"])
+                admission.append(res["timing"]["admission_ms"])
+            report[speculative] = (statistics.median(admission), statistics.median(ttfat))
+
+    print("\n=== Time-to-First-Approved-Token (median) ===")
+    print(f"model first-token latency: {args.first_token_ms:.0f} ms, "
+          f"context: {args.context_files} x {args.context_mb} MB")
+    for speculative, (admission_ms, ttfat_ms) in report.items():
+        label = "speculative" if speculative else "sequential "
+        print(f"{label}  admission {admission_ms:8.1f} ms   ttfat {ttfat_ms:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
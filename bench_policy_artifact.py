@@ -0,0 +1,114 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from bench_deny_terms import make_terms, make_text
+from loadgen import quiet_stdout
+
+# Policy artifacts at compliance-list scale: how long a worker takes to get
+# a large deny_terms policy ready from the JSON (parse + build) versus from
+# a compiled .ipol artifact (map + verify), and how much memory N workers
+# running the same artifact actually use, from /proc/<pid>/smaps.
+
+def _mapping_kb(path: str):
+    """Rss, Pss and Shared_Clean (kB) of this process's mappings of `path`."""
+    totals = {"Rss": 0, "Pss": 0, "Shared_Clean": 0}
+    inside = False
+    with open("/proc/self/smaps") as f:
+        for line in f:
+            fields = line.split()
+            if "-" in fields[0] and len(fields) >= 5:  # mapping header
+                inside = len(fields) >= 6 and fields[5] == path
+            elif inside and fields[0].rstrip(":") in totals:
+                totals[fields[0].rstrip(":")] += int(fields[1])
+    return totals
+
+def _pss_kb():
+    # Proportional set size: pages shared with other processes count 1/N
+    with open("/proc/self/smaps_rollup") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("Pss:"))
+
+def _worker(policy: str, text: bytes, barrier, results):
+    with quiet_stdout(True):
+        import invariant_enforcement as enforcement
+        pss_before = _pss_kb()
+        t0 = time.perf_counter()
+        boundary = enforcement.ExecutionBoundary()
+        boundary.load_policy(policy)
+        load_s = time.perf_counter() - t0
+        boundary.load_model(enforcement.ModelSpec())
+        boundary.precheck(text)
+    barrier.wait()  # every worker holds its policy while the others measure
+    results.put((load_s, _pss_kb() - pss_before, _mapping_kb(policy)))
+    barrier.wait()
+
+def run_workers(policy: str, text: bytes, n: int):
+    ctx = multiprocessing.get_context("spawn")
+    barrier, results = ctx.Barrier(n), ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(policy, text, barrier, results)) for _ in range(n)]
+    for p in procs:
+        p.start()
+    rows = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled policy artifacts")
+    parser.add_argument("--terms", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--text-kb", type=int, default=256)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    tmp = tempfile.mkdtemp()
+    terms_path = os.path.join(tmp, "terms.txt")
+    with open(terms_path, "w") as f:
+        f.write("\n".join(make_terms(args.terms, rng)) + "\n")
+    policy = os.path.join(tmp, "policy.json")
+    with open(policy, "w") as f:
+        json.dump([{"id": "secrets", "pattern": "api[_-]?key"},
+                   {"id": "terms", "type": "deny_terms", "terms_file": terms_path}], f)
+    artifact = os.path.join(tmp, "policy.ipol")
+    text = make_text(args.text_kb * 1024, rng)
+
+    with quiet_stdout(True) as out:
+        import invariant_enforcement as enforcement
+
+        t0 = time.perf_counter()
+        digest = enforcement.compile_policy(policy, artifact)
+        compile_s = time.perf_counter() - t0
+
+        def load(path):
+            t0 = time.perf_counter()
+            enforcement.ExecutionBoundary().load_policy(path)
+            return time.perf_counter() - t0
+
+        json_s, artifact_s = load(policy), load(artifact)
+
+        print(f"=== Policy artifact: {args.terms:,} terms ===", file=out)
+        print(f"compile     {compile_s * 1000:9.1f} ms   ({os.path.getsize(artifact) / 1e6:.1f} MB artifact, "
+              f"sha256:{digest[:16]}...)", file=out)
+        print(f"load json   {json_s * 1000:9.1f} ms", file=out)
+        print(f"load ipol   {artifact_s * 1000:9.1f} ms   ({json_s / artifact_s:.1f}x faster, "
+              f"includes checksum)", file=out)
+
+    for label, path in (("json", policy), ("ipol", artifact)):
+        rows = run_workers(path, text, args.workers)
+        load_ms = sum(r[0] for r in rows) / len(rows) * 1000
+        pss_mb = sum(r[1] for r in rows) / 1024
+        line = (f"{args.workers} workers ({label}): load {load_ms:7.1f} ms each, "
+                f"PSS growth {pss_mb:7.1f} MB total")
+        if label == "ipol":
+            rss = sum(r[2]["Rss"] for r in rows) / 1024
+            pss = sum(r[2]["Pss"] for r in rows) / 1024
+            shared = sum(r[2]["Shared_Clean"] for r in rows) / 1024
+            line += (f"; artifact pages RSS {rss:.1f} MB, PSS {pss:.1f} MB "
+                     f"(shared clean {shared:.1f} MB)")
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import argparse
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+from bench_service import timed
+from loadgen import quiet_stdout
+
+# Per-request cost of a fresh kernel (construct, parse policy, grow buffers)
+# versus a kernel borrowed from the warm pool and reset after use.
+
+IDENTITY = Identity("bench", "tester", "invariant", "bench")
+MODEL = ModelSpec("mock", "bench-model", "v1", 42, "greedy")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs fresh enforcement kernels")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--policy", default="reality_only")
+    args = parser.parse_args()
+
+    with quiet_stdout(True) as out:
+        from ai_execution_boundary.control.orchestrator import Invariant
+        pooled = Invariant(pool_size=1)
+        key = pooled.private_key
+        allocations = {"fresh": [], "pooled": []}
+
+        def run(label, inv):
+            res = inv.execute("Explain", IDENTITY, MODEL, ContextSpec([]), policy_name=args.policy)
+            allocations[label].append(res["allocations"])
+
+        fresh_ms = timed(lambda: run("fresh", Invariant(private_key=key, pool_size=1)), args.requests)
+        pooled_ms = timed(lambda: run("pooled", pooled), args.requests)
+
+        print("=== Kernel Pooling (per request) ===", file=out)
+        for label, s in [("fresh", fresh_ms), ("pooled", pooled_ms)]:
+            mean_allocs = sum(allocations[label]) / len(allocations[label])
+            print(f"{label:7s} p50 {s['p50']:7.3f} ms  p99 {s['p99']:7.3f} ms  "
+                  f"allocations {mean_allocs:5.2f}", file=out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from bench_deny_terms import make_terms, make_text
+from loadgen import quiet_stdout
+
+# The pure-Python enforcement engine next to the C++ kernel on the same
+# policy (the shipped reality_only rules plus a deny_terms list and a size
+# cap): precheck throughput, streaming steps, context scanning and sealing.
+# Every measured call is also checked for identical decisions and proofs.
+
+POLICY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "policies", "reality_only.json")
+
+def _timed(fn, repeat=1):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - t0) / repeat, result
+
+def measure(enforcement, policy, text, stream, token_bytes, context_path, seals):
+    boundary = enforcement.ExecutionBoundary()
+    load_s, _ = _timed(lambda: boundary.load_policy(policy))
+    boundary.load_model(enforcement.ModelSpec())
+
+    precheck_s, admitted = _timed(lambda: boundary.precheck(text))
+
+    def run_stream():
+        boundary.start(b"prompt")
+        for i in range(0, len(stream), token_bytes):
+            if not boundary.step(stream[i:i + token_bytes]):
+                return False
+        return boundary.finish()
+    stream_s, streamed = _timed(run_stream)
+
+    source = enforcement.ContextSource()
+    source.identifier = context_path
+    scan_s, found = _timed(lambda: boundary.scan_context(source))
+    boundary.load_context(enforcement.ContextSpec())
+
+    seal_s, proof = _timed(boundary.seal, seals)
+    return {
+        "load_s": load_s, "precheck_s": precheck_s, "stream_s": stream_s, "scan_s": scan_s, "seal_s": seal_s,
+        "decisions": (admitted, streamed, boundary.last_violation() and boundary.last_violation().rule_id,
+                      [(v.rule_id, v.offset) for v in found]),
+        "proof": proof,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Python enforcement engine against the C++ kernel")
+    parser.add_argument("--terms", type=int, default=10_000)
+    parser.add_argument("--text-kb", type=int, default=256)
+    parser.add_argument("--stream-kb", type=int, default=16)
+    parser.add_argument("--token-bytes", type=int, default=4)
+    parser.add_argument("--seals", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    tmp = tempfile.mkdtemp()
+    terms_path = os.path.join(tmp, "terms.txt")
+    with open(terms_path, "w") as f:
+        f.write("\n".join(make_terms(args.terms, rng)) + "\n")
+    with open(POLICY) as f:
+        rules = json.load(f)
+    rules += [{"id": "customers", "type": "deny_terms", "terms_file": terms_path},
+              {"id": "cap", "type": "max_output_bytes", "limit": 1 << 30}]
+    policy = os.path.join(tmp, "policy.json")
+    with open(policy, "w") as f:
+        json.dump(rules, f)
+    text = make_text(args.text_kb * 1024, rng)
+    stream = text[:args.stream_kb * 1024]
+    context_path = os.path.join(tmp, "context.txt")
+    with open(context_path, "wb") as f:
+        f.write(text)
+
+    with quiet_stdout(True) as out:
+        import invariant_enforcement as native
+        from ai_execution_boundary.enforcement import python_engine
+        results = {name: measure(engine, policy, text, stream, args.token_bytes, context_path, args.seals)
+                   for name, engine in (("native", native), ("python", python_engine))}
+
+    n, p = results["native"], results["python"]
+    steps = len(stream) // args.token_bytes
+    mb = len(text) / 1e6
+    print(f"=== Python engine vs C++ kernel: {len(rules)} rules ({args.terms:,} terms) ===")
+    print(f"{'':12}{'native':>16}{'python':>16}{'python/native':>16}")
+    rows = [
+        ("load", "ms", n["load_s"] * 1e3, p["load_s"] * 1e3, False),
+        ("precheck", "MB/s", mb / n["precheck_s"], mb / p["precheck_s"], True),
+        ("stream", "k steps/s", steps / n["stream_s"] / 1e3, steps / p["stream_s"] / 1e3, True),
+        ("scan", "MB/s", mb / n["scan_s"], mb / p["scan_s"], True),
+        ("seal", "k/s", 1 / n["seal_s"] / 1e3, 1 / p["seal_s"] / 1e3, True),
+    ]
+    for label, unit, native_v, python_v, higher_is_better in rows:
+        ratio = python_v / native_v if higher_is_better else native_v / python_v
+        print(f"{label:12}{native_v:11.1f} {unit:4}{python_v:11.1f} {unit:4}{ratio:15.2f}x")
+    print(f"({args.stream_kb} KB stream in {args.token_bytes}-byte tokens, {args.text_kb} KB precheck/scan input)")
+    print(f"decisions identical: {n['decisions'] == p['decisions']}, proofs identical: {n['proof'] == p['proof']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+from ai_execution_boundary.control.client import RemoteInvariant
+from loadgen import quiet_stdout, summarize
+
+# Per-request overhead: kernel service (thin client over a Unix socket)
+# versus the in-process orchestrator, warm and cold (fresh process).
+
+IDENTITY = Identity("bench", "tester", "invariant", "bench")
+MODEL = ModelSpec("mock", "bench-model", "v1", 42, "greedy")
+
+COLD_SNIPPET = """
+import os
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+from ai_execution_boundary.control.client import connect_or_local
+connect_or_local().execute("Explain", Identity("bench", "tester", "invariant", "bench"),
+                           ModelSpec("mock", "bench-model", "v1", 42, "greedy"), ContextSpec([]),
+                           policy_name="reality_only")
+"""
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return summarize(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark kernel service vs in-process execution")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--cold-runs", type=int, default=5)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    socket_path = os.path.join(tmp, "kernel.sock")
+    service = subprocess.Popen([sys.executable, "-m", "ai_execution_boundary.control.service",
+                                "--socket", socket_path, "--pool", "2"],
+                               stdout=subprocess.DEVNULL)
+    try:
+        while not os.path.exists(socket_path):
+            time.sleep(0.05)
+
+        with quiet_stdout(True) as out:
+            from ai_execution_boundary.control.orchestrator import Invariant
+            local = Invariant()
+            remote = RemoteInvariant(socket_path)
+            run = lambda inv: inv.execute("Explain", IDENTITY, MODEL, ContextSpec([]), policy_name="reality_only")
+
+            warm_local = timed(lambda: run(local), args.requests)
+            warm_remote = timed(lambda: run(remote), args.requests)
+
+            env_local = {k: v for k, v in os.environ.items() if k != "INVARIANT_SOCKET"}
+            env_remote = dict(env_local, INVARIANT_SOCKET=socket_path)
+            cold = lambda env: subprocess.run([sys.executable, "-c", COLD_SNIPPET], env=env,
+                                              stdout=subprocess.DEVNULL, check=True)
+            cold_local = timed(lambda: cold(env_local), args.cold_runs)
+            cold_remote = timed(lambda: cold(env_remote), args.cold_runs)
+
+            print("=== Per-Request Overhead (ms) ===", file=out)
+            for label, s in [("in-process (warm)", warm_local), ("service    (warm)", warm_remote),
+                             ("in-process (cold)", cold_local), ("service    (cold)", cold_remote)]:
+                print(f"{label}  p50 {s['p50']:8.2f}  p90 {s['p90']:8.2f}  p99 {s['p99']:8.2f}", file=out)
+    finally:
+        service.terminate()
+        service.wait()
+
+if __name__ == "__main__":
+    main()
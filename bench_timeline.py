@@ -0,0 +1,44 @@
+import argparse
+import time
+import invariant_enforcement as enforcement
+
+# Per-token cost of timeline recording, and its encoded size.
+# Uses a rule-less policy so the measured step cost is the kernel's own
+# bookkeeping rather than regex evaluation.
+
+def run(tokens: int, record: bool) -> float:
+    boundary = enforcement.ExecutionBoundary()
+    boundary.load_policy("bench_no_rules")
+    spec = enforcement.ModelSpec()
+    spec.name = "bench"
+    spec.seed = 0
+    boundary.load_model(spec)
+    boundary.set_timeline(record)
+    boundary.start("bench")
+
+    token = b"tok "
+    step = boundary.step
+    t0 = time.perf_counter_ns()
+    for _ in range(tokens):
+        step(token)
+    elapsed = time.perf_counter_ns() - t0
+    if record:
+        blob = boundary.timeline_bytes()
+        print(f"encoded timeline: {len(blob)} bytes ({len(blob) / tokens:.2f} bytes/token)")
+    return elapsed / tokens
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-token timeline overhead")
+    parser.add_argument("--tokens", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    off = min(run(args.tokens, False) for _ in range(args.rounds))
+    on = min(run(args.tokens, True) for _ in range(args.rounds))
+    print("\n=== Timeline Recording Overhead ===")
+    print(f"step without timeline: {off:8.1f} ns/token")
+    print(f"step with timeline:    {on:8.1f} ns/token")
+    print(f"overhead:              {on - off:8.1f} ns/token (budget 1000 ns)")
+
+if __name__ == "__main__":
+    main()
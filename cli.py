@@ -1,7 +1,21 @@
+import argparse
+import contextlib
+import json
 import os
 import sys
-from ai_execution_boundary.control.orchestrator import execute
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, TextIO
+from ai_execution_boundary.control.client import connect_or_local
+from ai_execution_boundary.control.errors import ExecutionAborted
 from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ContextSource
+from ai_execution_boundary.control.receipts import ReceiptWriter, FSYNC_POLICIES
+from ai_execution_boundary.control.session import Session
+
+# Default Identity and Context
+IDENTITY = Identity("jeevan", "tester", "invariant", "cli")
+CONTEXT = ContextSpec([ContextSource("static", "cli", "user_input")])
 
 # Helper to print colored output if supported, else plain
 def print_header(msg):
@@ -16,15 +30,158 @@ def print_info(msg):
 def print_proof(hash_str):
     print(f"\033[1;33m[PROOF] {hash_str}\033[0m")
 
+def default_model() -> ModelSpec:
+    # Live model if a key exists, else the mock
+    if os.environ.get("OPENAI_API_KEY") is not None:
+        return ModelSpec(
+            provider="openai",
+            name="google/gemini-2.0-flash-exp:free",
+            version="latest",
+            seed=42,
+            decoding_strategy="temperature=0.7",
+            extra_params={"base_url": "https://openrouter.ai/api/v1"}
+        )
+    return ModelSpec("mock", "cli-model", "v1", 42, "greedy")
+
+def _batch_record(invariant, line_no: int, line: str, policy: str, model: ModelSpec,
+                  writer: Optional[ReceiptWriter]) -> Dict[str, Any]:
+    """Runs one JSONL request and returns its result line (never raises)."""
+    t0 = time.perf_counter()
+    record: Dict[str, Any] = {"line": line_no}
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict) or not isinstance(request.get("prompt"), str):
+            raise ValueError('expected an object with a string "prompt"')
+        if "id" in request:
+            record["id"] = request["id"]
+        try:
+            result = invariant.execute(request["prompt"], IDENTITY, model, CONTEXT,
+                                       policy_name=request.get("policy", policy))
+        except ExecutionAborted as e:
+            if e.graph is None:
+                raise
+            result = e.to_result()
+        if writer is not None:
+            writer.submit(result)
+        record.update(status=result["status"], output=result["output"], proof=result["proof"])
+        if result.get("violation") is not None:
+            record["violation"] = result["violation"]
+        timing = dict(result.get("timing") or {})
+    except Exception as e:
+        record.update(status="ERROR", error=str(e))
+        timing = {}
+    timing["wall_ms"] = (time.perf_counter() - t0) * 1000
+    record["timing"] = timing
+    return record
+
+def run_batch(invariant, lines: Iterable[str], out: TextIO, policy: str = "safety",
+              model: Optional[ModelSpec] = None, concurrency: int = 4,
+              writer: Optional[ReceiptWriter] = None) -> Dict[str, int]:
+    """
+    Pipelined batch execution of JSONL requests ({"prompt": ..., optional
+    "id" and "policy"}, one per line).
+
+    Reading, execution and receipt writing overlap: lines are read only
+    while fewer than `concurrency` requests are in flight, every result is
+    written to `out` as one JSON line the moment it completes (completion
+    order; "line" and "id" identify the request), and receipts, including
+    those of aborted executions, go to the ReceiptWriter, whose bounded
+    queue pushes back on a lagging disk. Nothing is kept per request, so
+    memory does not grow with the input.
+    """
+    model = model or default_model()
+    slots = threading.BoundedSemaphore(concurrency)
+    out_lock = threading.Lock()
+    counts = {"COMPLETED": 0, "ABORTED": 0, "ERROR": 0}
+    closed = threading.Event()
+
+    def run(line_no: int, line: str):
+        try:
+            record = _batch_record(invariant, line_no, line, policy, model, writer)
+            with out_lock:
+                counts[record["status"]] += 1
+                if not closed.is_set():
+                    out.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    out.flush()
+        except OSError:
+            closed.set()  # the consumer went away (e.g. `| head`): stop reading
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cli-batch") as pool:
+        for line_no, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            slots.acquire()
+            if closed.is_set():
+                slots.release()
+                break
+            pool.submit(run, line_no, line)
+    return counts
+
+@contextlib.contextmanager
+def _results_stdout(verbose: bool):
+    """
+    Keeps stdout for JSONL results: kernel logging (Python and C++ both
+    write to fd 1) goes to stderr with --verbose, else nowhere.
+    """
+    sys.stdout.flush()
+    saved = os.dup(1)
+    sink = os.dup(2) if verbose else os.open(os.devnull, os.O_WRONLY)
+    os.dup2(sink, 1)
+    results = os.fdopen(os.dup(saved), "w")
+    try:
+        yield results
+        sys.stdout.flush()
+    finally:
+        with contextlib.suppress(BrokenPipeError):  # the consumer closed the pipe early
+            results.close()
+        os.dup2(saved, 1)
+        os.close(sink)
+        os.close(saved)
+
+def batch_main(args) -> int:
+    with _results_stdout(args.verbose) as out, \
+         (sys.stdin if args.batch == "-" else open(args.batch)) as lines:
+        invariant = connect_or_local(pool_size=args.concurrency)
+        writer = ReceiptWriter(invariant, args.receipts, fsync=args.fsync) if args.receipts else None
+        try:
+            counts = run_batch(invariant, lines, out, policy=args.policy, concurrency=args.concurrency,
+                               writer=writer)
+        finally:
+            if writer is not None:
+                writer.close()
+    print(f"[Invariant] Batch done: {counts['COMPLETED']} completed, {counts['ABORTED']} aborted, "
+          f"{counts['ERROR']} errors", file=sys.stderr)
+    return 1 if counts["ERROR"] else 0
+
 def main():
+    parser = argparse.ArgumentParser(description="Invariant execution boundary CLI")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Run JSONL prompts from FILE ('-' for stdin) and write JSONL results to stdout")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight in batch mode")
+    parser.add_argument("--policy", default="safety")
+    parser.add_argument("--receipts", help="Append receipts to this JSONL file (batch mode)")
+    parser.add_argument("--fsync", default="interval", choices=FSYNC_POLICIES)
+    parser.add_argument("--verbose", action="store_true", help="Kernel logging on stderr (batch mode)")
+    args = parser.parse_args()
+    if args.batch is not None:
+        if args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        sys.exit(batch_main(args))
+    interactive(args.policy)
+
+def interactive(policy: str):
     print_header("Invariant: Execution Boundary CLI")
     print("Type 'exit' to quit.")
+
+    # Thin client when a kernel service is running (INVARIANT_SOCKET), else in-process
+    invariant = connect_or_local()
+    print_info(f"Kernel: {type(invariant).__name__}")
     
-    # Default Identity
-    identity = Identity("jeevan", "tester", "invariant", "cli")
-    
-    # Default Context
-    context = ContextSpec([ContextSource("static", "cli", "user_input")])
+    # Every turn of this conversation is chained into one session proof
+    session = Session(invariant, IDENTITY, policy, CONTEXT)
+    print_info(f"Session: {session.id}")
     
     while True:
         try:
@@ -34,34 +191,20 @@ def main():
                 break
             
             # Allow user to toggle live model if key exists
-            use_live = os.environ.get("OPENAI_API_KEY") is not None
-            if use_live:
+            model = default_model()
+            if model.provider == "openai":
                 print_info("Using Live Model (OpenRouter/OpenAI)")
-                model = ModelSpec(
-                    provider="openai",
-                    name="google/gemini-2.0-flash-exp:free",
-                    version="latest",
-                    seed=42,
-                    decoding_strategy="temperature=0.7",
-                    extra_params={"base_url": "https://openrouter.ai/api/v1"}
-                )
             else:
                 print_info("Using Mock Model (Set OPENAI_API_KEY to switch to live)")
-                model = ModelSpec("mock", "cli-model", "v1", 42, "greedy")
 
             print_info("Requesting Execution...")
             
-            result = execute(
-                input_payload=user_input,
-                identity=identity,
-                model_spec=model,
-                context_spec=context,
-                policy_name="safety"
-            )
+            result = session.execute(user_input, model)
             
             print_success("Execution Admitted & Sealed")
             print(f"Output: {result['output']}")
             print_proof(result['proof'])
+            print_info(f"Session Link (turn {result['session']['turn']}): {result['session']['link']}")
             
         except Exception as e:
             print(f"\033[1;31m[ERROR] {e}\033[0m")
@@ -0,0 +1,137 @@
+import argparse
+import contextlib
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+from ai_execution_boundary.control.orchestrator import Invariant
+from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec
+from ai_execution_boundary.control.receipts import ReceiptWriter, FSYNC_POLICIES
+from ai_execution_boundary.control.scheduler import percentile
+
+# Load generator: drives Invariant.execute with the synthetic adapter at a
+# fixed concurrency and reports throughput and latency percentiles.
+
+def summarize(latencies_ms: List[float]) -> Dict[str, float]:
+    values = sorted(latencies_ms)
+    return {
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": values[-1] if values else float("nan"),
+    }
+
+@contextlib.contextmanager
+def quiet_stdout(enabled: bool):
+    """Silence per-execution logging (Python and C++ both write to fd 1)."""
+    if not enabled:
+        yield sys.stdout
+        return
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        with os.fdopen(os.dup(saved), "w") as report:
+            yield report
+            sys.stdout.flush()
+    finally:
+        os.dup2(saved, 1)
+        os.close(devnull)
+        os.close(saved)
+
+def run_load(args) -> Dict[str, object]:
+    identity = Identity("loadgen", "tester", "invariant", "load")
+    model = ModelSpec("synthetic", "synthetic-model", "v1", args.seed, "greedy", extra_params={
+        "output_bytes": args.output_bytes,
+        "tokens_per_second": args.tokens_per_second,
+        "chunk_distribution": args.chunk_distribution,
+        "chunk_mean_bytes": args.chunk_mean_bytes,
+        "violation_rate": args.violation_rate,
+    })
+    context = ContextSpec([])
+
+    lock = threading.Lock()
+    next_request = [0]
+    latencies, ttfat = [], []
+    counts = {"completed": 0, "aborted": 0, "errors": 0, "output_bytes": 0}
+
+    # One node; execute() borrows a pooled kernel per request
+    inv = Invariant(pool_size=args.concurrency)
+    # Receipts are signed and written off the request path
+    writer = ReceiptWriter(inv, args.receipts, fsync=args.fsync) if args.receipts else None
+
+    def worker():
+        while True:
+            with lock:
+                i = next_request[0]
+                if i >= args.requests:
+                    return
+                next_request[0] += 1
+            t0 = time.perf_counter()
+            try:
+                res = inv.execute(f"load test prompt {i}", identity, model, context, policy_name=args.policy)
+                outcome = "completed"
+                if writer is not None:
+                    writer.submit(res)
+            except RuntimeError as e:
+                res = None
+                outcome = "aborted" if "Policy Violation" in str(e) else "errors"
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            with lock:
+                counts[outcome] += 1
+                latencies.append(elapsed_ms)
+                if res is not None:
+                    counts["output_bytes"] += len(res["output"].encode())
+                    if res["timing"]["ttfat_ms"] is not None:
+                        ttfat.append(res["timing"]["ttfat_ms"])
+
+    threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    t_start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t_start
+    if writer is not None:
+        writer.close()
+
+    return {
+        "wall_s": wall,
+        "counts": counts,
+        "throughput_rps": args.requests / wall,
+        "output_mbps": counts["output_bytes"] / wall / 1e6,
+        "latency_ms": summarize(latencies),
+        "ttfat_ms": summarize(ttfat),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Invariant load generator (synthetic model)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--policy", default="reality_only")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output-bytes", type=int, default=2048)
+    parser.add_argument("--tokens-per-second", type=float, default=0)
+    parser.add_argument("--chunk-distribution", default="lognormal", choices=["fixed", "uniform", "lognormal"])
+    parser.add_argument("--chunk-mean-bytes", type=int, default=4)
+    parser.add_argument("--violation-rate", type=float, default=0.0)
+    parser.add_argument("--receipts", help="Append receipts to this JSONL file")
+    parser.add_argument("--fsync", default="always", choices=FSYNC_POLICIES)
+    parser.add_argument("--verbose", action="store_true", help="Keep per-execution kernel logging")
+    args = parser.parse_args()
+
+    with quiet_stdout(not args.verbose) as out:
+        report = run_load(args)
+        c = report["counts"]
+        lat, ttfat = report["latency_ms"], report["ttfat_ms"]
+        print("=== Invariant Load Report ===", file=out)
+        print(f"requests {args.requests}  concurrency {args.concurrency}  wall {report['wall_s']:.2f}s", file=out)
+        print(f"completed {c['completed']}  aborted {c['aborted']}  errors {c['errors']}", file=out)
+        print(f"throughput {report['throughput_rps']:.1f} exec/s  {report['output_mbps']:.2f} MB/s approved output", file=out)
+        print(f"latency ms  p50 {lat['p50']:.2f}  p90 {lat['p90']:.2f}  p99 {lat['p99']:.2f}  max {lat['max']:.2f}", file=out)
+        print(f"ttfat   ms  p50 {ttfat['p50']:.2f}  p90 {ttfat['p90']:.2f}  p99 {ttfat['p99']:.2f}", file=out)
+
+if __name__ == "__main__":
+    main()
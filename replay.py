@@ -1,7 +1,7 @@
 import sys
 import json
 import os
-from ai_execution_boundary.control.orchestrator import execute, Invariant
+from ai_execution_boundary.control.client import connect_or_local
 from ai_execution_boundary.control.execution_graph import Identity, ModelSpec, ContextSpec, ContextSource
 
 def replay_execution(record_path: str):
@@ -73,7 +73,8 @@ def replay_execution(record_path: str):
     policy_name = graph["policy_name"] # Path or name
     
     print("\n[Replaying Execution...]")
-    results = execute(
+    # Thin client when a kernel service is running (INVARIANT_SOCKET), else in-process
+    results = connect_or_local().execute(
         input_payload=input_payload,
         identity=identity,
         model_spec=model_spec,